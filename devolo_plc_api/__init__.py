@@ -1,14 +1,40 @@
 """The devolo PLC API."""
 
-from importlib.metadata import PackageNotFoundError, version
+from typing import TYPE_CHECKING, Any
 
-from .device import Device
-from .helpers import wifi_qr_code
+from .lazy import lazy_getattr
 
-try:
-    __version__ = version("devolo_plc_api")
-except PackageNotFoundError:
-    # package is not installed - e.g. pulled and run locally
-    __version__ = "0.0.0"
+if TYPE_CHECKING:
+    from .device import BatchResult, Device
+    from .helpers import async_wifi_qr_code, async_wifi_qr_codes, wifi_qr_code
 
-__all__ = ["Device", "__version__", "wifi_qr_code"]
+__all__ = ["BatchResult", "Device", "__version__", "async_wifi_qr_code", "async_wifi_qr_codes", "wifi_qr_code"]
+__version__: str
+
+_getattr, __dir__ = lazy_getattr(
+    __name__,
+    {
+        "BatchResult": ".device:BatchResult",
+        "Device": ".device:Device",
+        "async_wifi_qr_code": ".helpers:async_wifi_qr_code",
+        "async_wifi_qr_codes": ".helpers:async_wifi_qr_codes",
+        "wifi_qr_code": ".helpers:wifi_qr_code",
+    },
+)
+
+
+def __getattr__(name: str) -> Any:
+    """Import attributes on first access. Reading the package metadata is expensive, so the version is determined lazily."""
+    global __version__  # noqa: PLW0603
+
+    if name != "__version__":
+        return _getattr(name)
+
+    from importlib.metadata import PackageNotFoundError, version  # noqa: PLC0415
+
+    try:
+        __version__ = version("devolo_plc_api")
+    except PackageNotFoundError:
+        # package is not installed - e.g. pulled and run locally
+        __version__ = "0.0.0"
+    return __version__
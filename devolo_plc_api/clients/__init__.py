@@ -1,5 +1,6 @@
 """Clients used to communicate with devolo devices."""
 
+from .limiter import RequestLimiter
 from .protobuf import Protobuf
 
-__all__ = ["Protobuf"]
+__all__ = ["Protobuf", "RequestLimiter"]
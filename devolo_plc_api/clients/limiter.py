@@ -0,0 +1,39 @@
+"""Limit concurrent requests to a device."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+MAX_PARALLEL_REQUESTS = 4
+
+
+class RequestLimiter:
+    """
+    Limit the number of concurrent requests to a device. Synchronous calls run in their own event loops, so a semaphore is
+    kept per event loop.
+
+    :param limit: Maximum number of requests at the same time
+    """
+
+    def __init__(self, limit: int = MAX_PARALLEL_REQUESTS) -> None:
+        """Initialize the limiter."""
+        self.limit = limit
+        self._semaphores: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = WeakKeyDictionary()
+
+    async def __aenter__(self) -> None:
+        """Wait for a free slot."""
+        loop = asyncio.get_running_loop()
+        if (semaphore := self._semaphores.get(loop)) is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.limit)
+        await semaphore.acquire()
+
+    async def __aexit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None
+    ) -> None:
+        """Free the slot."""
+        self._semaphores[asyncio.get_running_loop()].release()
@@ -5,9 +5,10 @@ from __future__ import annotations
 import asyncio
 import logging
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from hashlib import sha256
 from http import HTTPStatus
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable
 
 from httpx import (
     AsyncClient,
@@ -21,9 +22,31 @@ from httpx import (
 )
 from tenacity import before_sleep_log, retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
+from devolo_plc_api.diagnostics import Measurement, current_span, get_instrumentation, profile, trace
 from devolo_plc_api.exceptions import DevicePasswordProtected, DeviceUnavailable
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from tenacity import RetryCallState
+
+    from devolo_plc_api.diagnostics import DebugBuffer, Span
+
+    from .limiter import RequestLimiter
+
 TIMEOUT = 10.0
+WRITE_BUFFER = 1 << 18
+
+_log_retry = before_sleep_log(logging.getLogger("devolo_plc_api.clients.protobuf.Protobuf"), logging.DEBUG)
+
+
+def _before_retry(retry_state: RetryCallState) -> None:
+    """Log a retry, record it in the debug buffer of the device and report it to the instrumentation."""
+    _log_retry(retry_state)
+    client, _, url = retry_state.args[:3]
+    client._debug_buffer.record("Retrying %s after attempt %s", client._endpoint(url), retry_state.attempt_number)  # noqa: SLF001
+    if (instrumentation := get_instrumentation()) is not None:
+        instrumentation.request_retried(client._ip, client._endpoint(url))  # noqa: SLF001
 
 
 class Protobuf(ABC):
@@ -36,7 +59,9 @@ class Protobuf(ABC):
 
         self.password: str
 
+        self._debug_buffer: DebugBuffer
         self._ip: str
+        self._limiter: RequestLimiter | None = None
         self._path: str
         self._port: int
         self._session: AsyncClient
@@ -63,46 +88,169 @@ class Protobuf(ABC):
         """Query URL asynchronously."""
         url = f"{self.url}{sub_url}"
         self._logger.debug("Getting from %s", url)
-        return await self._async_request("GET", url, None, timeout)
+        self._debug_buffer.record("Getting from %s", sub_url)
+        with (
+            trace("request", ip=self._ip, endpoint=sub_url, method="GET"),
+            profile(sub_url),
+            self._debug_buffer.dump_on_error(self._logger),
+        ):
+            return await self._async_request("GET", url, None, timeout)
 
     async def _async_post(self, sub_url: str, content: bytes, timeout: float = TIMEOUT) -> Response:
         """Post data asynchronously."""
         url = f"{self.url}{sub_url}"
         self._logger.debug("Posting to %s", url)
-        return await self._async_request("POST", url, content, timeout)
+        self._debug_buffer.record("Posting to %s", sub_url)
+        with (
+            trace("request", ip=self._ip, endpoint=sub_url, method="POST"),
+            profile(sub_url),
+            self._debug_buffer.dump_on_error(self._logger),
+        ):
+            return await self._async_request("POST", url, content, timeout)
+
+    async def _async_download(self, sub_url: str, writer: BinaryIO, timeout: float = TIMEOUT) -> int:
+        """Stream data asynchronously into a writer."""
+        url = f"{self.url}{sub_url}"
+        self._logger.debug("Downloading from %s", url)
+        self._debug_buffer.record("Downloading from %s", sub_url)
+        with (
+            trace("request", ip=self._ip, endpoint=sub_url, method="GET"),
+            profile(sub_url),
+            self._debug_buffer.dump_on_error(self._logger),
+        ):
+            if writer.seekable():
+                return await self._async_stream("GET", url, writer, await asyncio.to_thread(writer.tell), timeout)
+            # A partial body cannot be taken back from writers, that cannot seek, so a failed attempt is not retried
+            return await self._async_stream_once("GET", url, writer, timeout)
 
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=5),
         retry=retry_if_exception_type(DeviceUnavailable),
         reraise=True,
-        before_sleep=before_sleep_log(logging.getLogger("devolo_plc_api.clients.protobuf.Protobuf"), logging.DEBUG),
+        before_sleep=_before_retry,
     )
     async def _async_request(self, method: str, url: str, content: bytes | None, timeout: float = TIMEOUT) -> Response:
         """Request data asynchronously."""
         try:
-            response = await self._session.request(
-                method,
-                url,
-                auth=DigestAuth(self._user, self.password),
-                content=content,
-                timeout=timeout,
-            )
-            if response.status_code == HTTPStatus.UNAUTHORIZED:
-                self.password = sha256(self.password.encode("utf-8")).hexdigest()
-                response = await self._session.request(
-                    method,
-                    url,
-                    auth=DigestAuth(self._user, self.password),
-                    content=content,
-                    timeout=timeout,
-                )
+            async with self._slot():
+                with (
+                    self._trace_attempt() as span,
+                    Measurement(self._ip, self._endpoint(url), len(content or b"")) as measurement,
+                ):
+                    response = await self._session.request(
+                        method,
+                        url,
+                        auth=DigestAuth(self._user, self.password),
+                        content=content,
+                        timeout=timeout,
+                    )
+                    if response.status_code == HTTPStatus.UNAUTHORIZED:
+                        self._hash_password(url)
+                        response = await self._session.request(
+                            method,
+                            url,
+                            auth=DigestAuth(self._user, self.password),
+                            content=content,
+                            timeout=timeout,
+                        )
+                    measurement.status, measurement.received = response.status_code, len(response.content)
+                    span.set_attribute("status", response.status_code)
             response.raise_for_status()
         except HTTPStatusError as e:
+            self._debug_buffer.record("%s %s answered %s", method, self._endpoint(url), e.response.status_code)
             if e.response.status_code == HTTPStatus.UNAUTHORIZED:
                 raise DevicePasswordProtected from None
             raise
-        except (ConnectTimeout, ConnectError, ReadTimeout, RemoteProtocolError):
+        except (ConnectTimeout, ConnectError, ReadTimeout, RemoteProtocolError) as e:
+            self._debug_buffer.record("%s %s failed: %r", method, self._endpoint(url), e)
             raise DeviceUnavailable from None
         else:
             return response
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=5),
+        retry=retry_if_exception_type(DeviceUnavailable),
+        reraise=True,
+        before_sleep=_before_retry,
+    )
+    async def _async_stream(self, method: str, url: str, writer: BinaryIO, position: int, timeout: float = TIMEOUT) -> int:
+        """Stream data asynchronously into a seekable writer, that is rewound to the position before every attempt."""
+        await asyncio.to_thread(writer.seek, position)
+        await asyncio.to_thread(writer.truncate)
+        return await self._async_stream_once(method, url, writer, timeout)
+
+    async def _async_stream_once(self, method: str, url: str, writer: BinaryIO, timeout: float = TIMEOUT) -> int:
+        """Stream data asynchronously in a single attempt."""
+        try:
+            async with self._slot():
+                with self._trace_attempt() as span, Measurement(self._ip, self._endpoint(url)) as measurement:
+                    async with self._session.stream(
+                        method, url, auth=DigestAuth(self._user, self.password), timeout=timeout
+                    ) as response:
+                        if response.status_code != HTTPStatus.UNAUTHORIZED:
+                            measurement.status = response.status_code
+                            span.set_attribute("status", response.status_code)
+                            measurement.received = await self._async_write(response, writer)
+                            return measurement.received
+                    self._hash_password(url)
+                    async with self._session.stream(
+                        method, url, auth=DigestAuth(self._user, self.password), timeout=timeout
+                    ) as response:
+                        measurement.status = response.status_code
+                        span.set_attribute("status", response.status_code)
+                        measurement.received = await self._async_write(response, writer)
+                        return measurement.received
+        except HTTPStatusError as e:
+            self._debug_buffer.record("%s %s answered %s", method, self._endpoint(url), e.response.status_code)
+            if e.response.status_code == HTTPStatus.UNAUTHORIZED:
+                raise DevicePasswordProtected from None
+            raise
+        except (ConnectTimeout, ConnectError, ReadTimeout, RemoteProtocolError) as e:
+            self._debug_buffer.record("%s %s failed: %r", method, self._endpoint(url), e)
+            raise DeviceUnavailable from None
+
+    def _endpoint(self, url: str) -> str:
+        """Get the path of an endpoint relative to the API URL."""
+        return url[len(self.url) :]
+
+    def _hash_password(self, url: str) -> None:
+        """Switch to the hashed password after the plain one was rejected."""
+        self.password = sha256(self.password.encode("utf-8")).hexdigest()
+        self._debug_buffer.record("%s rejected the password, retrying with its hash", self._endpoint(url))
+        if (instrumentation := get_instrumentation()) is not None:
+            instrumentation.password_hashed(self._ip, self._endpoint(url))
+        if (span := current_span()) is not None:
+            span.set_attribute("password_hashed", True)  # noqa: FBT003
+
+    @staticmethod
+    def _trace_attempt() -> Span:
+        """Trace a single attempt of a request, counting the attempts of the surrounding request span."""
+        request = current_span()
+        return trace("attempt", attempt=request.children + 1 if request else 1)
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """Wait for the limiter, if requests to the device are limited."""
+        if self._limiter is None:
+            yield
+            return
+        async with self._limiter:
+            yield
+
+    @staticmethod
+    async def _async_write(response: Response, writer: BinaryIO) -> int:
+        """Write the body of a response in blocks of WRITE_BUFFER bytes without blocking the event loop."""
+        response.raise_for_status()
+        written = 0
+        buffer = bytearray()
+        async for chunk in response.aiter_bytes():
+            buffer += chunk
+            written += len(chunk)
+            if len(buffer) >= WRITE_BUFFER:
+                await asyncio.to_thread(writer.write, bytes(buffer))
+                buffer.clear()
+        if buffer:
+            await asyncio.to_thread(writer.write, bytes(buffer))
+        return written
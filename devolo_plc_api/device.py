@@ -4,27 +4,56 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from contextlib import suppress
+from dataclasses import dataclass, field, replace
 from datetime import date
 from ipaddress import ip_address, ip_network
+from socket import inet_aton
 from struct import unpack_from
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from httpx import AsyncClient
 from ifaddr import get_adapters
 from zeroconf import DNSQuestionType, ServiceInfo, ServiceStateChange, Zeroconf
 from zeroconf.asyncio import AsyncServiceBrowser, AsyncServiceInfo, AsyncZeroconf
 
+from .clients import RequestLimiter
 from .device_api import SERVICE_TYPE as DEVICEAPI, DeviceApi
+from .diagnostics import DebugBuffer, get_instrumentation, profile, trace
 from .exceptions import DeviceNotFound
 from .plcnet_api import DEVICES_WITHOUT_PLCNET, SERVICE_TYPE as PLCNETAPI, PlcNetApi
 from .zeroconf import ZeroconfServiceInfo
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
     from types import TracebackType
 
     from typing_extensions import Self
 
+    from .plcnet_api.getnetworkoverview_pb2 import GetNetworkOverview
+
+
+@dataclass
+class BatchResult:
+    """Results of multiple calls to a device."""
+
+    values: dict[str, Any] = field(default_factory=dict)
+    """Return values of successful calls."""
+
+    errors: dict[str, Exception] = field(default_factory=dict)
+    """Exceptions of failed calls."""
+
+    def __contains__(self, endpoint: str) -> bool:
+        """Check, if a call succeeded."""
+        return endpoint in self.values
+
+    def __getitem__(self, endpoint: str) -> Any:
+        """Get the return value of a call or raise its exception."""
+        if endpoint in self.errors:
+            raise self.errors[endpoint]
+        return self.values[endpoint]
+
 
 class Device:
     """
@@ -57,7 +86,9 @@ class Device:
         self._background_tasks: set[asyncio.Task] = set()
         self._browser: AsyncServiceBrowser | None = None
         self._connected = False
+        self._debug_buffer = DebugBuffer()
         self._info: dict[str, ZeroconfServiceInfo] = {PLCNETAPI: ZeroconfServiceInfo(), DEVICEAPI: ZeroconfServiceInfo()}
+        self._limiter = RequestLimiter()
         self._logger = logging.getLogger(f"{self.__class__.__module__}.{self.__class__.__name__}")
         self._multicast = False
         self._password = ""
@@ -130,25 +161,193 @@ class Device:
 
         :param: session_instance: Session client instance to be potentially reused.
         """
-        self._session_instance = session_instance
-        self._session = self._session_instance or AsyncClient()
-        if not self._zeroconf_instance:
-            self._zeroconf = AsyncZeroconf(interfaces=await self._get_relevant_interfaces())
-        elif isinstance(self._zeroconf_instance, Zeroconf):
-            self._zeroconf = AsyncZeroconf(zc=self._zeroconf_instance)
-        else:
-            self._zeroconf = self._zeroconf_instance
-        await self._get_zeroconf_info()
-        if not self._info[DEVICEAPI].properties and not self._info[PLCNETAPI].properties:
-            await self._retry_zeroconf_info()
-        if not self.device and not self.plcnet:
-            raise DeviceNotFound(self.ip)
-        self._connected = True
+        with trace("connect", ip=self.ip), profile("connect"), self._debug_buffer.dump_on_error(self._logger):
+            await self._setup(session_instance)
+            await self._get_zeroconf_info()
+            if not self._info[DEVICEAPI].properties and not self._info[PLCNETAPI].properties:
+                await self._retry_zeroconf_info()
+            if not self.device and not self.plcnet:
+                raise DeviceNotFound(self.ip)
+            self._connected = True
 
     def connect(self) -> None:
         """Connect to a device synchronous."""
         asyncio.run(self.async_connect())
 
+    def debug_events(self) -> list[str]:
+        """
+        Get recent debug events of the device like requests, retries and mDNS decisions. Events are kept in a bounded
+        buffer independent of the log level and dumped as warning, when connecting or a request fails.
+
+        :return: Events with UTC timestamp, oldest first
+        """
+        return self._debug_buffer.events()
+
+    async def async_batch(self, endpoints: Iterable[str], timeout: float | None = None) -> BatchResult:
+        """
+        Call multiple endpoints of the device and plcnet API at once, e.g. to collect a snapshot of the device. Endpoints
+        are named like the API methods without the async_ prefix and must not need arguments. Calls of unsupported
+        features fail without a request, the others share the request limit of the device. A failing call does not
+        affect the other calls.
+
+        :param endpoints: Names of the endpoints, e.g. get_led_setting or get_network_overview
+        :param timeout: Seconds each call may take including retries. None waits as long as the call needs.
+        :return: Return values and exceptions per endpoint
+        """
+        result = BatchResult()
+        calls = {}
+
+        async def call(method: Callable[[], Awaitable[Any]]) -> Any:
+            # Calling inside the task turns errors like unsupported features or missing arguments into results
+            return await asyncio.wait_for(method(), timeout)
+
+        for endpoint in dict.fromkeys(endpoints):
+            api = next((api for api in (self.device, self.plcnet) if hasattr(type(api), f"async_{endpoint}")), None)
+            if api is None:
+                result.errors[endpoint] = AttributeError(f"No API provides {endpoint}")
+                continue
+            calls[endpoint] = call(getattr(api, f"async_{endpoint}"))
+        values = await asyncio.gather(*calls.values(), return_exceptions=True)
+        for endpoint, value in zip(calls, values):
+            if isinstance(value, Exception):
+                result.errors[endpoint] = value
+            elif isinstance(value, BaseException):
+                raise value
+            else:
+                result.values[endpoint] = value
+        return result
+
+    def batch(self, endpoints: Iterable[str], timeout: float | None = None) -> BatchResult:
+        """
+        Call multiple endpoints of the device and plcnet API at once synchronously.
+
+        :param endpoints: Names of the endpoints, e.g. get_led_setting or get_network_overview
+        :param timeout: Seconds each call may take including retries. None waits as long as the call needs.
+        :return: Return values and exceptions per endpoint
+        """
+        return asyncio.run(self.async_batch(endpoints, timeout))
+
+    async def async_get_plcnet_members(self, port_timeout: float = 1.0) -> dict[str, Device]:
+        """
+        Create connected device objects for all other members of the PLC network. Members running the same firmware as this
+        device share its API paths and versions, so they are connected after a direct check of their API ports. As the
+        network overview does not contain serial numbers, they are queried afterwards with a single multicast mDNS browse
+        for the device API of all those members together. Members with different firmware or closed ports are queried via
+        targeted mDNS. Members, that cannot be connected or whose serial number stays unknown, are skipped. The new devices
+        share Zeroconf and HTTP client with this device.
+
+        :param port_timeout: Seconds to wait for an API port to accept a connection
+        :return: Connected devices accessible via PLC MAC address
+        """
+        if not self.plcnet:
+            return {}
+        network = await self.plcnet.async_get_network_overview()
+        firmware = next(
+            ((local.product_id, local.full_version) for local in network.devices if local.mac_address == self.mac), None
+        )
+        members = [member for member in network.devices if member.ipv4_address and member.mac_address != self.mac]
+        results = await asyncio.gather(
+            *(self._async_connect_member(member, firmware, port_timeout) for member in members), return_exceptions=True
+        )
+        devices: dict[str, Device] = {}
+        for member, result in zip(members, results):
+            if isinstance(result, Device):
+                devices[result.mac] = result
+            elif isinstance(result, Exception):
+                self._logger.warning("Cannot connect to PLC network member %s: %r", member.ipv4_address, result)
+            elif isinstance(result, BaseException):
+                raise result
+        unresolved = [device for device in devices.values() if device.device and device.serial_number == "0"]
+        if unresolved:
+            await self._async_resolve_serial_numbers(unresolved)
+        for device in unresolved:
+            if device.serial_number == "0":
+                self._logger.warning("Skipping PLC network member %s, its serial number is unknown", device.ip)
+                await device.async_disconnect()
+                del devices[device.mac]
+        return devices
+
+    async def _async_connect_member(
+        self, member: GetNetworkOverview.Device, firmware: tuple[str, str] | None, port_timeout: float
+    ) -> Device | None:
+        """Connect to a member of the PLC network reusing the mDNS information of this device where possible."""
+        device = Device(ip=member.ipv4_address, zeroconf_instance=self._zeroconf)
+        device.password = self.password
+        service_types = [service_type for service_type, info in self._info.items() if info.properties]
+        if (member.product_id, member.full_version) == firmware and all(
+            await asyncio.gather(
+                *(self._port_open(member.ipv4_address, self._info[api].port, port_timeout) for api in service_types)
+            )
+        ):
+            info = {service_type: self._member_info(service_type, member) for service_type in service_types}
+            await device._async_connect_with_info(info, session_instance=self._session)
+            return device
+        self._logger.debug("Falling back to mDNS for %s", member.ipv4_address)
+        device._debug_buffer.record("Falling back to mDNS, firmware or API ports differ from %s", self.ip)
+        try:
+            await device.async_connect(session_instance=self._session)
+        except DeviceNotFound:
+            return None
+        return device
+
+    async def _async_connect_with_info(
+        self, info: dict[str, ZeroconfServiceInfo], session_instance: AsyncClient | None = None
+    ) -> None:
+        """Connect to a device asynchronous using already known mDNS information."""
+        await self._setup(session_instance)
+        self._info.update(info)
+        await self._get_device_info()
+        await self._get_plcnet_info()
+        if not self.device and not self.plcnet:
+            raise DeviceNotFound(self.ip)
+        self._connected = True
+
+    async def _async_resolve_serial_numbers(self, devices: list[Device]) -> None:
+        """Browse for the device API once via multicast mDNS and take the answers of the given devices."""
+        pending = {device.ip: device for device in devices}
+
+        async def resolve(zeroconf: Zeroconf, service_type: str, name: str) -> None:
+            service_info = AsyncServiceInfo(service_type, name)
+            with suppress(RuntimeError):
+                await service_info.async_request(zeroconf, timeout=1000, question_type=DNSQuestionType.QM)
+            for ip in service_info.parsed_addresses() if service_info.addresses else []:
+                device: Device | None = pending.pop(ip, None)
+                if device and (info := self.info_from_service(service_info)):
+                    await device._async_update_info(info)  # noqa: SLF001
+
+        def state_change(zeroconf: Zeroconf, service_type: str, name: str, state_change: ServiceStateChange) -> None:
+            if state_change == ServiceStateChange.Removed:
+                return
+            task = asyncio.create_task(resolve(zeroconf, service_type, name))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+        self._debug_buffer.record("Browsing for serial numbers of %s", list(pending))
+        browser = AsyncServiceBrowser(
+            zeroconf=self._zeroconf.zeroconf, type_=[DEVICEAPI], handlers=[state_change], question_type=DNSQuestionType.QM
+        )
+        counter = 0
+        while pending and counter < self.MDNS_TIMEOUT:
+            counter += 1
+            await asyncio.sleep(0.01)
+        await browser.async_cancel()
+        self._debug_buffer.record("Browsing finished after %s polls, unresolved %s", counter, list(pending))
+
+    async def _async_update_info(self, info: ZeroconfServiceInfo) -> None:
+        """Take newer mDNS information of the device API, e.g. after an IP or firmware change, keeping the HTTP session."""
+        if info == self._info[DEVICEAPI]:
+            return
+        old_ip, self.ip = self.ip, str(ip_address(info.address))
+        self._debug_buffer.record("Updating service info of %s from discovery", self.ip)
+        self._info[DEVICEAPI] = info
+        if self._info[PLCNETAPI].properties:
+            self._info[PLCNETAPI] = replace(self._info[PLCNETAPI], address=info.address)
+        if self._connected:
+            await self._get_device_info()
+            await self._get_plcnet_info()
+            if self.ip != old_ip:
+                await self._get_zeroconf_info()  # Restart browsing, as unicast queries still go to the old address
+
     async def async_disconnect(self) -> None:
         """Disconnect from a device asynchronous."""
         if self._connected:
@@ -164,6 +363,48 @@ class Device:
         """Disconnect from a device synchronous."""
         asyncio.run(self.async_disconnect())
 
+    async def _setup(self, session_instance: AsyncClient | None) -> None:
+        """Set up HTTP client and Zeroconf instance."""
+        self._session_instance = session_instance
+        self._session = self._session_instance or AsyncClient()
+        if not self._zeroconf_instance:
+            self._zeroconf = AsyncZeroconf(interfaces=await self._get_relevant_interfaces())
+        elif isinstance(self._zeroconf_instance, Zeroconf):
+            self._zeroconf = AsyncZeroconf(zc=self._zeroconf_instance)
+        else:
+            self._zeroconf = self._zeroconf_instance
+
+    def _member_info(self, service_type: str, member: GetNetworkOverview.Device) -> ZeroconfServiceInfo:
+        """Derive mDNS information of a PLC network member from the information of this device."""
+        properties = {
+            key: value
+            for key, value in self._info[service_type].properties.items()
+            if key in ("Path", "path", "Version", "Features", "PlcTechnology")
+        }
+        if service_type == DEVICEAPI:
+            properties.update(
+                MT=member.product_id.removeprefix("MT"), Product=member.product_name, FirmwareVersion=member.full_version
+            )
+        else:
+            properties["PlcMacAddress"] = member.mac_address
+        return ZeroconfServiceInfo(
+            address=inet_aton(member.ipv4_address), port=self._info[service_type].port, properties=properties
+        )
+
+    @staticmethod
+    async def _port_open(ip: str, port: int | None, timeout: float) -> bool:
+        """Check, if a TCP port accepts connections."""
+        if port is None:
+            return False
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        with suppress(OSError):
+            await writer.wait_closed()
+        return True
+
     async def _get_relevant_interfaces(self) -> list[str]:
         """Get the IP address of the relevant interface to reduce traffic."""
         interface: list[str] = []
@@ -186,11 +427,13 @@ class Device:
         if self._info[service_type].properties:
             self.mt_number = self._info[service_type].properties.get("MT", "0")
             self.product = self._info[service_type].properties.get("Product", "")
-            self.serial_number = self._info[service_type].properties["SN"]
+            self.serial_number = self._info[service_type].properties.get("SN", self.serial_number)
             self.device = DeviceApi(
                 ip=str(ip_address(self._info[service_type].address)),
                 session=self._session,
                 info=self._info[service_type],
+                limiter=self._limiter,
+                debug_buffer=self._debug_buffer,
             )
             self.device.password = self.password
 
@@ -204,6 +447,8 @@ class Device:
                 ip=str(ip_address(self._info[service_type].address)),
                 session=self._session,
                 info=self._info[service_type],
+                limiter=self._limiter,
+                debug_buffer=self._debug_buffer,
             )
             self.plcnet.password = self.password
 
@@ -211,29 +456,41 @@ class Device:
         """Browse for the desired mDNS service types and query them."""
         service_types = [DEVICEAPI, PLCNETAPI]
         counter = 0
+        start = time.perf_counter()
         self._logger.debug("Browsing for %s", service_types)
+        self._debug_buffer.record("Browsing for %s via %s", service_types, "multicast" if self._multicast else "unicast")
         addr = None if self._multicast else self.ip
         question_type = DNSQuestionType.QM if self._multicast else DNSQuestionType.QU
-        if self._browser:
-            await self._browser.async_cancel()
-            self._browser = None
-        self._browser = AsyncServiceBrowser(
-            zeroconf=self._zeroconf.zeroconf,
-            type_=service_types,
-            handlers=[self._state_change],
-            addr=addr,
-            question_type=question_type,
+        with trace("mdns_browse", ip=self.ip, multicast=self._multicast) as span:
+            if self._browser:
+                await self._browser.async_cancel()
+                self._browser = None
+            self._browser = AsyncServiceBrowser(
+                zeroconf=self._zeroconf.zeroconf,
+                type_=service_types,
+                handlers=[self._state_change],
+                addr=addr,
+                question_type=question_type,
+            )
+            while (
+                not self._info[DEVICEAPI].properties
+                or (not self._info[PLCNETAPI].properties and self.mt_number not in DEVICES_WITHOUT_PLCNET)
+            ) and counter < self.MDNS_TIMEOUT:
+                counter += 1
+                await asyncio.sleep(0.01)
+            span.set_attribute("found", bool(self._info[DEVICEAPI].properties))
+        self._debug_buffer.record(
+            "Browsing finished after %s polls, found %s", counter, [st for st, info in self._info.items() if info.properties]
         )
-        while (
-            not self._info[DEVICEAPI].properties
-            or (not self._info[PLCNETAPI].properties and self.mt_number not in DEVICES_WITHOUT_PLCNET)
-        ) and counter < self.MDNS_TIMEOUT:
-            counter += 1
-            await asyncio.sleep(0.01)
+        if (instrumentation := get_instrumentation()) is not None:
+            instrumentation.mdns_resolved(
+                self.ip, time.perf_counter() - start, multicast=self._multicast, found=bool(self._info[DEVICEAPI].properties)
+            )
 
     async def _retry_zeroconf_info(self) -> None:
         """Retry getting the zeroconf info using multicast."""
         self._logger.debug("Having trouble getting results via unicast messages. Switching to multicast for this device.")
+        self._debug_buffer.record("No answer via unicast, switching to multicast")
         self._multicast = True
         await self._get_zeroconf_info()
 
@@ -252,16 +509,20 @@ class Device:
             DEVICEAPI: self._get_device_info,
             PLCNETAPI: self._get_plcnet_info,
         }
-        with suppress(RuntimeError):
-            if not self._multicast:
-                await service_info.async_request(zeroconf, timeout=1000, question_type=DNSQuestionType.QU, addr=self.ip)
-            else:
-                await service_info.async_request(zeroconf, timeout=1000, question_type=DNSQuestionType.QM)
+        with trace("service_info", ip=self.ip, service_type=service_type, name=name, multicast=self._multicast) as span:
+            with suppress(RuntimeError):
+                if not self._multicast:
+                    await service_info.async_request(zeroconf, timeout=1000, question_type=DNSQuestionType.QU, addr=self.ip)
+                else:
+                    await service_info.async_request(zeroconf, timeout=1000, question_type=DNSQuestionType.QM)
+            span.set_attribute("found", bool(service_info.addresses and self.ip in service_info.parsed_addresses()))
 
         if not service_info.addresses or self.ip not in service_info.parsed_addresses():
+            self._debug_buffer.record("Ignoring %s of %s at %s", service_type, name, service_info.parsed_addresses())
             return  # No need to continue, if there are no relevant service information
 
         self._logger.debug("Updating service info of %s for %s", service_type, service_info.server_key)
+        self._debug_buffer.record("Updating service info of %s for %s", service_type, service_info.server_key)
         if info := self.info_from_service(service_info):
             self._info[service_type] = info
             await update[service_type]()
@@ -1,32 +1,39 @@
 """The devolo device API."""
 
 import re
+from typing import TYPE_CHECKING
 
-from .deviceapi import DeviceApi
-from .multiap_pb2 import WifiMultiApGetResponse
-from .support_pb2 import SupportInfoDump
-from .updatefirmware_pb2 import UpdateFirmwareCheck
-from .wifinetwork_pb2 import (
-    WIFI_BAND_2G,
-    WIFI_BAND_5G,
-    WIFI_VAP_GUEST_AP,
-    WIFI_VAP_MAIN_AP,
-    WIFI_VAP_STATION,
-    WifiConnectedStationsGet,
-    WifiGuestAccessGet,
-    WifiNeighborAPsGet,
-    WifiRepeatedAPsGet,
-)
+from devolo_plc_api.lazy import lazy_getattr
+
+if TYPE_CHECKING:
+    from .configlayer import ConfigLayer, ConfigLayerParser, iter_configlayer
+    from .deviceapi import DeviceApi
+    from .multiap_pb2 import WifiMultiApGetResponse
+    from .support import SupportInfoFile
+    from .support_pb2 import SupportInfoDump
+    from .updatefirmware_pb2 import UpdateFirmwareCheck
+    from .wifinetwork_pb2 import (
+        WIFI_BAND_2G,
+        WIFI_BAND_5G,
+        WIFI_VAP_GUEST_AP,
+        WIFI_VAP_MAIN_AP,
+        WIFI_VAP_STATION,
+        WifiConnectedStationsGet,
+        WifiGuestAccessGet,
+        WifiNeighborAPsGet,
+        WifiRepeatedAPsGet,
+    )
+
+    UPDATE_AVAILABLE = UpdateFirmwareCheck.UPDATE_AVAILABLE
+    UPDATE_NOT_AVAILABLE = UpdateFirmwareCheck.UPDATE_NOT_AVAILABLE
+
+    RepeatedAPInfo = WifiRepeatedAPsGet.RepeatedAPInfo
+    ConnectedStationInfo = WifiConnectedStationsGet.ConnectedStationInfo
+    NeighborAPInfo = WifiNeighborAPsGet.NeighborAPInfo
+    SupportInfoItem = SupportInfoDump.SupportInfoItem
 
 CONFIGLAYER_FORMAT = re.compile(rb"(([A-Z][A-Z0-9._]+)=(.+?))(?=(([A-Z][A-Z0-9._]+)=(.+))|$)", re.DOTALL)
 SERVICE_TYPE = "_dvl-deviceapi._tcp.local."
-UPDATE_AVAILABLE = UpdateFirmwareCheck.UPDATE_AVAILABLE
-UPDATE_NOT_AVAILABLE = UpdateFirmwareCheck.UPDATE_NOT_AVAILABLE
-
-RepeatedAPInfo = WifiRepeatedAPsGet.RepeatedAPInfo
-ConnectedStationInfo = WifiConnectedStationsGet.ConnectedStationInfo
-NeighborAPInfo = WifiNeighborAPsGet.NeighborAPInfo
-SupportInfoItem = SupportInfoDump.SupportInfoItem
 
 __all__ = [
     "CONFIGLAYER_FORMAT",
@@ -38,11 +45,44 @@ __all__ = [
     "WIFI_VAP_GUEST_AP",
     "WIFI_VAP_MAIN_AP",
     "WIFI_VAP_STATION",
+    "ConfigLayer",
+    "ConfigLayerParser",
     "ConnectedStationInfo",
     "DeviceApi",
     "NeighborAPInfo",
     "RepeatedAPInfo",
+    "SupportInfoFile",
     "SupportInfoItem",
     "WifiGuestAccessGet",
     "WifiMultiApGetResponse",
+    "iter_configlayer",
 ]
+
+__getattr__, __dir__ = lazy_getattr(
+    __name__,
+    {
+        "ConfigLayer": ".configlayer:ConfigLayer",
+        "ConfigLayerParser": ".configlayer:ConfigLayerParser",
+        "iter_configlayer": ".configlayer:iter_configlayer",
+        "DeviceApi": ".deviceapi:DeviceApi",
+        "WifiMultiApGetResponse": ".multiap_pb2:WifiMultiApGetResponse",
+        "SupportInfoDump": ".support_pb2:SupportInfoDump",
+        "SupportInfoFile": ".support:SupportInfoFile",
+        "UpdateFirmwareCheck": ".updatefirmware_pb2:UpdateFirmwareCheck",
+        "WIFI_BAND_2G": ".wifinetwork_pb2:WIFI_BAND_2G",
+        "WIFI_BAND_5G": ".wifinetwork_pb2:WIFI_BAND_5G",
+        "WIFI_VAP_GUEST_AP": ".wifinetwork_pb2:WIFI_VAP_GUEST_AP",
+        "WIFI_VAP_MAIN_AP": ".wifinetwork_pb2:WIFI_VAP_MAIN_AP",
+        "WIFI_VAP_STATION": ".wifinetwork_pb2:WIFI_VAP_STATION",
+        "WifiConnectedStationsGet": ".wifinetwork_pb2:WifiConnectedStationsGet",
+        "WifiGuestAccessGet": ".wifinetwork_pb2:WifiGuestAccessGet",
+        "WifiNeighborAPsGet": ".wifinetwork_pb2:WifiNeighborAPsGet",
+        "WifiRepeatedAPsGet": ".wifinetwork_pb2:WifiRepeatedAPsGet",
+        "UPDATE_AVAILABLE": ".updatefirmware_pb2:UpdateFirmwareCheck.UPDATE_AVAILABLE",
+        "UPDATE_NOT_AVAILABLE": ".updatefirmware_pb2:UpdateFirmwareCheck.UPDATE_NOT_AVAILABLE",
+        "RepeatedAPInfo": ".wifinetwork_pb2:WifiRepeatedAPsGet.RepeatedAPInfo",
+        "ConnectedStationInfo": ".wifinetwork_pb2:WifiConnectedStationsGet.ConnectedStationInfo",
+        "NeighborAPInfo": ".wifinetwork_pb2:WifiNeighborAPsGet.NeighborAPInfo",
+        "SupportInfoItem": ".support_pb2:SupportInfoDump.SupportInfoItem",
+    },
+)
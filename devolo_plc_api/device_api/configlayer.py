@@ -0,0 +1,172 @@
+"""Parse CONFIGLAYER dumps of the support info."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+KEY_START = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+KEY_CHARACTERS = KEY_START + b"0123456789._"
+# Classify every byte as key start (U), other key character (c) or no key character (0) to search with bytes methods.
+KEY_TABLE = bytes(ord("U") if c in KEY_START else ord("c") if c in KEY_CHARACTERS else 0 for c in range(256))
+
+
+def iter_configlayer(content: bytes) -> Iterator[tuple[bytes, bytes]]:
+    """
+    Split CONFIGLAYER content into key value pairs in a single pass. The result equals the groups 2 and 3 of
+    CONFIGLAYER_FORMAT.finditer, but without backtracking on large content.
+
+    :param content: Content of a support info item
+    :return: Key value pairs in the order of appearance
+    """
+    classes = content.translate(KEY_TABLE)
+    key = _find_key(content, classes, 0, 0)
+    while key is not None:
+        start, separator = key
+        key = _find_key(content, classes, separator + 2, separator + 2)
+        yield content[start:separator], content[separator + 1 : _value_end(content, separator, key)]
+
+
+class ConfigLayerParser:
+    """Split CONFIGLAYER content into key value pairs while receiving it in chunks."""
+
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        self._buffer = bytearray()
+        self._classes = bytearray()
+        self._key: tuple[int, int] | None = None
+        self._search = 0
+
+    def feed(self, chunk: bytes) -> list[tuple[bytes, bytes]]:
+        """
+        Add a chunk of content.
+
+        :param chunk: Next chunk of content
+        :return: Key value pairs, that are complete
+        """
+        self._buffer += chunk
+        self._classes += chunk.translate(KEY_TABLE)
+        pairs: list[tuple[bytes, bytes]] = []
+        if self._key is None:
+            self._key = _find_key(self._buffer, self._classes, 0, self._search)
+            if self._key is None:
+                self._search = self._rescan_position()
+                return pairs
+            self._search = self._key[1] + 2
+        while self._key is not None:
+            start, separator = self._key
+            if (key := _find_key(self._buffer, self._classes, separator + 2, self._search)) is None:
+                self._search = max(self._rescan_position(), separator + 2)
+                break
+            pairs.append((bytes(self._buffer[start:separator]), bytes(self._buffer[separator + 1 : key[0]])))
+            self._key = key
+            self._search = key[1] + 2
+        if self._key is not None and self._key[0]:
+            offset = self._key[0]
+            del self._buffer[:offset]
+            del self._classes[:offset]
+            self._key = (0, self._key[1] - offset)
+            self._search -= offset
+        return pairs
+
+    def close(self) -> list[tuple[bytes, bytes]]:
+        """
+        Signal the end of the content.
+
+        :return: Remaining key value pairs
+        """
+        content = bytes(self._buffer)
+        self._buffer.clear()
+        self._classes.clear()
+        key, self._key = self._key, None
+        self._search = 0
+        if key is None:
+            return list(iter_configlayer(content))
+        return [(content[key[0] : key[1]], content[key[1] + 1 : _value_end(content, key[1], None)])]
+
+    def _rescan_position(self) -> int:
+        """Find the position to continue the search for a separator after more content arrived."""
+        separator = self._buffer.rfind(b"=", self._search)
+        return len(self._buffer) if separator == -1 else separator
+
+
+class ConfigLayer:
+    """
+    Key value pairs of CONFIGLAYER content. Pairs are parsed not before they are used and the index for lookups is built
+    on first lookup. Chunks can only be iterated once, so use the index to access them repeatedly.
+
+    :param content: Content of a support info item or chunks of it
+    """
+
+    def __init__(self, content: bytes | Iterable[bytes]) -> None:
+        """Initialize the config layer."""
+        self._content = content
+        self._index: dict[bytes, bytes] | None = None
+
+    def __contains__(self, key: bytes) -> bool:
+        """Check, if a key is present."""
+        return key in self.index
+
+    def __getitem__(self, key: bytes) -> bytes:
+        """Get the value of a key. If a key is present multiple times, the last value wins."""
+        return self.index[key]
+
+    def __iter__(self) -> Iterator[tuple[bytes, bytes]]:
+        """Iterate over all key value pairs in the order of appearance."""
+        if isinstance(self._content, (bytes, bytearray)):
+            yield from iter_configlayer(self._content)
+            return
+        parser = ConfigLayerParser()
+        for chunk in self._content:
+            yield from parser.feed(chunk)
+        yield from parser.close()
+
+    @property
+    def index(self) -> dict[bytes, bytes]:
+        """Lookup table of all keys."""
+        if self._index is None:
+            self._index = dict(self)
+        return self._index
+
+    def get(self, key: bytes, default: bytes | None = None) -> bytes | None:
+        """
+        Get the value of a key.
+
+        :param key: Key to look up
+        :param default: Value to return, if the key is not present
+        :return: Value of the key
+        """
+        return self.index.get(key, default)
+
+
+def _find_key(content: bytes | bytearray, classes: bytes | bytearray, start: int, search: int) -> tuple[int, int] | None:
+    """
+    Find the leftmost key at or after start that is followed by a separator and at least one character of value.
+
+    :param content: Content to search in
+    :param classes: Content translated with KEY_TABLE
+    :param start: First position a key may begin at
+    :param search: First position to search for a separator at
+    :return: Start of the key and position of the separator
+    """
+    length = len(content)
+    separator = content.find(b"=", max(search, start + 2))
+    while separator != -1:
+        if separator + 1 == length:
+            return None  # The value is not there (yet)
+        boundary = classes.rfind(b"\0", start, separator)
+        if (position := classes.find(b"U", start if boundary == -1 else boundary + 1, separator - 1)) != -1:
+            return position, separator
+        separator = content.find(b"=", separator + 1)
+    return None
+
+
+def _value_end(content: bytes, separator: int, key: tuple[int, int] | None) -> int:
+    """Find the end of a value that is followed by the next key or the end of the content."""
+    if key is not None:
+        return key[0]
+    if content.endswith(b"\n") and len(content) - 1 > separator + 1:
+        return len(content) - 1
+    return len(content)
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import functools
-from typing import TYPE_CHECKING, Callable, TypeVar
+from os import PathLike
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Callable, TypeVar
 
 from devolo_plc_api.clients import Protobuf
+from devolo_plc_api.diagnostics import DebugBuffer
 from devolo_plc_api.exceptions import FeatureNotSupported
 
 from .factoryreset_pb2 import FactoryResetStart
@@ -30,6 +34,7 @@ if TYPE_CHECKING:
     from httpx import AsyncClient
     from typing_extensions import Concatenate, ParamSpec
 
+    from devolo_plc_api.clients import RequestLimiter
     from devolo_plc_api.zeroconf import ZeroconfServiceInfo
 
     _ReturnT = TypeVar("_ReturnT")
@@ -63,13 +68,24 @@ class DeviceApi(Protobuf):
     :param ip: IP address of the device to communicate with
     :param session: HTTP client session
     :param info: Information collected from the mDNS query
+    :param limiter: Limiter of concurrent requests to the device
+    :param debug_buffer: Buffer to record debug events of the device in
     """
 
-    def __init__(self, ip: str, session: AsyncClient, info: ZeroconfServiceInfo) -> None:
+    def __init__(
+        self,
+        ip: str,
+        session: AsyncClient,
+        info: ZeroconfServiceInfo,
+        limiter: RequestLimiter | None = None,
+        debug_buffer: DebugBuffer | None = None,
+    ) -> None:
         """Initialize the device API."""
         super().__init__()
 
+        self._debug_buffer = DebugBuffer() if debug_buffer is None else debug_buffer
         self._ip = ip
+        self._limiter = limiter
         # HC gateway has no Path, it has a path.
         self._path = info.properties.get("Path") or info.properties.get("path")
         self._port = info.port
@@ -203,6 +219,24 @@ class DeviceApi(Protobuf):
         support_info.ParseFromString(await response.aread())
         return support_info.info
 
+    @_feature("support")
+    async def async_download_support_info(self, target: str | PathLike[str] | BinaryIO) -> int:
+        """
+        Stream support info from the device into a file without keeping it in memory. This feature only works on devices,
+        that announce the support feature. Use SupportInfoFile to read the items afterwards.
+
+        :param target: Path or binary file object to write the raw response to
+        :return: Number of bytes written
+        """
+        self._logger.debug("Download support info.")
+        if not isinstance(target, (str, PathLike)):
+            return await self._async_download("SupportInfoDump", target, timeout=LONG_RUNNING)
+        file = await asyncio.to_thread(Path(target).open, "wb")
+        try:
+            return await self._async_download("SupportInfoDump", file, timeout=LONG_RUNNING)
+        finally:
+            await asyncio.to_thread(file.close)
+
     @_feature("update")
     async def async_check_firmware_available(self) -> UpdateFirmwareCheck:
         """
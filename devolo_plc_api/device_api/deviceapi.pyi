@@ -6,16 +6,19 @@ from .multiap_pb2 import WifiMultiApGetResponse
 from .support_pb2 import SupportInfoDump
 from .updatefirmware_pb2 import UpdateFirmwareCheck
 from .wifinetwork_pb2 import WifiConnectedStationsGet, WifiGuestAccessGet, WifiNeighborAPsGet, WifiRepeatedAPsGet
-from devolo_plc_api.clients import Protobuf
+from devolo_plc_api.clients import Protobuf, RequestLimiter as RequestLimiter
+from devolo_plc_api.diagnostics import DebugBuffer
 from devolo_plc_api.zeroconf import ZeroconfServiceInfo as ZeroconfServiceInfo
 from httpx import AsyncClient as AsyncClient
+from os import PathLike
+from typing import BinaryIO
 
 LONG_RUNNING: float
 
 class DeviceApi(Protobuf):
     features: list[str]
     password: str
-    def __init__(self, ip: str, session: AsyncClient, info: ZeroconfServiceInfo) -> None: ...
+    def __init__(self, ip: str, session: AsyncClient, info: ZeroconfServiceInfo, limiter: RequestLimiter | None = None, debug_buffer: DebugBuffer | None = None) -> None: ...
     async def async_get_led_setting(self) -> bool: ...
     async def async_set_led_setting(self, enable: bool) -> bool: ...
     async def async_get_wifi_multi_ap(self) -> WifiMultiApGetResponse: ...
@@ -25,6 +28,7 @@ class DeviceApi(Protobuf):
     async def async_restart(self) -> bool: ...
     async def async_uptime(self) -> int: ...
     async def async_get_support_info(self) -> SupportInfoDump: ...
+    async def async_download_support_info(self, target: str | PathLike[str] | BinaryIO) -> int: ...
     async def async_check_firmware_available(self) -> UpdateFirmwareCheck: ...
     async def async_start_firmware_update(self) -> bool: ...
     async def async_get_wifi_connected_station(self) -> list[WifiConnectedStationsGet.ConnectedStationInfo]: ...
@@ -41,6 +45,7 @@ class DeviceApi(Protobuf):
     def restart(self) -> bool: ...
     def uptime(self) -> int: ...
     def get_support_info(self) -> SupportInfoDump: ...
+    def download_support_info(self, target: str | PathLike[str] | BinaryIO) -> int: ...
     def check_firmware_available(self) -> UpdateFirmwareCheck: ...
     def start_firmware_update(self) -> bool: ...
     def get_wifi_connected_station(self) -> list[WifiConnectedStationsGet.ConnectedStationInfo]: ...
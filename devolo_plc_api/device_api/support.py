@@ -0,0 +1,170 @@
+"""Read support info dumps stored in files."""
+
+from __future__ import annotations
+
+import mmap
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .support_pb2 import SupportInfoDump
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from os import PathLike
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+CHUNK_SIZE = 65536
+RESULT_FIELD = 1
+INFO_FIELD = 3
+ITEMS_FIELD = 1
+LABEL_FIELD = 1
+CONTENT_FIELD = 2
+VARINT = 0
+LENGTH_DELIMITED = 2
+
+
+class SupportInfoFile:
+    """
+    Support info dump, that was downloaded to a file. The file is memory-mapped and only the position of every item is
+    kept in memory. Labels and contents are read not before they are accessed.
+
+    :param path: Path to the raw response of SupportInfoDump
+    """
+
+    def __init__(self, path: str | PathLike[str]) -> None:
+        """Open the file."""
+        with Path(path).open("rb") as file:
+            try:
+                self._buffer: mmap.mmap | bytes = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                self._buffer = b""  # Empty files cannot be mapped
+        self._result = 0
+        self._items: list[tuple[str, int, int]] | None = None
+
+    def __contains__(self, label: str) -> bool:
+        """Check, if an item with the label exists."""
+        return label in self.labels
+
+    def __enter__(self) -> Self:
+        """Use the file in a context manager."""
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None
+    ) -> None:
+        """Close the file when leaving a context manager."""
+        self.close()
+
+    def __getitem__(self, label: str) -> bytes:
+        """Read the content of the first item with the label."""
+        start, end = self._find(label)
+        return self._buffer[start:end]
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return len(self._index())
+
+    @property
+    def labels(self) -> list[str]:
+        """Labels of all items in the order of appearance."""
+        return [label for label, _, _ in self._index()]
+
+    @property
+    def result(self) -> int:
+        """Result of the SupportInfoDumpResponse."""
+        self._index()
+        return self._result
+
+    def chunks(self, label: str, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Read the content of the first item with the label piece by piece, e.g. to feed a ConfigLayerParser.
+
+        :param label: Label of the item
+        :param size: Maximum size of a chunk in bytes
+        :return: Chunks of content
+        """
+        start, end = self._find(label)
+        for offset in range(start, end, size):
+            yield self._buffer[offset : min(offset + size, end)]
+
+    def close(self) -> None:
+        """Close the file."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def items(self) -> Iterator[SupportInfoDump.SupportInfoItem]:
+        """
+        Read all items one after another.
+
+        :return: Support info items
+        """
+        for label, start, end in self._index():
+            yield SupportInfoDump.SupportInfoItem(label=label, content=self._buffer[start:end])
+
+    def _find(self, label: str) -> tuple[int, int]:
+        """Find the position of an item's content."""
+        for item_label, start, end in self._index():
+            if item_label == label:
+                return start, end
+        raise KeyError(label)
+
+    def _index(self) -> list[tuple[str, int, int]]:
+        """Walk the protobuf wire format once and remember label and position of every item."""
+        if self._items is not None:
+            return self._items
+        self._items = []
+        for number, wire_type, start, end in _fields(self._buffer, 0, len(self._buffer)):
+            if number == RESULT_FIELD and wire_type == VARINT:
+                self._result = _varint(self._buffer, start)[0]
+            elif number == INFO_FIELD and wire_type == LENGTH_DELIMITED:
+                for item_number, item_type, item_start, item_end in _fields(self._buffer, start, end):
+                    if item_number == ITEMS_FIELD and item_type == LENGTH_DELIMITED:
+                        self._items.append(self._item(item_start, item_end))
+        return self._items
+
+    def _item(self, start: int, end: int) -> tuple[str, int, int]:
+        """Get label and position of the content of an item."""
+        label, content_start, content_end = "", start, start
+        for number, wire_type, field_start, field_end in _fields(self._buffer, start, end):
+            if number == LABEL_FIELD and wire_type == LENGTH_DELIMITED:
+                label = self._buffer[field_start:field_end].decode("utf-8")
+            elif number == CONTENT_FIELD and wire_type == LENGTH_DELIMITED:
+                content_start, content_end = field_start, field_end
+        return label, content_start, content_end
+
+
+def _fields(buffer: mmap.mmap | bytes, start: int, end: int) -> Iterator[tuple[int, int, int, int]]:
+    """Yield field number, wire type and the position of the value of all fields of a protobuf message."""
+    offset = start
+    while offset < end:
+        key, offset = _varint(buffer, offset)
+        wire_type = key & 0x07
+        if wire_type == VARINT:
+            value_start = offset
+            _, offset = _varint(buffer, offset)
+            yield key >> 3, wire_type, value_start, offset
+            continue
+        if wire_type == LENGTH_DELIMITED:
+            length, offset = _varint(buffer, offset)
+        elif wire_type in (1, 5):
+            length = 8 if wire_type == 1 else 4
+        else:
+            raise ValueError(f"Unsupported wire type {wire_type}")  # noqa: EM102, TRY003
+        if offset + length > end:
+            raise ValueError("Truncated support info")  # noqa: EM101, TRY003
+        yield key >> 3, wire_type, offset, offset + length
+        offset += length
+
+
+def _varint(buffer: mmap.mmap | bytes, offset: int) -> tuple[int, int]:
+    """Decode a varint and return it together with the offset of the next byte."""
+    result = shift = 0
+    while True:
+        byte = buffer[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, offset
+        shift += 7
@@ -0,0 +1,40 @@
+"""Look into the communication with devolo devices."""
+
+from .debugbuffer import DEBUG_EVENTS, DUMP_INTERVAL, DebugBuffer
+from .instrumentation import (
+    LATENCY_BUCKETS,
+    Histogram,
+    Instrumentation,
+    Measurement,
+    MemoryCollector,
+    get_instrumentation,
+    set_instrumentation,
+)
+from .profiling import Profiler, get_profiler, profile, set_profiler
+from .prometheus import PrometheusExporter
+from .tracing import JsonLinesExporter, Span, SpanExporter, current_span, get_span_exporter, set_span_exporter, trace
+
+__all__ = [
+    "DEBUG_EVENTS",
+    "DUMP_INTERVAL",
+    "LATENCY_BUCKETS",
+    "DebugBuffer",
+    "Histogram",
+    "Instrumentation",
+    "JsonLinesExporter",
+    "Measurement",
+    "MemoryCollector",
+    "Profiler",
+    "PrometheusExporter",
+    "Span",
+    "SpanExporter",
+    "current_span",
+    "get_instrumentation",
+    "get_profiler",
+    "get_span_exporter",
+    "profile",
+    "set_instrumentation",
+    "set_profiler",
+    "set_span_exporter",
+    "trace",
+]
@@ -0,0 +1,102 @@
+"""Keep recent debug events of a device in memory."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import logging
+    from collections.abc import Iterator
+
+DEBUG_EVENTS = 128
+"""Default number of events kept per device."""
+
+DUMP_INTERVAL = 60.0
+"""Default minimum number of seconds between two dumps of a device on errors."""
+
+_guarded: ContextVar[DebugBuffer | None] = ContextVar("devolo_plc_api_debug_buffer", default=None)
+
+
+class DebugBuffer:
+    """
+    Ring buffer of recent debug events of a device. Recording only stores the message template and its arguments, so it is
+    cheap enough to stay enabled for a whole fleet. Messages are formatted not before the events are read or dumped.
+
+    :param capacity: Number of events to keep, older events are dropped
+    :param dump_interval: Minimum seconds between two dumps on errors, so a device failing over and over, e.g. while in
+                          standby, does not flood the log
+    """
+
+    __slots__ = ("_dump_interval", "_dumped", "_events")
+
+    def __init__(self, capacity: int = DEBUG_EVENTS, dump_interval: float = DUMP_INTERVAL) -> None:
+        """Initialize an empty buffer."""
+        self._events: deque[tuple[float, str, tuple[Any, ...]]] = deque(maxlen=capacity)
+        self._dump_interval = dump_interval
+        self._dumped = -float("inf")
+
+    def __len__(self) -> int:
+        """Return the number of kept events."""
+        return len(self._events)
+
+    def record(self, msg: str, *args: Any) -> None:
+        """
+        Record an event.
+
+        :param msg: Message with %-style placeholders like in logging
+        :param args: Values of the placeholders
+        """
+        self._events.append((time.time(), msg, args))
+
+    def events(self) -> list[str]:
+        """
+        Format the kept events.
+
+        :return: Events with UTC timestamp, oldest first
+        """
+        return [
+            f"{datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat(timespec='milliseconds')} "
+            f"{msg % args if args else msg}"
+            for timestamp, msg, args in list(self._events)
+        ]
+
+    def dump(self, logger: logging.Logger, reason: str) -> None:
+        """
+        Log the kept events as a single warning and forget them, so they are not dumped twice.
+
+        :param logger: Logger to write to
+        :param reason: What caused the dump, e.g. an error
+        """
+        if not self._events:
+            return
+        events = self.events()
+        self._events.clear()
+        logger.warning("Recent events before %s:\n%s", reason, "\n".join(events))
+
+    @contextmanager
+    def dump_on_error(self, logger: logging.Logger) -> Iterator[None]:
+        """
+        Dump the kept events, if the wrapped code raises an exception. Only the outermost operation dumps, e.g. a connect
+        and not each of its requests, and only, if dump_interval passed since the last dump. Otherwise the events are kept
+        for the next dump.
+
+        :param logger: Logger to write to
+        """
+        if _guarded.get() is self:
+            yield
+            return
+        token = _guarded.set(self)
+        try:
+            yield
+        except Exception as e:
+            if time.monotonic() - self._dumped >= self._dump_interval:
+                self._dumped = time.monotonic()
+                self.dump(logger, repr(e))
+            raise
+        finally:
+            _guarded.reset(token)
@@ -0,0 +1,295 @@
+"""Measure requests to devices."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""Upper bounds of the latency buckets in seconds."""
+
+_instrumentation: Instrumentation | None = None
+
+
+class Instrumentation:
+    """
+    Receiver of measurements. All hooks do nothing, so subclasses only override the hooks they need. Hooks are called
+    from the event loop and must not block.
+    """
+
+    def request_started(self, ip: str, endpoint: str) -> None:
+        """
+        Report that a request attempt started.
+
+        :param ip: IP address of the device
+        :param endpoint: Path of the endpoint relative to the API URL, e.g. LedSettingsGet
+        """
+
+    def request_finished(  # noqa: PLR0913, PLR0917
+        self, ip: str, endpoint: str, duration: float, sent: int, received: int, outcome: str
+    ) -> None:
+        """
+        Report that a request attempt finished.
+
+        :param ip: IP address of the device
+        :param endpoint: Path of the endpoint relative to the API URL, e.g. LedSettingsGet
+        :param duration: Seconds the attempt took
+        :param sent: Bytes of the request body
+        :param received: Bytes of the response body
+        :param outcome: HTTP status code or name of the exception, if no response was received
+        """
+
+    def request_retried(self, ip: str, endpoint: str) -> None:
+        """
+        Report that a failed request is going to be retried.
+
+        :param ip: IP address of the device
+        :param endpoint: Path of the endpoint relative to the API URL, e.g. LedSettingsGet
+        """
+
+    def password_hashed(self, ip: str, endpoint: str) -> None:
+        """
+        Report that a request was rejected as unauthorized and is repeated with the hashed password.
+
+        :param ip: IP address of the device
+        :param endpoint: Path of the endpoint relative to the API URL, e.g. LedSettingsGet
+        """
+
+    def mdns_resolved(self, ip: str, duration: float, *, multicast: bool, found: bool) -> None:
+        """
+        Report that browsing for the mDNS services of a device finished.
+
+        :param ip: IP address of the device
+        :param duration: Seconds browsing took
+        :param multicast: Queries were sent via multicast
+        :param found: The device API service was found
+        """
+
+
+def get_instrumentation() -> Instrumentation | None:
+    """
+    Get the instrumentation receiving measurements.
+
+    :return: Instrumentation or None, if measuring is disabled
+    """
+    return _instrumentation
+
+
+def set_instrumentation(instrumentation: Instrumentation | None) -> None:
+    """
+    Set the instrumentation receiving measurements of all devices. Measuring is disabled by default and costs nothing but
+    a few attribute lookups per request.
+
+    :param instrumentation: Instrumentation to use, None disables measuring
+    """
+    global _instrumentation  # noqa: PLW0603
+    _instrumentation = instrumentation
+
+
+class Measurement:
+    """
+    Measure a single request attempt, if an instrumentation is set.
+
+    :param ip: IP address of the device
+    :param endpoint: Path of the endpoint relative to the API URL
+    :param sent: Bytes of the request body
+    """
+
+    __slots__ = ("_endpoint", "_instrumentation", "_ip", "_sent", "_start", "received", "status")
+
+    def __init__(self, ip: str, endpoint: str, sent: int = 0) -> None:
+        """Initialize the measurement."""
+        self._instrumentation = _instrumentation
+        self._ip = ip
+        self._endpoint = endpoint
+        self._sent = sent
+        self._start = 0.0
+        self.received = 0
+        self.status = 0
+
+    def __enter__(self) -> Self:
+        """Start measuring."""
+        if self._instrumentation is not None:
+            self._instrumentation.request_started(self._ip, self._endpoint)
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None
+    ) -> None:
+        """Stop measuring."""
+        if self._instrumentation is None:
+            return
+        duration = time.perf_counter() - self._start
+        outcome = str(self.status) if self.status or exc_type is None else exc_type.__name__
+        self._instrumentation.request_finished(self._ip, self._endpoint, duration, self._sent, self.received, outcome)
+
+
+class Histogram:
+    """
+    Count observations in buckets with fixed upper bounds. Observations above the highest bound are counted in an extra
+    bucket.
+
+    :param buckets: Ascending upper bounds of the buckets
+    """
+
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    @property
+    def count(self) -> int:
+        """Number of observations."""
+        return sum(self.counts)
+
+    def observe(self, value: float) -> None:
+        """
+        Count an observation.
+
+        :param value: Observed value
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by the upper bound of the bucket it falls into.
+
+        :param q: Quantile between 0 and 1
+        :return: Upper bound of the bucket, infinite if it is above the highest bound, NaN without observations
+        """
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            seen += count
+            if seen and seen >= rank:
+                return bound
+        return float("nan")
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Describe the histogram with builtin types.
+
+        :return: Bounds, counts per bucket, sum and count of observations
+        """
+        return {"buckets": list(self.buckets), "counts": list(self.counts), "sum": self.sum, "count": self.count}
+
+
+class MemoryCollector(Instrumentation):
+    """
+    Keep measurements of all devices in memory. Latencies are kept as histograms per endpoint and per device, everything
+    else as counters. Collecting is thread safe, so devices used synchronously from several threads can share a collector.
+
+    :param buckets: Upper bounds of the latency buckets in seconds
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize an empty collector."""
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._endpoint_latency: dict[str, Histogram] = {}
+        self._device_latency: dict[str, Histogram] = {}
+        self._mdns_latency: dict[str, Histogram] = {}
+        self._requests: Counter[tuple[str, str, str]] = Counter()
+        self._sent: Counter[str] = Counter()
+        self._received: Counter[str] = Counter()
+        self._retries: Counter[tuple[str, str]] = Counter()
+        self._password_hashed: Counter[str] = Counter()
+        self._in_flight: Counter[str] = Counter()
+        self._mdns_failures: Counter[str] = Counter()
+
+    def request_started(self, ip: str, endpoint: str) -> None:  # noqa: ARG002
+        """Count the request as in flight."""
+        with self._lock:
+            self._in_flight[ip] += 1
+
+    def request_finished(  # noqa: PLR0913, PLR0917
+        self, ip: str, endpoint: str, duration: float, sent: int, received: int, outcome: str
+    ) -> None:
+        """Record latency, bytes and outcome of the request."""
+        with self._lock:
+            self._in_flight[ip] -= 1
+            self._histogram(self._endpoint_latency, endpoint).observe(duration)
+            self._histogram(self._device_latency, ip).observe(duration)
+            self._requests[ip, endpoint, outcome] += 1
+            self._sent[ip] += sent
+            self._received[ip] += received
+
+    def request_retried(self, ip: str, endpoint: str) -> None:
+        """Count the retry."""
+        with self._lock:
+            self._retries[ip, endpoint] += 1
+
+    def password_hashed(self, ip: str, endpoint: str) -> None:  # noqa: ARG002
+        """Count the fallback to the hashed password."""
+        with self._lock:
+            self._password_hashed[ip] += 1
+
+    def mdns_resolved(self, ip: str, duration: float, *, multicast: bool, found: bool) -> None:  # noqa: ARG002
+        """Record the duration of browsing and count failures."""
+        with self._lock:
+            self._histogram(self._mdns_latency, ip).observe(duration)
+            if not found:
+                self._mdns_failures[ip] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Copy the current measurements.
+
+        :return: Measurements as nested dictionaries of builtin types keyed by IP address, endpoint and outcome
+        """
+        requests: dict[str, dict[str, dict[str, int]]] = {}
+        retries: dict[str, dict[str, int]] = {}
+        with self._lock:
+            for (ip, endpoint, outcome), count in self._requests.items():
+                requests.setdefault(ip, {}).setdefault(endpoint, {})[outcome] = count
+            for (ip, endpoint), count in self._retries.items():
+                retries.setdefault(ip, {})[endpoint] = count
+            return {
+                "endpoint_latency": {endpoint: h.as_dict() for endpoint, h in self._endpoint_latency.items()},
+                "device_latency": {ip: h.as_dict() for ip, h in self._device_latency.items()},
+                "requests": requests,
+                "bytes_sent": dict(self._sent),
+                "bytes_received": dict(self._received),
+                "retries": retries,
+                "password_hashed": dict(self._password_hashed),
+                "in_flight": {ip: count for ip, count in self._in_flight.items() if count},
+                "mdns_latency": {ip: h.as_dict() for ip, h in self._mdns_latency.items()},
+                "mdns_failures": dict(self._mdns_failures),
+            }
+
+    def export(self) -> str:
+        """
+        Serialize the current measurements.
+
+        :return: Snapshot as JSON
+        """
+        return json.dumps(self.snapshot())
+
+    def reset(self) -> None:
+        """Forget all measurements except requests in flight."""
+        with self._lock:
+            for metric in (self._endpoint_latency, self._device_latency, self._mdns_latency):
+                metric.clear()
+            for counter in (self._requests, self._sent, self._received, self._retries, self._password_hashed):
+                counter.clear()
+            self._mdns_failures.clear()
+
+    def _histogram(self, histograms: dict[str, Histogram], key: str) -> Histogram:
+        """Get a histogram, adding it if it is new."""
+        if (histogram := histograms.get(key)) is None:
+            histogram = histograms[key] = Histogram(self._buckets)
+        return histogram
@@ -0,0 +1,258 @@
+"""Sample CPU and memory profiles of library operations."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import cProfile
+    import pstats
+    import tracemalloc
+    from contextlib import AbstractContextManager
+    from types import TracebackType
+
+ENV_DIRECTORY = "DEVOLO_PLC_API_PROFILE"
+"""Environment variable naming the report directory. Setting it enables profiling on import."""
+
+ENV_SAMPLE_RATE = "DEVOLO_PLC_API_PROFILE_RATE"
+"""Environment variable with the share of operations to profile."""
+
+SAMPLE_RATE = 0.01
+"""Default share of operations to profile."""
+
+_NOT_SAMPLED = nullcontext()
+
+
+class _Operation:
+    """Aggregated samples of an operation type."""
+
+    __slots__ = ("memory", "peak", "samples", "stats")
+
+    def __init__(self) -> None:
+        """Initialize without samples."""
+        self.memory: Counter[str] = Counter()
+        self.peak = 0
+        self.samples = 0
+        self.stats: pstats.Stats | None = None
+
+
+class Profiler:
+    """
+    Profile a random share of library operations like connecting, discovering and API calls with cProfile and
+    tracemalloc. Only one operation is profiled at a time, so overhead is bounded by the sample rate even with many
+    devices. Profiles of an asynchronous operation also contain other tasks, that ran on the event loop in the meantime.
+    Results are aggregated per operation type and written to a text report in the directory periodically. Inside an event
+    loop, reports are written in a worker thread.
+
+    :param directory: Directory to write reports to
+    :param sample_rate: Share of operations to profile between 0 and 1
+    :param interval: Minimum seconds between two reports
+    :param memory: Trace memory allocations of sampled operations
+    :param top: Number of functions and source lines to list per operation type
+    """
+
+    def __init__(
+        self,
+        directory: Path | str,
+        sample_rate: float = SAMPLE_RATE,
+        interval: float = 300.0,
+        *,
+        memory: bool = True,
+        top: int = 20,
+    ) -> None:
+        """Initialize the profiler."""
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self._interval = interval
+        self._memory = memory
+        self._top = top
+        self._busy = threading.Lock()
+        self._lock = threading.Lock()
+        self._operations: dict[str, _Operation] = {}
+        self._last_report = time.monotonic()
+        self._reports: set[asyncio.Future[Path | None]] = set()
+        self._logger = logging.getLogger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+
+    def profile(self, operation: str) -> AbstractContextManager[object]:
+        """
+        Profile an operation, if it is sampled and no other operation is being profiled.
+
+        :param operation: Type of the operation, e.g. connect or the name of an endpoint
+        :return: Context manager to wrap the operation in
+        """
+        if random.random() >= self.sample_rate or not self._busy.acquire(blocking=False):  # noqa: S311
+            return _NOT_SAMPLED
+        return _Sample(self, operation)
+
+    def report(self) -> Path | None:
+        """
+        Write the aggregated results to a new report file and start aggregating from scratch.
+
+        :return: Path of the report or None, if there was nothing to report
+        """
+        from datetime import datetime, timezone  # noqa: PLC0415
+        from io import StringIO  # noqa: PLC0415
+        from pstats import SortKey  # noqa: PLC0415
+
+        with self._lock:
+            operations, self._operations = self._operations, {}
+            self._last_report = time.monotonic()
+        if not operations:
+            return None
+        stream = StringIO()
+        for name, operation in sorted(operations.items()):
+            stream.write(f"=== {name}: {operation.samples} samples, peak memory {operation.peak} bytes ===\n")
+            if operation.stats:
+                operation.stats.stream = stream  # type: ignore[attr-defined]
+                operation.stats.sort_stats(SortKey.CUMULATIVE).print_stats(self._top)
+            for line, size in operation.memory.most_common(self._top):
+                stream.write(f"{size:>12} B  {line}\n")
+            stream.write("\n")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"profile-{datetime.now(tz=timezone.utc):%Y%m%dT%H%M%S%f}.txt"
+        path.write_text(stream.getvalue(), encoding="utf-8")
+        self._logger.debug("Wrote profile report %s", path)
+        return path
+
+    def _add(self, operation: str, profile: cProfile.Profile | None, snapshot: tracemalloc.Snapshot | None, peak: int) -> None:
+        """Aggregate a sample and write a report, if the interval passed."""
+        with self._lock:
+            aggregate = self._operations.setdefault(operation, _Operation())
+            aggregate.samples += 1
+            aggregate.peak = max(aggregate.peak, peak)
+            if profile is not None:
+                if aggregate.stats is None:
+                    from pstats import Stats  # noqa: PLC0415
+
+                    aggregate.stats = Stats(profile)
+                else:
+                    aggregate.stats.add(profile)
+            if snapshot is not None:
+                for statistic in snapshot.statistics("lineno")[: self._top]:
+                    aggregate.memory[str(statistic.traceback[0])] += statistic.size
+            due = time.monotonic() - self._last_report >= self._interval
+            if due:
+                self._last_report = time.monotonic()
+        if not due:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.report()  # Not running in an event loop, so writing cannot block one
+            return
+        report = loop.run_in_executor(None, self.report)
+        self._reports.add(report)
+        report.add_done_callback(self._reported)
+
+    def _reported(self, report: asyncio.Future[Path | None]) -> None:
+        """Forget a report written in the background and log, if it failed."""
+        self._reports.discard(report)
+        if not report.cancelled() and (exception := report.exception()) is not None:
+            self._logger.warning("Writing profile report failed: %r", exception)
+
+
+class _Sample:
+    """Profile of a single operation."""
+
+    __slots__ = ("_memory", "_operation", "_profile", "_profiler")
+
+    def __init__(self, profiler: Profiler, operation: str) -> None:
+        """Initialize the sample."""
+        self._profiler = profiler
+        self._operation = operation
+        self._profile: cProfile.Profile | None = None
+        self._memory = False
+
+    def __enter__(self) -> None:
+        """Start profiling."""
+        # Profiling modules are imported not before the first sample to keep importing the library fast
+        import cProfile  # noqa: PLC0415
+        import tracemalloc  # noqa: PLC0415
+
+        if self._profiler._memory and not tracemalloc.is_tracing():  # noqa: SLF001
+            tracemalloc.start()
+            self._memory = True
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return  # Another profiler is active
+        self._profile = profile
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None
+    ) -> None:
+        """Stop profiling and hand over the results."""
+        import tracemalloc  # noqa: PLC0415
+
+        if self._profile is not None:
+            self._profile.disable()
+        snapshot, peak = None, 0
+        if self._memory:
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                (tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),)
+            )
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        try:
+            self._profiler._add(self._operation, self._profile, snapshot, peak)  # noqa: SLF001
+        finally:
+            self._profiler._busy.release()  # noqa: SLF001
+
+
+_profiler: Profiler | None = None
+
+
+def get_profiler() -> Profiler | None:
+    """
+    Get the profiler sampling operations.
+
+    :return: Profiler or None, if profiling is disabled
+    """
+    return _profiler
+
+
+def set_profiler(profiler: Profiler | None) -> None:
+    """
+    Set the profiler sampling operations of all devices. Profiling is disabled by default, unless the environment
+    variable DEVOLO_PLC_API_PROFILE names a report directory.
+
+    :param profiler: Profiler to use, None disables profiling
+    """
+    global _profiler  # noqa: PLW0603
+    _profiler = profiler
+
+
+def profile(operation: str) -> AbstractContextManager[object]:
+    """
+    Profile an operation with the current profiler. While profiling is disabled, a shared context manager is returned,
+    that does nothing.
+
+    :param operation: Type of the operation, e.g. connect or the name of an endpoint
+    :return: Context manager to wrap the operation in
+    """
+    if _profiler is None:
+        return _NOT_SAMPLED
+    return _profiler.profile(operation)
+
+
+def _env_sample_rate() -> float:
+    """Read the sample rate from the environment and fall back to the default, if it is invalid."""
+    try:
+        return float(os.environ.get(ENV_SAMPLE_RATE, SAMPLE_RATE))
+    except ValueError:
+        logging.getLogger(__name__).warning("Invalid %s, profiling %s of operations", ENV_SAMPLE_RATE, SAMPLE_RATE)
+        return SAMPLE_RATE
+
+
+if directory := os.environ.get(ENV_DIRECTORY):
+    set_profiler(Profiler(directory, _env_sample_rate()))
@@ -0,0 +1,215 @@
+"""Expose fleet metrics in the Prometheus text format."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import Counter
+from typing import TYPE_CHECKING
+
+from .instrumentation import Instrumentation
+
+if TYPE_CHECKING:
+    from devolo_plc_api.device import BatchResult
+    from devolo_plc_api.plcnet_api.getnetworkoverview_pb2 import GetNetworkOverview
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_METRICS = {
+    "up": ("gauge", "1, if the latest poll of the device returned any value, otherwise 0."),
+    "uptime": ("gauge", "Uptime counter of the device. It has no unit and only increases until the next reboot."),
+    "led_enabled": ("gauge", "1, if the LEDs of the device are enabled, otherwise 0."),
+    "guest_wifi_enabled": ("gauge", "1, if the wifi guest access of the device is enabled, otherwise 0."),
+    "wifi_connected_stations": ("gauge", "Number of wifi stations connected to the device."),
+    "plc_tx_rate_mbps": ("gauge", "PLC transmit data rate of a link in Mbps."),
+    "plc_rx_rate_mbps": ("gauge", "PLC receive data rate of a link in Mbps."),
+    "requests_total": ("counter", "Request attempts per outcome."),
+    "request_seconds_total": ("counter", "Seconds spent on request attempts."),
+    "request_retries_total": ("counter", "Retries of failed requests."),
+}
+
+
+def _escape(text: str) -> str:
+    """Escape a label value."""
+    return text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class PrometheusExporter(Instrumentation):
+    """
+    Serve metrics of many devices in the Prometheus text format. Values are fed from polling results and the lines of a
+    device are rendered, when its values change. Scrapes only join already rendered text and never cause requests to
+    devices. Set the exporter as instrumentation to also expose the request health per IP address.
+
+    :param namespace: Prefix of all metric names
+    """
+
+    ENDPOINTS = ("get_network_overview", "get_wifi_connected_station", "get_wifi_guest_access", "get_led_setting", "uptime")
+    """Endpoints to poll with Device.async_batch to feed update."""
+
+    def __init__(self, namespace: str = "devolo") -> None:
+        """Initialize an exporter without values."""
+        self._namespace = namespace
+        self._lock = threading.Lock()
+        self._samples: dict[str, dict[str, str]] = {metric: {} for metric in _METRICS}
+        self._families: dict[str, str] = {}
+        self._body: bytes | None = None
+        self._requests: dict[str, Counter[str]] = {}
+        self._request_seconds: dict[str, float] = {}
+        self._retries: Counter[str] = Counter()
+
+    def update(self, serial_number: str, result: BatchResult) -> None:
+        """
+        Take the values of a poll. Endpoints missing in the result keep their previous value.
+
+        :param serial_number: Serial number of the polled device
+        :param result: Result of Device.async_batch with ENDPOINTS
+        """
+        self.set_value("up", serial_number, int(bool(result.values)))
+        if "get_network_overview" in result:
+            self.set_data_rates(serial_number, result["get_network_overview"])
+        if "get_wifi_connected_station" in result:
+            self.set_value("wifi_connected_stations", serial_number, len(result["get_wifi_connected_station"]))
+        if "get_wifi_guest_access" in result:
+            self.set_value("guest_wifi_enabled", serial_number, int(result["get_wifi_guest_access"].enabled))
+        if "get_led_setting" in result:
+            self.set_value("led_enabled", serial_number, int(result["get_led_setting"]))
+        if "uptime" in result:
+            self.set_value("uptime", serial_number, result["uptime"])
+
+    def set_value(self, metric: str, serial_number: str, value: float) -> None:
+        """
+        Set a metric of a device.
+
+        :param metric: Name of the metric without namespace, e.g. uptime
+        :param serial_number: Serial number of the device
+        :param value: New value
+        """
+        self._set(metric, serial_number, self._line(metric, {"serial_number": serial_number}, value))
+
+    def set_data_rates(self, serial_number: str, network: GetNetworkOverview.LogicalNetwork) -> None:
+        """
+        Set the PLC data rates of all links a device reported.
+
+        :param serial_number: Serial number of the device
+        :param network: Network overview of the device
+        """
+        for metric, attribute in (("plc_tx_rate_mbps", "tx_rate"), ("plc_rx_rate_mbps", "rx_rate")):
+            lines = "".join(
+                self._line(
+                    metric,
+                    {
+                        "serial_number": serial_number,
+                        "mac_address_from": data_rate.mac_address_from,
+                        "mac_address_to": data_rate.mac_address_to,
+                    },
+                    getattr(data_rate, attribute),
+                )
+                for data_rate in network.data_rates
+            )
+            self._set(metric, serial_number, lines)
+
+    def remove(self, serial_number: str) -> None:
+        """
+        Drop all metrics of a device, e.g. after it left the fleet.
+
+        :param serial_number: Serial number of the device
+        """
+        for metric in _METRICS:
+            self._set(metric, serial_number, "")
+
+    def render(self) -> bytes:
+        """
+        Get the metrics in the Prometheus text format. Only metric families, that changed since the last call, are joined
+        again.
+
+        :return: Exposition as UTF-8
+        """
+        with self._lock:
+            if self._body is None:
+                for metric, (kind, description) in _METRICS.items():
+                    if metric not in self._families:
+                        name = f"{self._namespace}_{metric}"
+                        self._families[metric] = (
+                            f"# HELP {name} {description}\n# TYPE {name} {kind}\n{''.join(self._samples[metric].values())}"
+                        )
+                self._body = "".join(self._families[metric] for metric in _METRICS).encode("utf-8")
+            return self._body
+
+    async def async_serve(self, host: str = "127.0.0.1", port: int = 9100) -> asyncio.AbstractServer:
+        """
+        Serve the metrics via HTTP on /metrics. The server runs until it is closed.
+
+        :param host: Address to listen on
+        :param port: Port to listen on
+        :return: Running server
+        """
+        return await asyncio.start_server(self._async_handle, host, port)
+
+    def request_finished(  # noqa: PLR0913, PLR0917
+        self,
+        ip: str,
+        endpoint: str,  # noqa: ARG002
+        duration: float,
+        sent: int,  # noqa: ARG002
+        received: int,  # noqa: ARG002
+        outcome: str,
+    ) -> None:
+        """Count the request attempt of a device."""
+        with self._lock:
+            requests = self._requests.setdefault(ip, Counter())
+            requests[outcome] += 1
+            self._request_seconds[ip] = self._request_seconds.get(ip, 0.0) + duration
+            lines = "".join(self._line("requests_total", {"ip": ip, "outcome": o}, c) for o, c in requests.items())
+            seconds = self._line("request_seconds_total", {"ip": ip}, self._request_seconds[ip])
+        self._set("requests_total", ip, lines)
+        self._set("request_seconds_total", ip, seconds)
+
+    def request_retried(self, ip: str, endpoint: str) -> None:  # noqa: ARG002
+        """Count the retry of a device."""
+        with self._lock:
+            self._retries[ip] += 1
+            line = self._line("request_retries_total", {"ip": ip}, self._retries[ip])
+        self._set("request_retries_total", ip, line)
+
+    async def _async_handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer a single HTTP request."""
+        try:
+            request = (await reader.readline()).split()
+            while (await reader.readline()).strip():
+                pass
+            if len(request) < 2:  # noqa: PLR2004
+                status, body = "400 Bad Request", b""
+            elif request[0] != b"GET":
+                status, body = "405 Method Not Allowed", b""
+            elif request[1].partition(b"?")[0] != b"/metrics":
+                status, body = "404 Not Found", b""
+            else:
+                status, body = "200 OK", self.render()
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {CONTENT_TYPE}\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _line(self, metric: str, labels: dict[str, str], value: float) -> str:
+        """Render a sample."""
+        rendered = ",".join(f'{label}="{_escape(text)}"' for label, text in labels.items())
+        return f"{self._namespace}_{metric}{{{rendered}}} {value}\n"
+
+    def _set(self, metric: str, key: str, lines: str) -> None:
+        """Replace the samples of a device and invalidate the rendered text, if they changed."""
+        with self._lock:
+            samples = self._samples[metric]
+            if samples.get(key, "") == lines:
+                return
+            if lines:
+                samples[key] = lines
+            else:
+                del samples[key]
+            self._families.pop(metric, None)
+            self._body = None
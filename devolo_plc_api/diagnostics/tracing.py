@@ -0,0 +1,228 @@
+"""Trace the phases of connecting to devices and requesting data."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from contextvars import Token
+    from pathlib import Path
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+_logger = logging.getLogger(__name__)
+
+_exporter: SpanExporter | None = None
+_current: ContextVar[Span | None] = ContextVar("devolo_plc_api_span", default=None)
+
+
+class Span:
+    """
+    Timed phase of an operation. Spans started while another span is active in the same task become its children.
+
+    :param name: Name of the phase, e.g. connect
+    :param attributes: Details of the phase, e.g. the IP address
+    """
+
+    __slots__ = (
+        "_start",
+        "_token",
+        "attributes",
+        "children",
+        "duration",
+        "name",
+        "parent_id",
+        "span_id",
+        "start",
+        "status",
+        "trace_id",
+    )
+
+    def __init__(self, name: str, attributes: dict[str, Any]) -> None:
+        """Initialize the span."""
+        self.name = name
+        self.attributes = attributes
+        self.children = 0
+        self.span_id = os.urandom(8).hex()
+        self.trace_id = ""
+        self.parent_id: str | None = None
+        self.start = 0.0
+        self.duration = 0.0
+        self.status = "ok"
+        self._start = 0.0
+        self._token: Token[Span | None] | None = None
+
+    def __enter__(self) -> Self:
+        """Start the span."""
+        if (parent := _current.get()) is None:
+            self.trace_id = os.urandom(16).hex()
+        else:
+            self.trace_id, self.parent_id = parent.trace_id, parent.span_id
+            parent.children += 1
+        self._token = _current.set(self)
+        self.start = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None
+    ) -> None:
+        """End the span and export it."""
+        self.duration = time.perf_counter() - self._start
+        if exc_type is not None:
+            self.status = exc_type.__name__
+        if self._token is not None:
+            _current.reset(self._token)
+        if _exporter is not None:
+            try:
+                _exporter.export(self)
+            except Exception:
+                _logger.exception("Exporting span %s failed", self.name)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """
+        Add or replace a detail of the phase.
+
+        :param key: Name of the detail
+        :param value: Value of the detail, preferably a builtin type
+        """
+        self.attributes[key] = value
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Describe the span with builtin types.
+
+        :return: Names, IDs, timing in seconds, status and attributes
+        """
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration": self.duration,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoSpan(Span):
+    """Stand-in for spans, while tracing is disabled."""
+
+    __slots__ = ()
+
+    children = 0  # type: ignore[misc]
+
+    def __init__(self) -> None:
+        """Initialize nothing."""
+
+    def __enter__(self) -> Self:
+        """Do nothing."""
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None
+    ) -> None:
+        """Do nothing."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Do nothing."""
+
+
+_NO_SPAN = _NoSpan()
+
+
+class SpanExporter:
+    """
+    Receiver of finished spans. Spans are exported from the event loop, so exporting must not block for long. Errors
+    while exporting are logged and do not affect the traced operation.
+    """
+
+    def export(self, span: Span) -> None:
+        """
+        Take a finished span.
+
+        :param span: Finished span
+        """
+
+    def close(self) -> None:
+        """Release resources of the exporter."""
+
+
+class JsonLinesExporter(SpanExporter):
+    """
+    Append finished spans to a file, one JSON object per line. Spans are buffered and written to disk, when the buffer is
+    full, on flush and on close.
+
+    :param path: File to append to
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        """Open the file."""
+        self._file = open(path, "a", encoding="utf-8")  # noqa: PTH123, SIM115
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        """Write a span as JSON line."""
+        line = json.dumps(span.as_dict(), default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def flush(self) -> None:
+        """Write buffered spans to disk."""
+        with self._lock:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Write buffered spans to disk and close the file."""
+        with self._lock:
+            self._file.close()
+
+
+def trace(name: str, /, **attributes: Any) -> Span:
+    """
+    Create a span to be used as context manager. While tracing is disabled, a shared stand-in is returned, that does
+    nothing.
+
+    :param name: Name of the phase, e.g. connect
+    :param attributes: Details of the phase, e.g. the IP address
+    :return: Span
+    """
+    if _exporter is None:
+        return _NO_SPAN
+    return Span(name, attributes)
+
+
+def current_span() -> Span | None:
+    """
+    Get the active span of the current task.
+
+    :return: Innermost active span or None, if no span is active
+    """
+    return _current.get()
+
+
+def get_span_exporter() -> SpanExporter | None:
+    """
+    Get the exporter receiving finished spans.
+
+    :return: Exporter or None, if tracing is disabled
+    """
+    return _exporter
+
+
+def set_span_exporter(exporter: SpanExporter | None) -> None:
+    """
+    Set the exporter receiving finished spans of all devices. Tracing is disabled by default.
+
+    :param exporter: Exporter to use, None disables tracing
+    """
+    global _exporter  # noqa: PLW0603
+    _exporter = exporter
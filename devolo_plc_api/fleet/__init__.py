@@ -0,0 +1,44 @@
+"""Operate on many devolo devices at once."""
+
+from .archive import SupportArchive
+from .environment import WifiEnvironment
+from .firmware import FirmwareCache
+from .liveness import LivenessEvent, LivenessMonitor
+from .locator import Adapter, ClientLocation, MacLocator
+from .reconcile import DesiredState, Reconciler, ReconcileReport
+from .registry import DeviceRegistry
+from .roaming import (
+    RoamingEvent,
+    RoamingTracker,
+    Session,
+    StationConnected,
+    StationDisconnected,
+    StationRoamed,
+)
+from .rollout import FirmwareRollout, RolloutEntry
+from .scans import NeighborScan, ScanScheduler
+
+__all__ = [
+    "Adapter",
+    "ClientLocation",
+    "DesiredState",
+    "DeviceRegistry",
+    "FirmwareCache",
+    "FirmwareRollout",
+    "LivenessEvent",
+    "LivenessMonitor",
+    "MacLocator",
+    "NeighborScan",
+    "ReconcileReport",
+    "Reconciler",
+    "RoamingEvent",
+    "RoamingTracker",
+    "RolloutEntry",
+    "ScanScheduler",
+    "Session",
+    "StationConnected",
+    "StationDisconnected",
+    "StationRoamed",
+    "SupportArchive",
+    "WifiEnvironment",
+]
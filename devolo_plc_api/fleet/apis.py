@@ -0,0 +1,36 @@
+"""Access the APIs of devices, that are expected to be connected."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from devolo_plc_api.exceptions import DeviceUnavailable
+
+if TYPE_CHECKING:
+    from devolo_plc_api.device import Device
+    from devolo_plc_api.device_api import DeviceApi
+    from devolo_plc_api.plcnet_api import PlcNetApi
+
+
+def get_device_api(device: Device) -> DeviceApi:
+    """
+    Get the device API of a device. A device without it, e.g. because it was disconnected meanwhile, is unavailable.
+
+    :param device: Connected device
+    :return: Device API of the device
+    """
+    if device.device is None:
+        raise DeviceUnavailable
+    return device.device
+
+
+def get_plcnet_api(device: Device) -> PlcNetApi:
+    """
+    Get the PLC network API of a device. A device without it, e.g. because it was disconnected meanwhile, is unavailable.
+
+    :param device: Connected device
+    :return: PLC network API of the device
+    """
+    if device.plcnet is None:
+        raise DeviceUnavailable
+    return device.plcnet
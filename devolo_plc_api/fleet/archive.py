@@ -0,0 +1,180 @@
+"""Archive support info dumps of many devices."""
+
+from __future__ import annotations
+
+import asyncio
+import bz2
+import gzip
+import hashlib
+import json
+import logging
+import lzma
+import threading
+import zlib
+from datetime import date, datetime, timezone
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Callable
+
+from httpx import HTTPStatusError
+
+from devolo_plc_api.device_api import SupportInfoFile
+from devolo_plc_api.exceptions import DevicePasswordProtected, DeviceUnavailable, FeatureNotSupported
+
+from .apis import get_device_api
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from os import PathLike
+
+    from devolo_plc_api.device import Device
+    from devolo_plc_api.device_api import SupportInfoItem
+
+CODECS: dict[str, tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "bz2": (bz2.compress, bz2.decompress),
+    "gzip": (gzip.compress, gzip.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+    "zlib": (zlib.compress, zlib.decompress),
+}
+INDEX_FILE = "index.jsonl"
+OBJECTS_DIRECTORY = "objects"
+
+
+class SupportArchive:
+    """
+    Content-addressed archive of support info dumps. Dumps are split into their items and every distinct content is
+    stored only once, compressed and named by its SHA-256 digest. An append-only index maps device, date and label to
+    the digests and is kept in memory for lookups.
+
+    :param path: Directory of the archive, created if missing
+    :param codec: Compression used for new contents, one of bz2, gzip, lzma and zlib
+    """
+
+    def __init__(self, path: str | PathLike[str], codec: str = "lzma") -> None:
+        """Open the archive."""
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec {codec}")  # noqa: EM102, TRY003
+        self.codec = codec
+        self._path = Path(path)
+        self._path.joinpath(OBJECTS_DIRECTORY).mkdir(parents=True, exist_ok=True)
+        self._index: dict[str, dict[date, dict[str, str]]] = {}
+        self._objects = {
+            file.stem: file
+            for file in self._path.joinpath(OBJECTS_DIRECTORY).glob("*/*.*")
+            if file.suffix[1:] in CODECS  # Leftovers of interrupted writes are ignored
+        }
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        if (index := self._path / INDEX_FILE).exists():
+            with index.open(encoding="utf-8") as file:
+                for line in file:
+                    entry = json.loads(line)
+                    self._remember(entry["device"], date.fromisoformat(entry["date"]), entry["label"], entry["digest"])
+
+    @property
+    def devices(self) -> list[str]:
+        """Serial numbers of all archived devices."""
+        return sorted(self._index)
+
+    def add(self, serial_number: str, items: Iterable[SupportInfoItem], day: date | None = None) -> int:
+        """
+        Add support info items of a device. Items with a content that is already archived only cost an index entry.
+
+        :param serial_number: Serial number of the device
+        :param items: Support info items, e.g. SupportInfoDump.items or SupportInfoFile.items()
+        :param day: Day the dump was taken, defaults to today
+        :return: Number of compressed bytes written
+        """
+        day = day or datetime.now(tz=timezone.utc).date()
+        compress = CODECS[self.codec][0]
+        written = 0
+        for item in items:
+            digest = hashlib.sha256(item.content).hexdigest()
+            if digest not in self._objects:
+                written += self._store(digest, compress(item.content))
+            with self._lock, self._path.joinpath(INDEX_FILE).open("a", encoding="utf-8") as file:
+                entry = {"device": serial_number, "date": day.isoformat(), "label": item.label, "digest": digest}
+                file.write(json.dumps(entry) + "\n")
+                self._remember(serial_number, day, item.label, digest)
+        return written
+
+    async def async_collect(self, devices: Iterable[Device], day: date | None = None, limit: int = 4) -> dict[str, int]:
+        """
+        Download and archive the support info of many devices concurrently. Dumps are streamed through temporary files,
+        so they are never held in memory completely. Devices, that cannot deliver a dump, are skipped.
+
+        :param devices: Connected devices
+        :param day: Day the dumps are taken, defaults to today
+        :param limit: Maximum number of devices to download from at the same time
+        :return: Number of compressed bytes written per serial number
+        """
+        semaphore = asyncio.Semaphore(limit)
+        devices = [device for device in devices if device.device]
+        written = await asyncio.gather(*(self._async_collect(device, day, semaphore) for device in devices))
+        return {device.serial_number: size for device, size in zip(devices, written) if size is not None}
+
+    def days(self, serial_number: str) -> list[date]:
+        """
+        Get the days a device's support info was archived on.
+
+        :param serial_number: Serial number of the device
+        :return: Days in chronological order
+        """
+        return sorted(self._index.get(serial_number, {}))
+
+    def get(self, serial_number: str, label: str, day: date) -> bytes:
+        """
+        Get the content of a support info item.
+
+        :param serial_number: Serial number of the device
+        :param label: Label of the item
+        :param day: Day the dump was taken
+        :return: Uncompressed content
+        """
+        path = self._objects[self._index[serial_number][day][label]]
+        return CODECS[path.suffix[1:]][1](path.read_bytes())
+
+    def labels(self, serial_number: str, day: date) -> list[str]:
+        """
+        Get the labels of a device's support info items.
+
+        :param serial_number: Serial number of the device
+        :param day: Day the dump was taken
+        :return: Labels in the order of appearance
+        """
+        return list(self._index.get(serial_number, {}).get(day, {}))
+
+    async def _async_collect(self, device: Device, day: date | None, semaphore: asyncio.Semaphore) -> int | None:
+        """Download and archive the support info of a single device."""
+        device_api = get_device_api(device)
+        with NamedTemporaryFile(dir=self._path, suffix=".dump", delete=False) as file:
+            temporary = Path(file.name)
+            try:
+                async with semaphore:
+                    await device_api.async_download_support_info(file)
+                file.close()
+                with SupportInfoFile(temporary) as dump:
+                    return await asyncio.to_thread(self.add, device.serial_number, dump.items(), day)
+            except (DevicePasswordProtected, DeviceUnavailable, FeatureNotSupported, HTTPStatusError, ValueError) as e:
+                self._logger.warning("Cannot collect support info of %s: %r", device.serial_number, e)
+                return None
+            finally:
+                file.close()
+                temporary.unlink()  # noqa: ASYNC240
+
+    def _remember(self, serial_number: str, day: date, label: str, digest: str) -> None:
+        """Add an entry to the in-memory index."""
+        self._index.setdefault(serial_number, {}).setdefault(day, {})[label] = digest
+
+    def _store(self, digest: str, content: bytes) -> int:
+        """Write compressed content atomically, unless another thread was faster."""
+        path = self._path / OBJECTS_DIRECTORY / digest[:2] / f"{digest}.{self.codec}"
+        with self._lock:
+            if digest in self._objects:
+                return 0
+            path.parent.mkdir(exist_ok=True)
+            temporary = path.with_suffix(".tmp")
+            temporary.write_bytes(content)
+            temporary.replace(path)
+            self._objects[digest] = path
+        return len(content)
@@ -0,0 +1,173 @@
+"""Index the wifi environment seen by many devices."""
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+from .locator import normalize_mac
+
+if TYPE_CHECKING:
+    from .scans import NeighborScan
+
+
+class WifiEnvironment:
+    """
+    Index of wifi access points heard by many devices. Only the latest observation of an access point by a device is
+    kept, one row in compact column arrays each. Lookups by access point, by observing device and by channel are
+    maintained incrementally on every scan, so queries do not need to walk all observations.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._observers: list[str] = []
+        self._observer_ids: dict[str, int] = {}
+        self._sites: list[str] = []
+        self._bssids: list[str] = []
+        self._bssid_ids: dict[str, int] = {}
+        self._ssids: list[str] = []
+
+        self._observer = array("I")
+        self._bssid = array("I")
+        self._band = array("B")
+        self._channel = array("H")
+        self._signal = array("h")
+        self._timestamp = array("d")
+        self._columns: tuple[array[Any], ...] = (
+            self._observer,
+            self._bssid,
+            self._band,
+            self._channel,
+            self._signal,
+            self._timestamp,
+        )
+
+        self._rows: dict[int, dict[int, int]] = {}
+        self._heard_by: dict[int, set[int]] = {}
+        self._channels: dict[tuple[str, int, int], Counter[int]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of observations."""
+        return len(self._timestamp)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes occupied by the observations."""
+        return sum(len(column) * column.itemsize for column in self._columns)
+
+    def add(self, scan: NeighborScan, site: str = "") -> None:
+        """
+        Replace the observations of a device by a new scan.
+
+        :param scan: Neighbor scan of a device
+        :param site: Site the device belongs to, e.g. a building or floor
+        """
+        if (observer := self._observer_ids.get(scan.serial_number)) is None:
+            observer = self._observer_ids[scan.serial_number] = len(self._observers)
+            self._observers.append(scan.serial_number)
+            self._sites.append(site)
+            self._rows[observer] = {}
+        for bssid in list(self._rows[observer]):
+            self._remove(self._rows[observer][bssid])
+        self._sites[observer] = site
+        for access_point in scan.access_points:
+            bssid = self._bssid_id(access_point.mac_address)
+            self._ssids[bssid] = access_point.ssid
+            if bssid in self._rows[observer]:
+                self._remove(self._rows[observer][bssid])  # Reported twice by the same scan
+            self._rows[observer][bssid] = len(self._timestamp)
+            self._observer.append(observer)
+            self._bssid.append(bssid)
+            self._band.append(access_point.band)
+            self._channel.append(access_point.channel)
+            self._signal.append(access_point.signal)
+            self._timestamp.append(scan.timestamp)
+            self._heard_by.setdefault(bssid, set()).add(observer)
+            self._channels.setdefault((site, access_point.band, access_point.channel), Counter())[bssid] += 1
+
+    def busiest_channels(self, band: int, site: str | None = None) -> list[tuple[int, int]]:
+        """
+        Get the channels of a band with the most access points heard.
+
+        :param band: Wifi band, e.g. WIFI_BAND_2G
+        :param site: Site to look at. None looks at all sites.
+        :return: Channel and number of distinct access points, busiest first
+        """
+        access_points: dict[int, set[int]] = {}
+        for (channel_site, channel_band, channel), bssids in self._channels.items():
+            if channel_band == band and site in (None, channel_site):
+                access_points.setdefault(channel, set()).update(bssids)
+        return sorted(((channel, len(bssids)) for channel, bssids in access_points.items()), key=lambda c: (-c[1], c[0]))
+
+    def expire(self, before: float) -> int:
+        """
+        Forget observations, that are older than a point in time.
+
+        :param before: Point in time in seconds since the epoch
+        :return: Number of forgotten observations
+        """
+        stale = [row for row, timestamp in enumerate(self._timestamp) if timestamp < before]
+        for row in reversed(stale):
+            self._remove(row)
+        return len(stale)
+
+    def neighbors(self, serial_number: str) -> list[tuple[str, int]]:
+        """
+        Get the access points a device hears.
+
+        :param serial_number: Serial number of the device
+        :return: BSSID and signal strength, strongest first
+        """
+        rows = self._rows.get(self._observer_ids.get(serial_number, -1), {}).values()
+        return sorted(((self._bssids[self._bssid[row]], self._signal[row]) for row in rows), key=lambda n: -n[1])
+
+    def observers(self, bssid: str) -> list[tuple[str, int]]:
+        """
+        Get the devices, that hear an access point.
+
+        :param bssid: MAC address of the access point
+        :return: Serial number of the device and signal strength, strongest first
+        """
+        if (bssid_id := self._bssid_ids.get(normalize_mac(bssid))) is None:
+            return []
+        rows = (self._rows[observer][bssid_id] for observer in self._heard_by.get(bssid_id, ()))
+        return sorted(((self._observers[self._observer[row]], self._signal[row]) for row in rows), key=lambda o: -o[1])
+
+    def ssid(self, bssid: str) -> str:
+        """
+        Get the last SSID an access point was seen with.
+
+        :param bssid: MAC address of the access point
+        :return: SSID
+        """
+        return self._ssids[self._bssid_ids[normalize_mac(bssid)]]
+
+    def _bssid_id(self, mac_address: str) -> int:
+        """Get the index of a BSSID, adding it if it is new."""
+        bssid = normalize_mac(mac_address)
+        if (bssid_id := self._bssid_ids.get(bssid)) is None:
+            bssid_id = self._bssid_ids[bssid] = len(self._bssids)
+            self._bssids.append(bssid)
+            self._ssids.append("")
+        return bssid_id
+
+    def _remove(self, row: int) -> None:
+        """Remove an observation by moving the last one into its place."""
+        observer, bssid = self._observer[row], self._bssid[row]
+        del self._rows[observer][bssid]
+        self._heard_by[bssid].discard(observer)
+        key = (self._sites[observer], self._band[row], self._channel[row])
+        self._channels[key][bssid] -= 1
+        if not self._channels[key][bssid]:
+            del self._channels[key][bssid]
+            if not self._channels[key]:
+                del self._channels[key]
+
+        last = len(self._timestamp) - 1
+        if row != last:
+            for column in self._columns:
+                column[row] = column[last]
+            self._rows[self._observer[row]][self._bssid[row]] = row
+        for column in self._columns:
+            del column[last]
@@ -0,0 +1,89 @@
+"""Share firmware checks between devices of the same kind."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from typing import TYPE_CHECKING
+
+from devolo_plc_api.exceptions import DevicePasswordProtected, DeviceUnavailable
+
+from .apis import get_device_api
+
+if TYPE_CHECKING:
+    from devolo_plc_api.device import Device
+    from devolo_plc_api.device_api import UpdateFirmwareCheck
+
+
+class FirmwareCache:
+    """
+    Cache of firmware checks keyed by MT number and installed firmware version. Devices of the same model running the same
+    firmware get the same answer from the update server, so only one of them is asked per TTL, even if all of them check
+    at the same time. A share of the checks can still be sent to the device itself to notice staggered releases.
+
+    :param ttl: Seconds a result is shared
+    :param spot_check: Share of cached checks, that are asked the device anyway, between 0 and 1
+    """
+
+    def __init__(self, ttl: float = 3600.0, spot_check: float = 0.0) -> None:
+        """Initialize the cache."""
+        self._ttl = ttl
+        self._spot_check = spot_check
+        self._results: dict[tuple[str, str], tuple[float, UpdateFirmwareCheck]] = {}
+        self._pending: dict[tuple[str, str], asyncio.Future[UpdateFirmwareCheck]] = {}
+        self._logger = logging.getLogger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+
+    def __len__(self) -> int:
+        """Return the number of cached results."""
+        return len(self._results)
+
+    async def async_check_firmware_available(self, device: Device) -> UpdateFirmwareCheck:
+        """
+        Check, if a firmware update is available for a device, asking the device only, if no device of the same kind
+        was asked recently.
+
+        :param device: Connected device
+        :return: Result and new firmware version, if newer one is available
+        """
+        device_api = get_device_api(device)
+        key = (device.mt_number, device.firmware_version)
+        spot_check = random.random() < self._spot_check  # noqa: S311
+        if not spot_check:
+            if cached := self._cached(key):
+                return cached
+            # After a failed check, the first waiter to wake up becomes the new leader and the others wait for it
+            while (pending := self._pending.get(key)) and not pending.done():
+                try:
+                    return await asyncio.shield(pending)
+                except (DevicePasswordProtected, DeviceUnavailable):  # noqa: PERF203
+                    self._logger.debug("Device asked for %s failed.", key)
+            self._logger.debug("Asking %s for %s.", device.serial_number, key)
+
+        check = asyncio.ensure_future(device_api.async_check_firmware_available())
+        self._pending[key] = check
+        try:
+            result = await asyncio.shield(check)
+        finally:
+            if self._pending.get(key) is check:
+                del self._pending[key]
+        if spot_check and (cached := self._cached(key)) and cached != result:
+            self._logger.info("Spot check of %s differs from cached result for %s.", device.serial_number, key)
+        now = time.monotonic()
+        self._results = {key: value for key, value in self._results.items() if now - value[0] < self._ttl}
+        self._results[key] = (now, result)
+        return result
+
+    def clear(self) -> None:
+        """Forget all cached results."""
+        self._results.clear()
+
+    def _cached(self, key: tuple[str, str]) -> UpdateFirmwareCheck | None:
+        """Get a cached result, that did not expire yet, and drop it otherwise."""
+        if (cached := self._results.get(key)) is None:
+            return None
+        if time.monotonic() - cached[0] >= self._ttl:
+            del self._results[key]
+            return None
+        return cached[1]
@@ -0,0 +1,195 @@
+"""Detect reboots and standby of many devices."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from devolo_plc_api.exceptions import DevicePasswordProtected, DeviceUnavailable, FeatureNotSupported
+
+from .apis import get_device_api
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from devolo_plc_api.device import Device
+
+ONLINE = "online"
+REBOOTED = "rebooted"
+STANDBY = "standby"
+
+
+@dataclass(frozen=True)
+class LivenessEvent:
+    """Change of a device's liveness."""
+
+    serial_number: str
+    """Serial number of the device."""
+
+    state: str
+    """One of online, rebooted and standby."""
+
+    timestamp: float
+    """Time of the detection in seconds since the epoch."""
+
+
+@dataclass
+class _Liveness:
+    """Last known liveness of a device."""
+
+    state: str
+    since: float
+    probed: float
+    uptime: int | None = None
+    checked: float = 0.0
+    origin: tuple[float, int] | None = None
+    rate: float | None = None
+
+
+class LivenessMonitor:
+    """
+    Watch the uptime counter of many devices. A counter, that went backwards, means a reboot. As the unit of the counter
+    is not known, its rate is measured per device from the successful checks since the last reboot. Once known, a
+    counter, that advanced less than expected from the time passed since the last successful check, means a reboot, too.
+    This catches reboots, that happened long ago. A device, that does not answer, is considered to be in standby and is
+    probed less often with a single short request until it is back. Heavier polling should check is_available before
+    querying a device.
+
+    :param grace_period: Seconds a device is considered unavailable after a reboot, while its services are starting
+    :param standby_interval: Seconds between two checks of a device in standby
+    :param limit: Maximum number of devices to ask at the same time
+    :param slack: Seconds the counter may lag behind the time passed, e.g. due to clock deviations
+    :param probe_timeout: Seconds a device in standby may take to answer
+    """
+
+    def __init__(
+        self,
+        grace_period: float = 60.0,
+        standby_interval: float = 300.0,
+        limit: int = 16,
+        slack: float = 30.0,
+        probe_timeout: float = 2.0,
+    ) -> None:
+        """Initialize the monitor."""
+        self._grace_period = grace_period
+        self._standby_interval = standby_interval
+        self._limit = limit
+        self._slack = slack
+        self._probe_timeout = probe_timeout
+        self._liveness: dict[str, _Liveness] = {}
+
+    def __len__(self) -> int:
+        """Return the number of watched devices."""
+        return len(self._liveness)
+
+    def is_available(self, serial_number: str, now: float | None = None) -> bool:
+        """
+        Check, if a device is worth being queried.
+
+        :param serial_number: Serial number of the device
+        :param now: Point in time to check for, defaults to now
+        :return: False, if the device is in standby or just rebooted
+        """
+        if (liveness := self._liveness.get(serial_number)) is None:
+            return True
+        now = time.time() if now is None else now
+        if liveness.state == REBOOTED:
+            return now - liveness.since >= self._grace_period
+        return liveness.state == ONLINE
+
+    def state(self, serial_number: str) -> str | None:
+        """
+        Get the last known liveness of a device.
+
+        :param serial_number: Serial number of the device
+        :return: One of online, rebooted and standby or None, if the device was never checked
+        """
+        liveness = self._liveness.get(serial_number)
+        return liveness.state if liveness else None
+
+    async def async_check(self, devices: Iterable[Device], now: float | None = None) -> list[LivenessEvent]:
+        """
+        Ask all devices for their uptime once. Devices in standby are skipped until standby_interval passed. Devices,
+        that do not support the restart feature, are ignored.
+
+        :param devices: Connected devices
+        :param now: Point in time of the check, defaults to now
+        :return: Changes of liveness
+        """
+        now = time.time() if now is None else now
+        semaphore = asyncio.Semaphore(self._limit)
+
+        async def check(device: Device) -> LivenessEvent | None:
+            async with semaphore:
+                return await self._async_check(device, now)
+
+        events = await asyncio.gather(*(check(device) for device in devices if device.device and self._due(device, now)))
+        return [event for event in events if event]
+
+    async def async_run(
+        self, devices: Iterable[Device], callback: Callable[[LivenessEvent], None], interval: float = 30.0
+    ) -> None:
+        """
+        Check all devices periodically until cancelled.
+
+        :param devices: Connected devices
+        :param callback: Function to call on every change of liveness
+        :param interval: Seconds between two checks
+        """
+        devices = list(devices)
+        while True:
+            for event in await self.async_check(devices):
+                callback(event)
+            await asyncio.sleep(interval)
+
+    async def _async_check(self, device: Device, now: float) -> LivenessEvent | None:
+        """Ask a single device for its uptime and compare it to the last one."""
+        liveness = self._liveness.get(device.serial_number)
+        try:
+            device_api = get_device_api(device)
+            if liveness is not None and liveness.state == STANDBY:
+                # Bounding the call skips the retries of the request, so a device, that is still away, costs one attempt
+                uptime = await asyncio.wait_for(device_api.async_uptime(), self._probe_timeout)
+            else:
+                uptime = await device_api.async_uptime()
+        except FeatureNotSupported:
+            return None
+        except (DevicePasswordProtected, DeviceUnavailable, asyncio.TimeoutError):
+            if liveness is None:
+                liveness = self._liveness[device.serial_number] = _Liveness(ONLINE, now, now)
+            liveness.probed = now
+            if liveness.state == STANDBY:
+                return None
+            liveness.state, liveness.since = STANDBY, now
+            return LivenessEvent(device.serial_number, STANDBY, now)
+
+        if liveness is None:
+            self._liveness[device.serial_number] = _Liveness(ONLINE, now, now, uptime, now, (now, uptime))
+            return None
+        rebooted = self._rebooted(liveness, uptime, now)
+        if rebooted or liveness.origin is None:
+            liveness.origin = (now, uptime)
+        elif now > liveness.origin[0]:
+            liveness.rate = (uptime - liveness.origin[1]) / (now - liveness.origin[0])
+        liveness.uptime, liveness.checked, liveness.probed = uptime, now, now
+        if not rebooted and (
+            liveness.state == ONLINE or (liveness.state == REBOOTED and now - liveness.since < self._grace_period)
+        ):
+            return None
+        liveness.state, liveness.since = REBOOTED if rebooted else ONLINE, now
+        return LivenessEvent(device.serial_number, liveness.state, now)
+
+    def _due(self, device: Device, now: float) -> bool:
+        """Check, if a device shall be asked in this round."""
+        liveness = self._liveness.get(device.serial_number)
+        return liveness is None or liveness.state != STANDBY or now - liveness.probed >= self._standby_interval
+
+    def _rebooted(self, liveness: _Liveness, uptime: int, now: float) -> bool:
+        """Check, if the uptime counter of a device restarted since the last successful check."""
+        if liveness.uptime is None:
+            return False
+        if uptime < liveness.uptime:
+            return True
+        return liveness.rate is not None and uptime < liveness.uptime + liveness.rate * (now - liveness.checked - self._slack)
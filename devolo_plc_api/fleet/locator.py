@@ -0,0 +1,155 @@
+"""Locate client devices behind devolo adapters."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from devolo_plc_api.device import Device
+    from devolo_plc_api.device_api import ConnectedStationInfo
+    from devolo_plc_api.plcnet_api import LogicalNetwork
+
+
+@dataclass
+class Adapter:
+    """devolo adapter a client is connected to."""
+
+    serial_number: str = ""
+    """Serial number of the adapter, if already known."""
+
+    mac: str = ""
+    """PLC MAC address of the adapter, if it has one."""
+
+    ip: str = ""
+    """IP address of the adapter."""
+
+
+@dataclass(frozen=True)
+class ClientLocation:
+    """Location of a client device."""
+
+    adapter: Adapter
+    """Adapter the client is connected to."""
+
+    band: int | None
+    """Wifi band the client uses. None, if connected via LAN."""
+
+    vap_type: int | None
+    """Type of the virtual access point the client uses. None, if connected via LAN."""
+
+    last_seen: float
+    """Time the client was last seen in seconds since the epoch."""
+
+
+def normalize_mac(mac_address: str) -> str:
+    """
+    Bring MAC addresses to the format used in network overviews.
+
+    :param mac_address: MAC address in any common notation
+    :return: MAC address as upper case hex digits without separators
+    """
+    return mac_address.replace(":", "").replace("-", "").upper()
+
+
+class MacLocator:
+    """
+    Index from client MAC addresses to the adapters they are connected to. Adapters are shared between entries, so every
+    client costs a single dict entry holding a small tuple.
+
+    :param max_age: Seconds after which a client not seen anymore is evicted
+    """
+
+    def __init__(self, max_age: float = 3600.0) -> None:
+        """Initialize the index."""
+        self.max_age = max_age
+        self._adapters: dict[str, Adapter] = {}
+        self._clients: dict[str, tuple[Adapter, int | None, int | None, float]] = {}
+
+    def __contains__(self, mac_address: str) -> bool:
+        """Check, if a client is known."""
+        return self.locate(mac_address) is not None
+
+    def __len__(self) -> int:
+        """Return the number of known clients including not yet evicted stale ones."""
+        return len(self._clients)
+
+    def add_network(self, network: LogicalNetwork, timestamp: float | None = None) -> None:
+        """
+        Add clients bridged by the members of a PLC network.
+
+        :param network: Network overview
+        :param timestamp: Time of the poll in seconds since the epoch, defaults to now
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        for device in network.devices:
+            adapter = self._adapter(mac=device.mac_address, ip=device.ipv4_address)
+            for mac_address in device.bridged_devices:
+                self._add(normalize_mac(mac_address), (adapter, None, None, timestamp))
+
+    def add_stations(self, device: Device, stations: list[ConnectedStationInfo], timestamp: float | None = None) -> None:
+        """
+        Add wifi stations connected to a device.
+
+        :param device: Device the stations were polled from
+        :param stations: Result of async_get_wifi_connected_station
+        :param timestamp: Time of the poll in seconds since the epoch, defaults to now
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        adapter = self._adapter(serial_number=device.serial_number, mac=device.mac, ip=device.ip)
+        for station in stations:
+            self._add(normalize_mac(station.mac_address), (adapter, station.band, station.vap_type, timestamp))
+
+    def locate(self, mac_address: str, now: float | None = None) -> ClientLocation | None:
+        """
+        Find the adapter a client is connected to.
+
+        :param mac_address: MAC address of the client in any common notation
+        :param now: Reference time for the age check in seconds since the epoch, defaults to now
+        :return: Location of the client, None if unknown or stale
+        """
+        mac_address = normalize_mac(mac_address)
+        if (entry := self._clients.get(mac_address)) is None:
+            return None
+        if entry[3] < (time.time() if now is None else now) - self.max_age:
+            del self._clients[mac_address]
+            return None
+        return ClientLocation(*entry)
+
+    def evict(self, now: float | None = None) -> int:
+        """
+        Remove stale clients. As entries are kept in the order they were last seen, only stale entries are touched.
+
+        :param now: Reference time for the age check in seconds since the epoch, defaults to now
+        :return: Number of evicted clients
+        """
+        deadline = (time.time() if now is None else now) - self.max_age
+        evicted = 0
+        while self._clients:
+            mac_address = next(iter(self._clients))
+            if self._clients[mac_address][3] >= deadline:
+                break
+            del self._clients[mac_address]
+            evicted += 1
+        return evicted
+
+    def _add(self, mac_address: str, entry: tuple[Adapter, int | None, int | None, float]) -> None:
+        """Add or refresh a client keeping the entries ordered by time."""
+        self._clients.pop(mac_address, None)
+        self._clients[mac_address] = entry
+
+    def _adapter(self, serial_number: str = "", mac: str = "", ip: str = "") -> Adapter:
+        """
+        Get the shared adapter record and merge newly learned details. Adapters are identified by PLC MAC address, by serial
+        number, if they have no PLC, or by IP address, if the serial number is not known either.
+        """
+        known_serial_number = serial_number if serial_number != "0" else ""
+        key = mac or known_serial_number or ip
+        if (adapter := self._adapters.get(key)) is None:
+            adapter = self._adapters[key] = Adapter()
+        if known_serial_number:
+            adapter.serial_number = known_serial_number
+        adapter.mac = mac or adapter.mac
+        adapter.ip = ip or adapter.ip
+        return adapter
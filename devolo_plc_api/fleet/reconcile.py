@@ -0,0 +1,191 @@
+"""Bring the configuration of many devices to a desired state."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field, fields, replace
+from typing import TYPE_CHECKING, Any
+
+from httpx import HTTPStatusError
+
+from devolo_plc_api.exceptions import DevicePasswordProtected, DeviceUnavailable, FeatureNotSupported
+
+from .apis import get_device_api, get_plcnet_api
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable, Mapping
+
+    from devolo_plc_api.device import Device
+
+
+@dataclass(frozen=True)
+class DesiredState:
+    """Configuration a device shall have. Settings left at None are not touched."""
+
+    led: bool | None = None
+    """LEDs enabled."""
+
+    guest_wifi: bool | None = None
+    """Wifi guest access enabled."""
+
+    guest_wifi_duration: int | None = None
+    """Minutes the wifi guest access is enabled for, when it needs to be enabled. 0 or None is infinite."""
+
+    device_name: str | None = None
+    """User defined device name."""
+
+    def merge(self, other: DesiredState) -> DesiredState:
+        """
+        Combine two desired states, e.g. of a group and of a device.
+
+        :param other: State, whose settings take precedence, if they are not None
+        :return: Combined state
+        """
+        return replace(self, **{f.name: getattr(other, f.name) for f in fields(other) if getattr(other, f.name) is not None})
+
+
+@dataclass
+class ReconcileReport:
+    """Outcome of reconciling a device."""
+
+    serial_number: str
+    """Serial number of the device."""
+
+    changed: dict[str, Any] = field(default_factory=dict)
+    """Settings, that were written, with their new value."""
+
+    unchanged: list[str] = field(default_factory=list)
+    """Settings, that already had the desired value."""
+
+    failed: dict[str, str] = field(default_factory=dict)
+    """Settings, that could not be read or written, with the reason."""
+
+
+class Reconciler:
+    """
+    Compare the configuration of many devices to a desired state and only write what differs. Reading is cheap compared
+    to writing and some writes disrupt service, so a run without drift only costs reads.
+
+    :param limit: Maximum number of devices to reconcile at the same time
+    :param per_device: Maximum number of requests to a single device at the same time
+    """
+
+    def __init__(self, limit: int = 8, per_device: int = 2) -> None:
+        """Initialize the reconciler."""
+        self._limit = limit
+        self._per_device = per_device
+        self._logger = logging.getLogger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+
+    async def async_reconcile(
+        self,
+        devices: Iterable[Device],
+        desired: Mapping[str, DesiredState] | None = None,
+        default: DesiredState | None = None,
+        *,
+        dry_run: bool = False,
+    ) -> dict[str, ReconcileReport]:
+        """
+        Reconcile devices concurrently.
+
+        :param devices: Connected devices
+        :param desired: Desired state per serial number
+        :param default: Desired state of all devices, e.g. of a group, overridden by the state per serial number
+        :param dry_run: Only report the settings, that would be written
+        :return: Report per serial number
+        """
+        desired = desired or {}
+        default = default or DesiredState()
+        semaphore = asyncio.Semaphore(self._limit)
+
+        async def reconcile(device: Device) -> ReconcileReport:
+            async with semaphore:
+                return await self._async_reconcile(
+                    device, default.merge(desired.get(device.serial_number, DesiredState())), dry_run=dry_run
+                )
+
+        reports = await asyncio.gather(*(reconcile(device) for device in devices))
+        return {report.serial_number: report for report in reports}
+
+    async def _async_reconcile(self, device: Device, desired: DesiredState, *, dry_run: bool) -> ReconcileReport:
+        """Read the current state of a device, compare it and write the differences."""
+        report = ReconcileReport(device.serial_number)
+        semaphore = asyncio.Semaphore(self._per_device)
+        settings = {
+            "led": (self._async_get_led, self._async_set_led),
+            "guest_wifi": (self._async_get_guest_wifi, self._async_set_guest_wifi),
+            "device_name": (self._async_get_device_name, self._async_set_device_name),
+        }
+
+        async def limited(setting: str, call: Callable[[Device, DesiredState], Awaitable[Any]]) -> Any:
+            async with semaphore:
+                try:
+                    return await call(device, desired)
+                except (DevicePasswordProtected, DeviceUnavailable, FeatureNotSupported, HTTPStatusError) as e:
+                    report.failed[setting] = type(e).__name__
+                    return None
+
+        wanted = [setting for setting in settings if getattr(desired, setting) is not None]
+        current = await asyncio.gather(*(limited(setting, settings[setting][0]) for setting in wanted))
+        drifted = []
+        for setting, value in zip(wanted, current):
+            if setting in report.failed:
+                continue
+            if value == getattr(desired, setting):
+                report.unchanged.append(setting)
+            else:
+                drifted.append(setting)
+        if dry_run:
+            report.changed = {setting: getattr(desired, setting) for setting in drifted}
+            return report
+
+        results = await asyncio.gather(*(limited(setting, settings[setting][1]) for setting in drifted))
+        for setting, result in zip(drifted, results):
+            if result:
+                report.changed[setting] = getattr(desired, setting)
+                self._logger.debug("Changed %s of %s.", setting, device.serial_number)
+            elif setting not in report.failed:
+                report.failed[setting] = "Rejected by device"
+        return report
+
+    @staticmethod
+    async def _async_get_led(device: Device, _: DesiredState) -> bool:
+        """Read the LED setting."""
+        if not device.device:
+            method = "async_get_led_setting"
+            raise FeatureNotSupported(method)
+        return await device.device.async_get_led_setting()
+
+    @staticmethod
+    async def _async_set_led(device: Device, desired: DesiredState) -> bool:
+        """Write the LED setting."""
+        return await get_device_api(device).async_set_led_setting(enable=bool(desired.led))
+
+    @staticmethod
+    async def _async_get_guest_wifi(device: Device, _: DesiredState) -> bool:
+        """Read the state of the wifi guest access."""
+        if not device.device:
+            method = "async_get_wifi_guest_access"
+            raise FeatureNotSupported(method)
+        return (await device.device.async_get_wifi_guest_access()).enabled
+
+    @staticmethod
+    async def _async_set_guest_wifi(device: Device, desired: DesiredState) -> bool:
+        """Write the state of the wifi guest access."""
+        return await get_device_api(device).async_set_wifi_guest_access(
+            enable=bool(desired.guest_wifi), duration=desired.guest_wifi_duration or 0
+        )
+
+    @staticmethod
+    async def _async_get_device_name(device: Device, _: DesiredState) -> str | None:
+        """Read the user defined device name from the PLC network overview."""
+        if not device.plcnet:
+            method = "async_get_network_overview"
+            raise FeatureNotSupported(method)
+        network = await device.plcnet.async_get_network_overview()
+        return next((member.user_device_name for member in network.devices if member.mac_address == device.mac), None)
+
+    @staticmethod
+    async def _async_set_device_name(device: Device, desired: DesiredState) -> bool:
+        """Write the user defined device name."""
+        return await get_plcnet_api(device).async_set_user_device_name(desired.device_name or "")
@@ -0,0 +1,195 @@
+"""Keep exactly one device object per serial number across discoveries."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from ipaddress import ip_address
+from typing import TYPE_CHECKING
+
+from zeroconf import DNSQuestionType, ServiceBrowser, ServiceStateChange, Zeroconf
+from zeroconf.asyncio import AsyncZeroconf
+
+from devolo_plc_api.device import Device
+from devolo_plc_api.device_api import SERVICE_TYPE
+from devolo_plc_api.diagnostics import profile
+from devolo_plc_api.exceptions import DeviceNotFound
+from devolo_plc_api.network import _interfaces, _service_info
+
+from .locator import normalize_mac
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from httpx import AsyncClient
+
+    from devolo_plc_api.zeroconf import ZeroconfServiceInfo
+
+
+class DeviceRegistry:
+    """
+    Identity map of devices keyed by serial number. Discovering a known device again merges the new mDNS information like
+    a changed IP address or firmware version into the existing object instead of replacing it, so connected devices keep
+    their APIs and HTTP session. Devices can be looked up by serial number, IP address or PLC MAC address in constant
+    time. The PLC MAC address of a device is known not before it is connected.
+
+    :param session_instance: HTTP client to connect new devices with. Each device opens its own client, if omitted.
+    :param zeroconf_instance: Zeroconf instance to browse with and to share with the devices
+    """
+
+    def __init__(self, session_instance: AsyncClient | None = None, zeroconf_instance: Zeroconf | None = None) -> None:
+        """Initialize an empty registry."""
+        self._devices: dict[str, Device] = {}
+        self._by_ip: dict[str, Device] = {}
+        self._by_mac: dict[str, Device] = {}
+        self._keys: dict[str, tuple[str, str]] = {}
+        self._session_instance = session_instance
+        self._zeroconf_instance = zeroconf_instance
+        self._zeroconf = zeroconf_instance
+        self._logger = logging.getLogger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+
+    def __contains__(self, serial_number: object) -> bool:
+        """Check, if a device is registered."""
+        return serial_number in self._devices
+
+    def __iter__(self) -> Iterator[Device]:
+        """Iterate over the registered devices."""
+        return iter(list(self._devices.values()))
+
+    def __len__(self) -> int:
+        """Return the number of registered devices."""
+        return len(self._devices)
+
+    def get(self, serial_number: str) -> Device | None:
+        """
+        Look up a device by its serial number.
+
+        :param serial_number: Serial number of the device
+        :return: Device or None, if it is unknown
+        """
+        return self._devices.get(serial_number)
+
+    def by_ip(self, ip: str) -> Device | None:
+        """
+        Look up a device by its current IP address.
+
+        :param ip: IP address of the device
+        :return: Device or None, if it is unknown
+        """
+        return self._by_ip.get(ip)
+
+    def by_mac(self, mac_address: str) -> Device | None:
+        """
+        Look up a device by its PLC MAC address.
+
+        :param mac_address: PLC MAC address in any common notation
+        :return: Device or None, if it is unknown or not yet connected
+        """
+        return self._by_mac.get(normalize_mac(mac_address))
+
+    def add(self, device: Device) -> Device:
+        """
+        Register a device, e.g. one created from a PLC network overview. If a device with the same serial number is already
+        registered, the registered one is kept. Adding a registered device again updates its IP and MAC address index.
+
+        :param device: Device with a known serial number
+        :return: Registered device with that serial number
+        """
+        device = self._devices.setdefault(device.serial_number, device)
+        self._index(device)
+        return device
+
+    def remove(self, serial_number: str) -> Device | None:
+        """
+        Forget a device. It stays connected, so disconnect it, if it is not needed anymore.
+
+        :param serial_number: Serial number of the device
+        :return: Forgotten device or None, if it is unknown
+        """
+        if (device := self._devices.pop(serial_number, None)) is None:
+            return None
+        ip, mac = self._keys.pop(serial_number)
+        if self._by_ip.get(ip) is device:
+            del self._by_ip[ip]
+        if self._by_mac.get(mac) is device:
+            del self._by_mac[mac]
+        return device
+
+    async def async_merge(self, info: ZeroconfServiceInfo) -> Device:
+        """
+        Merge mDNS information of the device API into the registry. A known device takes the new information and, if
+        connected, recreates its APIs on the same HTTP session. An unknown device is created, but not connected.
+
+        :param info: mDNS information of the device API
+        :return: Registered device with the serial number of the information
+        """
+        serial_number = info.properties["SN"]
+        if (device := self._devices.get(serial_number)) is None:
+            device = Device(ip=str(ip_address(info.address)), zeroconf_instance=self._zeroconf)
+            device.serial_number = serial_number
+            self._devices[serial_number] = device
+        else:
+            await device._async_update_info(info)  # noqa: SLF001
+        self._index(device)
+        return device
+
+    async def async_discover(self, timeout: float = 3, *, connect: bool = False) -> dict[str, Device]:
+        """
+        Discover all devices that expose the devolo device API via mDNS and merge them into the registry.
+
+        :param timeout: Seconds to browse for devices
+        :param connect: Connect devices, that are not connected yet. Devices not answering are kept unconnected.
+        :return: Discovered devices accessible via serial number
+        """
+        infos: dict[str, ZeroconfServiceInfo] = {}
+
+        def add(zeroconf: Zeroconf, service_type: str, name: str, state_change: ServiceStateChange) -> None:
+            """React on state changes."""
+            if state_change is not ServiceStateChange.Added:
+                return
+            with profile("discover"):
+                if info := _service_info(zeroconf, service_type, name, timeout):
+                    infos[info.properties["SN"]] = info
+
+        if self._zeroconf is None:
+            self._zeroconf = Zeroconf(interfaces=_interfaces())
+        browser = ServiceBrowser(self._zeroconf, SERVICE_TYPE, [add], question_type=DNSQuestionType.QM)
+        await asyncio.sleep(timeout)
+        browser.cancel()
+
+        devices = {serial_number: await self.async_merge(info) for serial_number, info in infos.items()}
+        if connect:
+            await asyncio.gather(
+                *(self._async_connect(device) for device in devices.values() if not device.device and not device.plcnet)
+            )
+        return devices
+
+    async def async_close(self) -> None:
+        """Disconnect all devices and close the Zeroconf instance, if the registry created it."""
+        await asyncio.gather(*(device.async_disconnect() for device in self._devices.values()))
+        if self._zeroconf is not None and self._zeroconf_instance is None:
+            await AsyncZeroconf(zc=self._zeroconf).async_close()
+            self._zeroconf = None
+
+    async def _async_connect(self, device: Device) -> None:
+        """Connect a device and index its PLC MAC address."""
+        try:
+            await device.async_connect(session_instance=self._session_instance)
+        except DeviceNotFound:
+            self._logger.debug("Device %s not found, keeping it unconnected", device.serial_number)
+            return
+        self._index(device)
+
+    def _index(self, device: Device) -> None:
+        """Point the IP and MAC address index to a device."""
+        ip, mac = self._keys.get(device.serial_number, ("", ""))
+        if device.ip != ip:
+            if self._by_ip.get(ip) is device:
+                del self._by_ip[ip]
+            self._by_ip[device.ip] = device
+        if device.mac and normalize_mac(device.mac) != mac:
+            if self._by_mac.get(mac) is device:
+                del self._by_mac[mac]
+            mac = normalize_mac(device.mac)
+            self._by_mac[mac] = device
+        self._keys[device.serial_number] = (device.ip, mac)
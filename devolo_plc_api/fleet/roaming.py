@@ -0,0 +1,221 @@
+"""Follow wifi stations moving between devices."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Union
+
+from .locator import normalize_mac
+
+if TYPE_CHECKING:
+    from devolo_plc_api.device_api import ConnectedStationInfo
+
+
+@dataclass(frozen=True)
+class StationConnected:
+    """A station connected to a device."""
+
+    mac_address: str
+    """MAC address of the station."""
+
+    serial_number: str
+    """Serial number of the device."""
+
+    band: int
+    """Wifi band the station uses."""
+
+    timestamp: float
+    """Time of the poll in seconds since the epoch."""
+
+
+@dataclass(frozen=True)
+class StationDisconnected:
+    """A station left a device and did not show up on another one within the roaming window."""
+
+    mac_address: str
+    """MAC address of the station."""
+
+    serial_number: str
+    """Serial number of the device."""
+
+    band: int
+    """Wifi band the station used."""
+
+    timestamp: float
+    """Time of the poll, that missed the station, in seconds since the epoch."""
+
+
+@dataclass(frozen=True)
+class StationRoamed:
+    """A station moved to another device or band."""
+
+    mac_address: str
+    """MAC address of the station."""
+
+    serial_number_from: str
+    """Serial number of the previous device."""
+
+    band_from: int
+    """Previously used wifi band."""
+
+    serial_number_to: str
+    """Serial number of the current device."""
+
+    band_to: int
+    """Currently used wifi band."""
+
+    timestamp: float
+    """Time of the poll in seconds since the epoch."""
+
+
+RoamingEvent = Union[StationConnected, StationDisconnected, StationRoamed]
+
+
+@dataclass(frozen=True)
+class Session:
+    """Time a station spent on a device and band."""
+
+    serial_number: str
+    """Serial number of the device."""
+
+    band: int
+    """Wifi band the station used."""
+
+    start: float
+    """Time the station was seen first in seconds since the epoch."""
+
+    end: float
+    """Time the station was missed first in seconds since the epoch."""
+
+
+class RoamingTracker:
+    """
+    Track wifi stations across devices from consecutive polls of their connected stations. Every poll is compared to
+    the previous poll of the same device in linear time. A station missing on one device is reported as roamed, if it
+    shows up on another device within the roaming window, otherwise as disconnected after the window passed.
+
+    :param roaming_window: Seconds a station may be missing while moving to another device
+    :param history: Number of finished sessions to keep per station
+    """
+
+    def __init__(self, roaming_window: float = 60.0, history: int = 16) -> None:
+        """Initialize the tracker."""
+        self._roaming_window = roaming_window
+        self._history = history
+        self._adapters: dict[str, dict[str, int]] = {}
+        self._stations: dict[str, tuple[str, int, float]] = {}
+        self._departed: dict[str, tuple[str, int, float]] = {}
+        self._sessions: dict[str, deque[Session]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of connected stations."""
+        return len(self._stations)
+
+    def update(
+        self, serial_number: str, stations: list[ConnectedStationInfo], timestamp: float | None = None
+    ) -> list[RoamingEvent]:
+        """
+        Compare a poll of a device to its previous one.
+
+        :param serial_number: Serial number of the polled device
+        :param stations: Result of async_get_wifi_connected_station
+        :param timestamp: Time of the poll in seconds since the epoch, defaults to now
+        :return: Changes since the previous poll
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        events: list[RoamingEvent] = self.expire(timestamp)
+        previous = self._adapters.get(serial_number, {})
+        current: dict[str, int] = {normalize_mac(station.mac_address): station.band for station in stations}
+        for mac_address, band in previous.items():
+            if mac_address not in current and self._stations.get(mac_address, ("",))[0] == serial_number:
+                self._departed.pop(mac_address, None)
+                self._departed[mac_address] = (serial_number, band, timestamp)
+                self._end(mac_address, timestamp)
+        for mac_address, band in current.items():
+            if event := self._arrive(mac_address, serial_number, band, timestamp):
+                events.append(event)
+        self._adapters[serial_number] = current
+        return events
+
+    def expire(self, now: float | None = None) -> list[RoamingEvent]:
+        """
+        Report stations as disconnected, that did not show up anywhere within the roaming window.
+
+        :param now: Reference time in seconds since the epoch, defaults to now
+        :return: Disconnections
+        """
+        deadline = (time.time() if now is None else now) - self._roaming_window
+        events: list[RoamingEvent] = []
+        while self._departed:
+            mac_address = next(iter(self._departed))
+            serial_number, band, timestamp = self._departed[mac_address]
+            if timestamp > deadline:
+                break
+            del self._departed[mac_address]
+            events.append(StationDisconnected(mac_address, serial_number, band, timestamp))
+        return events
+
+    def dwell_times(self, mac_address: str, now: float | None = None) -> dict[tuple[str, int], float]:
+        """
+        Sum up the time a station spent on every device and band within the kept history.
+
+        :param mac_address: MAC address of the station in any common notation
+        :param now: Reference time for the current session in seconds since the epoch, defaults to now
+        :return: Seconds per serial number and band
+        """
+        mac_address = normalize_mac(mac_address)
+        dwell_times: dict[tuple[str, int], float] = {}
+        for session in self._sessions.get(mac_address, ()):
+            key = (session.serial_number, session.band)
+            dwell_times[key] = dwell_times.get(key, 0.0) + session.end - session.start
+        if location := self._stations.get(mac_address):
+            key = location[:2]
+            dwell_times[key] = dwell_times.get(key, 0.0) + (time.time() if now is None else now) - location[2]
+        return dwell_times
+
+    def locate(self, mac_address: str) -> tuple[str, int] | None:
+        """
+        Get the device and band a station is connected to.
+
+        :param mac_address: MAC address of the station in any common notation
+        :return: Serial number and band, None if the station is not connected
+        """
+        location = self._stations.get(normalize_mac(mac_address))
+        return location[:2] if location else None
+
+    def sessions(self, mac_address: str) -> list[Session]:
+        """
+        Get the finished sessions of a station.
+
+        :param mac_address: MAC address of the station in any common notation
+        :return: Sessions in chronological order
+        """
+        return list(self._sessions.get(normalize_mac(mac_address), ()))
+
+    def _arrive(self, mac_address: str, serial_number: str, band: int, timestamp: float) -> RoamingEvent | None:
+        """Register a station seen on a device and tell, how it got there."""
+        if (location := self._stations.get(mac_address)) is not None:
+            if location[:2] == (serial_number, band):
+                return None
+            self._end(mac_address, timestamp)
+            self._adapters.get(location[0], {}).pop(mac_address, None)
+            origin: tuple[str, int] | None = location[:2]
+        elif (departure := self._departed.pop(mac_address, None)) is not None:
+            origin = departure[:2]
+        else:
+            origin = None
+        self._stations[mac_address] = (serial_number, band, timestamp)
+        if origin == (serial_number, band):
+            return None  # Reconnected within the roaming window
+        if origin is None:
+            return StationConnected(mac_address, serial_number, band, timestamp)
+        return StationRoamed(mac_address, *origin, serial_number, band, timestamp)
+
+    def _end(self, mac_address: str, timestamp: float) -> None:
+        """Finish the current session of a station."""
+        serial_number, band, start = self._stations.pop(mac_address)
+        if mac_address not in self._sessions:
+            self._sessions[mac_address] = deque(maxlen=self._history)
+        self._sessions[mac_address].append(Session(serial_number, band, start, timestamp))
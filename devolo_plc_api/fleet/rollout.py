@@ -0,0 +1,203 @@
+"""Roll out firmware updates across many devices."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from httpx import HTTPStatusError
+
+from devolo_plc_api.device_api import UPDATE_AVAILABLE
+from devolo_plc_api.exceptions import DevicePasswordProtected, DeviceUnavailable, FeatureNotSupported
+
+from .apis import get_device_api
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from os import PathLike
+
+    from devolo_plc_api.device import Device
+
+    from .firmware import FirmwareCache
+
+PENDING = "pending"
+CURRENT = "current"
+UPDATING = "updating"
+UPDATED = "updated"
+FAILED = "failed"
+
+
+@dataclass
+class RolloutEntry:
+    """Progress of a firmware update on a single device."""
+
+    status: str = PENDING
+    """One of pending, current, updating, updated and failed."""
+
+    firmware_version: str = ""
+    """Firmware version installed before the update."""
+
+    target_version: str = ""
+    """Firmware version offered by the update server."""
+
+    uptime: int | None = None
+    """Uptime right before the update was started. None, if the device cannot tell."""
+
+    error: str = ""
+    """Reason of a failure."""
+
+
+class FirmwareRollout:
+    """
+    Update the firmware of many devices in waves. Devices of the same PLC network are updated one after another by
+    default, so a network never goes offline as a whole, while different networks are updated in parallel. An update is
+    complete, once the uptime of the device was reset and the new firmware version is announced via mDNS. The progress
+    is saved after every step, so an interrupted rollout continues where it stopped when run again.
+
+    :param state_file: JSON file to save the progress to
+    :param max_parallel: Maximum number of devices to update at the same time
+    :param max_parallel_per_network: Maximum number of devices of the same PLC network to update at the same time
+    :param poll_interval: Seconds between two checks, if an updating device came back
+    :param timeout: Seconds to wait for a device to come back with the new firmware
+    :param firmware_cache: Cache to share firmware checks between devices of the same kind
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        state_file: str | PathLike[str],
+        max_parallel: int = 4,
+        max_parallel_per_network: int = 1,
+        poll_interval: float = 10.0,
+        timeout: float = 1800.0,
+        *,
+        firmware_cache: FirmwareCache | None = None,
+    ) -> None:
+        """Initialize the rollout and load the progress of a previous run."""
+        self.state: dict[str, RolloutEntry] = {}
+        self._state_file = Path(state_file)
+        self._max_parallel = max_parallel
+        self._max_parallel_per_network = max_parallel_per_network
+        self._poll_interval = poll_interval
+        self._timeout = timeout
+        self._firmware_cache = firmware_cache
+        self._logger = logging.getLogger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        if self._state_file.exists():
+            state = json.loads(self._state_file.read_text(encoding="utf-8"))
+            self.state = {serial_number: RolloutEntry(**entry) for serial_number, entry in state.items()}
+
+    async def async_run(self, devices: Iterable[Device]) -> dict[str, RolloutEntry]:
+        """
+        Update all devices, that have a firmware update available. Devices, that were already handled in a previous run,
+        are skipped. Devices, that failed, are tried again.
+
+        :param devices: Connected devices
+        :return: Progress per serial number
+        """
+        devices = [device for device in devices if device.device]
+        networks = await self._async_networks(devices)
+        parallel = asyncio.Semaphore(self._max_parallel)
+        parallel_per_network = {network: asyncio.Semaphore(self._max_parallel_per_network) for network in networks.values()}
+
+        async def update(device: Device) -> None:
+            async with parallel_per_network[networks[device.serial_number]], parallel:
+                try:
+                    await self._async_update(device)
+                except Exception as e:
+                    self._logger.exception("Updating %s failed unexpectedly.", device.serial_number)
+                    self._save(device.serial_number, FAILED, repr(e))
+
+        await asyncio.gather(*(update(device) for device in devices))
+        return self.state
+
+    async def _async_networks(self, devices: list[Device]) -> dict[str, str]:
+        """
+        Group devices by PLC network. A network is named by its lowest PLC MAC address. Devices without PLC are a network
+        on their own.
+        """
+        networks: dict[str, str] = {}
+        names: dict[str, str] = {}
+        for device in devices:
+            networks[device.serial_number] = device.serial_number
+            if not device.plcnet:
+                continue
+            if device.mac not in names:
+                try:
+                    network = await device.plcnet.async_get_network_overview()
+                except (DevicePasswordProtected, DeviceUnavailable):
+                    continue
+                name = min((member.mac_address for member in network.devices), default=device.mac)
+                names.update(dict.fromkeys((member.mac_address for member in network.devices), name))
+            networks[device.serial_number] = names.get(device.mac, device.serial_number)
+        return networks
+
+    async def _async_update(self, device: Device) -> None:
+        """Update a single device and wait for it to come back."""
+        entry = self.state.setdefault(device.serial_number, RolloutEntry())
+        if entry.status in (CURRENT, UPDATED):
+            return
+        resumed = entry.status == UPDATING
+        try:
+            device_api = get_device_api(device)
+            if not resumed:
+                firmware = await (
+                    self._firmware_cache.async_check_firmware_available(device)
+                    if self._firmware_cache
+                    else device_api.async_check_firmware_available()
+                )
+                if firmware.result != UPDATE_AVAILABLE:
+                    self._save(device.serial_number, CURRENT)
+                    return
+                entry.firmware_version = device.firmware_version
+                entry.target_version = firmware.new_firmware_version
+                entry.uptime = await self._async_uptime(device)
+                self._save(device.serial_number, UPDATING)
+                self._logger.info("Updating %s to %s.", device.serial_number, entry.target_version)
+                if not await device_api.async_start_firmware_update():
+                    self._save(device.serial_number, FAILED, "Update was not started")
+                    return
+            if await self._async_wait(device, entry, resumed=resumed):
+                self._save(device.serial_number, UPDATED)
+            else:
+                self._save(device.serial_number, FAILED, "Device did not come back with a new firmware")
+        except (DevicePasswordProtected, DeviceUnavailable, FeatureNotSupported, HTTPStatusError) as e:
+            self._save(device.serial_number, FAILED, str(e))
+
+    async def _async_uptime(self, device: Device) -> int | None:
+        """Get the uptime of a device, if it supports it."""
+        try:
+            return await get_device_api(device).async_uptime()
+        except FeatureNotSupported:
+            return None
+
+    async def _async_wait(self, device: Device, entry: RolloutEntry, *, resumed: bool) -> bool:
+        """
+        Wait for a device to reset its uptime and to announce a new firmware version. The uptime is not compared for
+        updates resumed after an interruption, as the device may have rebooted and run longer than before meanwhile.
+        """
+        rebooted = resumed or entry.uptime is None
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._timeout
+        while loop.time() < deadline:
+            await asyncio.sleep(self._poll_interval)
+            if not rebooted:
+                try:
+                    uptime = await self._async_uptime(device)
+                except (DevicePasswordProtected, DeviceUnavailable):
+                    continue
+                rebooted = uptime is None or entry.uptime is None or uptime < entry.uptime
+            if rebooted and device.firmware_version != entry.firmware_version:
+                return True
+        return False
+
+    def _save(self, serial_number: str, status: str, error: str = "") -> None:
+        """Change the status of a device and save the progress atomically."""
+        self.state[serial_number].status = status
+        self.state[serial_number].error = error
+        temporary = self._state_file.with_suffix(".tmp")
+        state = {serial_number: asdict(entry) for serial_number, entry in self.state.items()}
+        temporary.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        temporary.replace(self._state_file)
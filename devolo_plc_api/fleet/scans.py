@@ -0,0 +1,129 @@
+"""Schedule wifi neighbor scans of many devices."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .apis import get_device_api
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from devolo_plc_api.device import Device
+    from devolo_plc_api.device_api import NeighborAPInfo
+
+
+@dataclass(frozen=True)
+class NeighborScan:
+    """Result of a wifi neighbor scan."""
+
+    serial_number: str
+    """Serial number of the scanning device."""
+
+    timestamp: float
+    """Time the scan finished in seconds since the epoch."""
+
+    access_points: list[NeighborAPInfo]
+    """Access points in the neighborhood."""
+
+
+class ScanScheduler:
+    """
+    Run wifi neighbor scans in the background. The radio of a device is busy while scanning, so only a limited number of
+    devices per site scan at the same time and scans of a site start staggered. The latest result of every device is
+    cached and can be read without waiting.
+
+    :param max_parallel_per_site: Maximum number of devices of the same site scanning at the same time
+    :param stagger: Minimum seconds between the start of two scans of the same site
+    :param site: Function naming the site of a device, e.g. a building or floor. Defaults to a single site.
+    """
+
+    def __init__(
+        self, max_parallel_per_site: int = 1, stagger: float = 5.0, site: Callable[[Device], str] | None = None
+    ) -> None:
+        """Initialize the scheduler."""
+        self._max_parallel_per_site = max_parallel_per_site
+        self._stagger = stagger
+        self._site = site or (lambda _: "")
+        self._scans: dict[str, NeighborScan] = {}
+        self._pending: dict[str, asyncio.Task[NeighborScan]] = {}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._next_start: dict[str, float] = {}
+        self._logger = logging.getLogger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+
+    def __len__(self) -> int:
+        """Return the number of cached scans."""
+        return len(self._scans)
+
+    def get(self, serial_number: str) -> NeighborScan | None:
+        """
+        Get the latest scan of a device without waiting.
+
+        :param serial_number: Serial number of the device
+        :return: Latest scan or None, if the device was never scanned
+        """
+        return self._scans.get(serial_number)
+
+    async def async_get(self, device: Device, max_age: float | None = None) -> NeighborScan:
+        """
+        Get the latest scan of a device. If there is none or it is older than max_age, wait for a new scan.
+
+        :param device: Connected device
+        :param max_age: Maximum age of the scan in seconds. None accepts any cached scan.
+        :return: Scan not older than max_age
+        """
+        scan = self._scans.get(device.serial_number)
+        if scan and (max_age is None or time.time() - scan.timestamp <= max_age):
+            return scan
+        return await asyncio.shield(self.schedule(device))
+
+    def schedule(self, device: Device) -> asyncio.Task[NeighborScan]:
+        """
+        Schedule a scan of a device in the background. If a scan of the device is already scheduled, no new one is added.
+
+        :param device: Connected device
+        :return: Task of the scan
+        """
+        if (task := self._pending.get(device.serial_number)) is None:
+            task = asyncio.create_task(self._async_scan(device))
+            task.add_done_callback(lambda task: self._done(device.serial_number, task))
+            self._pending[device.serial_number] = task
+        return task
+
+    async def async_run(self, devices: Iterable[Device], interval: float = 3600.0) -> None:
+        """
+        Scan all devices periodically until cancelled.
+
+        :param devices: Connected devices
+        :param interval: Seconds between two scans of the same device
+        """
+        devices = list(devices)
+        while True:
+            await asyncio.gather(*(self.schedule(device) for device in devices), return_exceptions=True)
+            await asyncio.sleep(interval)
+
+    async def _async_scan(self, device: Device) -> NeighborScan:
+        """Scan, when it is the device's turn on its site."""
+        device_api = get_device_api(device)
+        site = self._site(device)
+        semaphore = self._semaphores.setdefault(site, asyncio.Semaphore(self._max_parallel_per_site))
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            start = max(loop.time(), self._next_start.get(site, 0.0))
+            self._next_start[site] = start + self._stagger
+            await asyncio.sleep(start - loop.time())
+            self._logger.debug("Scanning from %s.", device.serial_number)
+            access_points = await device_api.async_get_wifi_neighbor_access_points()
+        scan = NeighborScan(device.serial_number, time.time(), access_points)
+        self._scans[device.serial_number] = scan
+        return scan
+
+    def _done(self, serial_number: str, task: asyncio.Task[NeighborScan]) -> None:
+        """Forget a finished scan task and log its failure."""
+        del self._pending[serial_number]
+        if not task.cancelled() and (exception := task.exception()):
+            self._logger.warning("Scan from %s failed: %s", serial_number, exception)
@@ -1,23 +1,65 @@
 """Helper methods to allow advanced usage of information provided by the device."""
 
+from __future__ import annotations
+
+import asyncio
+from functools import lru_cache
 from io import BytesIO
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
 
-from segno.helpers import make_wifi
+    from devolo_plc_api.device_api import WifiGuestAccessGet
 
-from devolo_plc_api.device_api import WifiGuestAccessGet
-from devolo_plc_api.device_api.wifinetwork_pb2 import WPA_NONE
+QR_CODE_CACHE_SIZE = 256
 
 
 def wifi_qr_code(guest_wifi: WifiGuestAccessGet, kind: str = "svg", **kwargs: Any) -> bytes:
     """
-    Generate a wifi QR code.
+    Generate a wifi QR code. Images are cached, so generating the same QR code again is cheap.
+
+    :param guest_wifi: Wifi credentials to represent in the QR code
+    :param kind: Output format of the image
+    :return: Bytes of image
+    """
+    try:
+        return _render(guest_wifi.ssid, guest_wifi.key, guest_wifi.wpa, kind, tuple(sorted(kwargs.items())))
+    except TypeError:
+        # unhashable render options can't be cached
+        return _render.__wrapped__(guest_wifi.ssid, guest_wifi.key, guest_wifi.wpa, kind, tuple(kwargs.items()))
+
+
+async def async_wifi_qr_code(guest_wifi: WifiGuestAccessGet, kind: str = "svg", **kwargs: Any) -> bytes:
+    """
+    Generate a wifi QR code in a worker thread to not block the event loop.
 
     :param guest_wifi: Wifi credentials to represent in the QR code
     :param kind: Output format of the image
     :return: Bytes of image
     """
+    return await asyncio.to_thread(wifi_qr_code, guest_wifi, kind, **kwargs)
+
+
+async def async_wifi_qr_codes(guest_wifis: Iterable[WifiGuestAccessGet], kind: str = "svg", **kwargs: Any) -> list[bytes]:
+    """
+    Generate many wifi QR codes in parallel worker threads.
+
+    :param guest_wifis: Wifi credentials to represent in the QR codes
+    :param kind: Output format of the images
+    :return: Bytes of images in the order of the credentials
+    """
+    return list(await asyncio.gather(*(async_wifi_qr_code(guest_wifi, kind, **kwargs) for guest_wifi in guest_wifis)))
+
+
+@lru_cache(maxsize=QR_CODE_CACHE_SIZE)
+def _render(ssid: str, key: str, wpa: int, kind: str, options: tuple[tuple[str, Any], ...]) -> bytes:
+    """Encode and render a wifi QR code."""
+    from segno.helpers import make_wifi  # noqa: PLC0415
+
+    from devolo_plc_api.device_api.wifinetwork_pb2 import WPA_NONE  # noqa: PLC0415
+
     buffer = BytesIO()
-    qr_code = make_wifi(ssid=guest_wifi.ssid, password=guest_wifi.key, security=None if guest_wifi.wpa == WPA_NONE else "WPA")
-    qr_code.save(out=buffer, kind=kind, **kwargs)
+    qr_code = make_wifi(ssid=ssid, password=key, security=None if wpa == WPA_NONE else "WPA")
+    qr_code.save(out=buffer, kind=kind, **dict(options))
     return buffer.getvalue()
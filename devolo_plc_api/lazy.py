@@ -0,0 +1,34 @@
+"""Load submodules of a package not before they are used."""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any, Callable
+
+
+def lazy_getattr(package: str, attributes: dict[str, str]) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Create module level __getattr__ and __dir__ functions that import attributes on first access.
+
+    :param package: Name of the package the attributes belong to
+    :param attributes: Attribute names mapped to their origin like ".module:Class.ATTRIBUTE"
+    :return: Functions to be used as __getattr__ and __dir__ of the package
+    """
+    namespace = import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:  # noqa: N807
+        """Import an attribute on first access and cache it in the package."""
+        if name not in attributes:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")  # noqa: EM102, TRY003
+        module, _, path = attributes[name].partition(":")
+        value: Any = import_module(module, package)
+        for part in path.split("."):
+            value = getattr(value, part)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:  # noqa: N807
+        """List loaded and not yet loaded attributes."""
+        return sorted(set(namespace) | set(attributes))
+
+    return __getattr__, __dir__
@@ -5,13 +5,17 @@ from __future__ import annotations
 import asyncio
 import time
 from ipaddress import ip_address
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from ifaddr import get_adapters
 from zeroconf import DNSQuestionType, ServiceBrowser, ServiceStateChange, Zeroconf
 
 from devolo_plc_api.device import Device
 from devolo_plc_api.device_api import SERVICE_TYPE
+from devolo_plc_api.diagnostics import profile
+
+if TYPE_CHECKING:
+    from devolo_plc_api.zeroconf import ZeroconfServiceInfo
 
 
 async def async_discover_network(timeout: float = 3) -> dict[str, Device]:
@@ -55,17 +59,30 @@ def _add(zeroconf: Zeroconf, service_type: str, name: str, state_change: Service
     if state_change is not ServiceStateChange.Added:
         return
 
-    if (service_info := zeroconf.get_service_info(service_type, name, timeout=kwargs["timeout"] * 1000)) is None:
-        return
+    with profile("discover"):
+        _add_device(zeroconf, service_type, name, **kwargs)
 
-    info = Device.info_from_service(service_info)
-    if info is None or info.properties["MT"] in ("2600", "2601"):
-        return  # Don't react on devolo Home Control central units
+
+def _add_device(zeroconf: Zeroconf, service_type: str, name: str, **kwargs: Any) -> None:
+    """Query the service info of a device and create a device object, if it is not a central unit."""
+    if (info := _service_info(zeroconf, service_type, name, kwargs["timeout"])) is None:
+        return
 
     devices: dict[str, Device] = kwargs["devices"]
     devices[info.properties["SN"]] = Device(ip=str(ip_address(info.address)), zeroconf_instance=zeroconf)
 
 
+def _service_info(zeroconf: Zeroconf, service_type: str, name: str, timeout: float) -> ZeroconfServiceInfo | None:
+    """Query the service info of a device, if it is not a central unit."""
+    if (service_info := zeroconf.get_service_info(service_type, name, timeout=int(timeout * 1000))) is None:
+        return None
+
+    info = Device.info_from_service(service_info)
+    if info is None or info.properties["MT"] in ("2600", "2601"):
+        return None  # Don't react on devolo Home Control central units
+    return info
+
+
 def _interfaces() -> list[str]:
     """Get IP addresses not being localhost."""
     interface: list[str] = []
@@ -1,20 +1,30 @@
 """The devolo plcnet API."""
 
-from .getnetworkoverview_pb2 import GetNetworkOverview
-from .plcnetapi import PlcNetApi
+from typing import TYPE_CHECKING
+
+from devolo_plc_api.lazy import lazy_getattr
+
+from .analytics import RateMatrix, anomaly_scores, weak_links
+from .diff import DataRateChanged, DeviceAdded, DeviceChanged, DeviceRemoved, NetworkDiff, NetworkEvent
+from .timeseries import DataRateSeries, DataRateStore, RateAggregate
+
+if TYPE_CHECKING:
+    from .getnetworkoverview_pb2 import GetNetworkOverview
+    from .plcnetapi import PlcNetApi
+
+    GHN_SPIRIT = GetNetworkOverview.Device.GHN_SPIRIT
+    HPAV_PANTHER = GetNetworkOverview.Device.HPAV_PANTHER
+    HPAV_THUNDERBOLT = GetNetworkOverview.Device.HPAV_THUNDERBOLT
+    LOCAL = GetNetworkOverview.Device.LOCAL
+    REMOTE = GetNetworkOverview.Device.REMOTE
+
+    DataRate = GetNetworkOverview.DataRate
+    Device = GetNetworkOverview.Device
+    LogicalNetwork = GetNetworkOverview.LogicalNetwork
 
 DEVICES_WITHOUT_PLCNET = ["3046", "3047", "3048", "3049", "3254", "3255", "3256"]
-GHN_SPIRIT = GetNetworkOverview.Device.GHN_SPIRIT
-HPAV_PANTHER = GetNetworkOverview.Device.HPAV_PANTHER
-HPAV_THUNDERBOLT = GetNetworkOverview.Device.HPAV_THUNDERBOLT
-LOCAL = GetNetworkOverview.Device.LOCAL
-REMOTE = GetNetworkOverview.Device.REMOTE
 SERVICE_TYPE = "_dvl-plcnetapi._tcp.local."
 
-DataRate = GetNetworkOverview.DataRate
-Device = GetNetworkOverview.Device
-LogicalNetwork = GetNetworkOverview.LogicalNetwork
-
 __all__ = [
     "DEVICES_WITHOUT_PLCNET",
     "GHN_SPIRIT",
@@ -24,7 +34,35 @@ __all__ = [
     "REMOTE",
     "SERVICE_TYPE",
     "DataRate",
+    "DataRateChanged",
+    "DataRateSeries",
+    "DataRateStore",
     "Device",
+    "DeviceAdded",
+    "DeviceChanged",
+    "DeviceRemoved",
     "LogicalNetwork",
+    "NetworkDiff",
+    "NetworkEvent",
     "PlcNetApi",
+    "RateAggregate",
+    "RateMatrix",
+    "anomaly_scores",
+    "weak_links",
 ]
+
+__getattr__, __dir__ = lazy_getattr(
+    __name__,
+    {
+        "GetNetworkOverview": ".getnetworkoverview_pb2:GetNetworkOverview",
+        "PlcNetApi": ".plcnetapi:PlcNetApi",
+        "GHN_SPIRIT": ".getnetworkoverview_pb2:GetNetworkOverview.Device.GHN_SPIRIT",
+        "HPAV_PANTHER": ".getnetworkoverview_pb2:GetNetworkOverview.Device.HPAV_PANTHER",
+        "HPAV_THUNDERBOLT": ".getnetworkoverview_pb2:GetNetworkOverview.Device.HPAV_THUNDERBOLT",
+        "LOCAL": ".getnetworkoverview_pb2:GetNetworkOverview.Device.LOCAL",
+        "REMOTE": ".getnetworkoverview_pb2:GetNetworkOverview.Device.REMOTE",
+        "DataRate": ".getnetworkoverview_pb2:GetNetworkOverview.DataRate",
+        "Device": ".getnetworkoverview_pb2:GetNetworkOverview.Device",
+        "LogicalNetwork": ".getnetworkoverview_pb2:GetNetworkOverview.LogicalNetwork",
+    },
+)
@@ -0,0 +1,177 @@
+"""
+Link quality analytics on PLC data rates. A RateMatrix covers a single PLC network, so analyzing a fleet means building
+and querying one matrix per network. The calculations are plain Python loops over a stdlib array. They are fast for the
+few devices of a PLC network, but they are not vectorized. Only weak_links and anomaly_scores look at many networks or
+links in one call.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from typing_extensions import Self
+
+    from .getnetworkoverview_pb2 import GetNetworkOverview
+    from .timeseries import DataRateStore
+
+
+class RateMatrix:
+    """
+    Dense matrix of transmit data rates between all devices of a PLC network. A rate of 0 means, that no data rate is known.
+
+    :param mac_addresses: PLC MAC addresses of the devices in the order of rows and columns
+    """
+
+    def __init__(self, mac_addresses: list[str]) -> None:
+        """Initialize an empty matrix."""
+        self.mac_addresses = mac_addresses
+        self.index = {mac_address: i for i, mac_address in enumerate(mac_addresses)}
+        self.size = len(mac_addresses)
+        self.rates = array("d", bytes(8 * self.size * self.size))
+
+    @classmethod
+    def from_network(cls, network: GetNetworkOverview.LogicalNetwork) -> Self:
+        """
+        Build a matrix from a network overview. The receive rate of a link is used as transmit rate of the opposite
+        direction, if the opposite direction is not reported by itself.
+
+        :param network: Network overview
+        :return: Rate matrix
+        """
+        mac_addresses = [device.mac_address for device in network.devices]
+        known = set(mac_addresses)
+        for data_rate in network.data_rates:
+            for mac_address in (data_rate.mac_address_from, data_rate.mac_address_to):
+                if mac_address not in known:
+                    known.add(mac_address)
+                    mac_addresses.append(mac_address)
+        matrix = cls(mac_addresses)
+        reported: set[int] = set()
+        for data_rate in network.data_rates:
+            i = matrix.index[data_rate.mac_address_from]
+            j = matrix.index[data_rate.mac_address_to]
+            matrix.rates[i * matrix.size + j] = data_rate.tx_rate
+            reported.add(i * matrix.size + j)
+            if j * matrix.size + i not in reported:
+                matrix.rates[j * matrix.size + i] = data_rate.rx_rate
+        return matrix
+
+    def rate(self, mac_address_from: str, mac_address_to: str) -> float:
+        """
+        Get the transmit data rate between two devices.
+
+        :param mac_address_from: PLC MAC address of the sending device
+        :param mac_address_to: PLC MAC address of the receiving device
+        :return: Data rate in mbps
+        """
+        return self.rates[self.index[mac_address_from] * self.size + self.index[mac_address_to]]
+
+    def asymmetry(self) -> dict[tuple[str, str], float]:
+        """
+        Calculate the relative difference between both directions of every known link.
+
+        :return: Asymmetry between 0 (symmetric) and 1 (one direction down) per pair of devices
+        """
+        result: dict[tuple[str, str], float] = {}
+        size = self.size
+        for i in range(size):
+            row = self.rates[i * size : (i + 1) * size]
+            column = self.rates[i::size]
+            for j in range(i + 1, size):
+                if highest := max(row[j], column[j]):
+                    result[self.mac_addresses[i], self.mac_addresses[j]] = abs(row[j] - column[j]) / highest
+        return result
+
+    def widest_path(self, mac_address_from: str, mac_address_to: str) -> tuple[list[str], float]:
+        """
+        Find the path with the highest bottleneck data rate between two devices, e.g. to decide on relaying.
+
+        :param mac_address_from: PLC MAC address of the sending device
+        :param mac_address_to: PLC MAC address of the receiving device
+        :return: PLC MAC addresses along the path and its bottleneck data rate. An empty path, if there is none.
+        """
+        size = self.size
+        source = self.index[mac_address_from]
+        target = self.index[mac_address_to]
+        width = [0.0] * size
+        width[source] = math.inf
+        previous = [-1] * size
+        done = [False] * size
+        for _ in range(size):
+            current = max((i for i in range(size) if not done[i]), key=width.__getitem__)
+            if width[current] == 0 or current == target:
+                break
+            done[current] = True
+            row = self.rates[current * size : (current + 1) * size]
+            for i in range(size):
+                if not done[i] and (candidate := min(width[current], row[i])) > width[i]:
+                    width[i] = candidate
+                    previous[i] = current
+        if not width[target] or source == target:
+            return [], 0.0
+        path = [target]
+        while path[-1] != source:
+            path.append(previous[path[-1]])
+        return [self.mac_addresses[i] for i in reversed(path)], width[target]
+
+    def best_relay(self, mac_address_from: str, mac_address_to: str) -> tuple[str | None, float]:
+        """
+        Find the device that relays best between two devices with exactly one hop.
+
+        :param mac_address_from: PLC MAC address of the sending device
+        :param mac_address_to: PLC MAC address of the receiving device
+        :return: PLC MAC address of the relay and the resulting bottleneck rate. None, if the direct link is better.
+        """
+        size = self.size
+        source = self.index[mac_address_from]
+        target = self.index[mac_address_to]
+        outgoing = self.rates[source * size : (source + 1) * size]
+        incoming = self.rates[target::size]
+        best, best_rate = None, outgoing[target]
+        for i, rate in enumerate(map(min, outgoing, incoming)):
+            if i not in (source, target) and rate > best_rate:
+                best, best_rate = self.mac_addresses[i], rate
+        return best, best_rate
+
+
+def weak_links(networks: Iterable[GetNetworkOverview.LogicalNetwork], threshold: float) -> list[tuple[str, str, float]]:
+    """
+    Find links below a data rate in many networks with a single scan over their data rates.
+
+    :param networks: Network overviews
+    :param threshold: Data rate in mbps below which a link is considered weak
+    :return: PLC MAC addresses of both ends and the data rate, weakest first
+    """
+    result = [
+        (data_rate.mac_address_from, data_rate.mac_address_to, rate)
+        for network in networks
+        for data_rate in network.data_rates
+        if (rate := min(data_rate.tx_rate, data_rate.rx_rate)) < threshold
+    ]
+    return sorted(result, key=lambda link: link[2])
+
+
+def anomaly_scores(store: DataRateStore, attribute: str, since: float = 0.0) -> dict[tuple[str, str], float]:
+    """
+    Score the latest data rate of every link against its rolling history as z-score. Large negative values show a sudden
+    drop.
+
+    :param store: History of data rates
+    :param attribute: Either tx_rate or rx_rate
+    :param since: Only consider samples taken at or after this timestamp as history
+    :return: Z-score per link with at least two samples in the window
+    """
+    scores: dict[tuple[str, str], float] = {}
+    for link in store:
+        values = store[link].window(attribute, since)
+        if len(values) < 2:  # noqa: PLR2004
+            continue
+        mean = math.fsum(values) / len(values)
+        deviation = math.sqrt(math.fsum((value - mean) ** 2 for value in values) / len(values))
+        scores[link] = (values[-1] - mean) / deviation if deviation else 0.0
+    return scores
@@ -0,0 +1,169 @@
+"""Detect changes between consecutive PLC network overviews."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Union
+
+if TYPE_CHECKING:
+    from .getnetworkoverview_pb2 import GetNetworkOverview
+
+ATTRIBUTES = (
+    "product_name",
+    "product_id",
+    "friendly_version",
+    "full_version",
+    "user_device_name",
+    "user_network_name",
+    "topology",
+    "technology",
+    "bridged_devices",
+    "ipv4_address",
+    "attached_to_router",
+)
+RATES = ("tx_rate", "rx_rate")
+
+
+@dataclass(frozen=True)
+class DeviceAdded:
+    """A device joined the PLC network."""
+
+    mac_address: str
+    """PLC MAC address of the device."""
+
+    device: GetNetworkOverview.Device
+    """Device as reported in the network overview."""
+
+
+@dataclass(frozen=True)
+class DeviceRemoved:
+    """A device left the PLC network."""
+
+    mac_address: str
+    """PLC MAC address of the device."""
+
+
+@dataclass(frozen=True)
+class DeviceChanged:
+    """An attribute of a device changed, e.g. its firmware version or its name."""
+
+    mac_address: str
+    """PLC MAC address of the device."""
+
+    attribute: str
+    """Name of the changed attribute of GetNetworkOverview.Device."""
+
+    old: Any
+    """Previous value. Bridged devices are reported as tuple."""
+
+    new: Any
+    """Current value. Bridged devices are reported as tuple."""
+
+
+@dataclass(frozen=True)
+class DataRateChanged:
+    """A data rate between two devices moved beyond the threshold, appeared or vanished."""
+
+    mac_address_from: str
+    """PLC MAC address of the device the data rate was measured on."""
+
+    mac_address_to: str
+    """PLC MAC address of the remote device."""
+
+    attribute: str
+    """Either tx_rate or rx_rate."""
+
+    old: float | None
+    """Previous rate in mbps. None, if the link is new."""
+
+    new: float | None
+    """Current rate in mbps. None, if the link vanished."""
+
+
+NetworkEvent = Union[DeviceAdded, DeviceRemoved, DeviceChanged, DataRateChanged]
+
+
+class NetworkDiff:
+    """
+    Keep the last snapshot of PLC networks and report changes between polls. Every call is linear in the size of the network.
+
+    :param threshold: Relative change of a data rate since it was last reported needed to report it, e.g. 0.1 for 10 %
+    """
+
+    def __init__(self, threshold: float = 0.1) -> None:
+        """Initialize the diff engine."""
+        self.threshold = threshold
+        self._devices: dict[str, dict[str, tuple[Any, ...]]] = {}
+        self._rates: dict[str, dict[tuple[str, str], tuple[float, ...]]] = {}
+
+    def __contains__(self, network_id: str) -> bool:
+        """Check, if a snapshot of a network is known."""
+        return network_id in self._devices
+
+    def forget(self, network_id: str) -> None:
+        """
+        Drop the snapshot of a network.
+
+        :param network_id: Identifier of the network, the snapshot was stored with
+        """
+        self._devices.pop(network_id, None)
+        self._rates.pop(network_id, None)
+
+    def update(self, network_id: str, network: GetNetworkOverview.LogicalNetwork) -> list[NetworkEvent]:
+        """
+        Store a new snapshot of a network and return the changes compared to the previous one. On the first call for a
+        network, all devices and data rates are reported as new.
+
+        :param network_id: Identifier of the network, e.g. the PLC MAC address of the device the overview was taken from
+        :param network: Current network overview
+        :return: Changes since the last snapshot
+        """
+        events: list[NetworkEvent] = []
+        old_devices = self._devices.get(network_id, {})
+        devices: dict[str, tuple[Any, ...]] = {}
+        for device in network.devices:
+            values = tuple(
+                tuple(device.bridged_devices) if attribute == "bridged_devices" else getattr(device, attribute)
+                for attribute in ATTRIBUTES
+            )
+            devices[device.mac_address] = values
+            if (old_values := old_devices.get(device.mac_address)) is None:
+                events.append(DeviceAdded(mac_address=device.mac_address, device=device))
+                continue
+            events.extend(
+                DeviceChanged(mac_address=device.mac_address, attribute=attribute, old=old, new=new)
+                for attribute, old, new in zip(ATTRIBUTES, old_values, values)
+                if old != new
+            )
+        events.extend(DeviceRemoved(mac_address=mac_address) for mac_address in old_devices.keys() - devices.keys())
+
+        old_rates = self._rates.get(network_id, {})
+        rates: dict[tuple[str, str], tuple[float, ...]] = {}
+        for data_rate in network.data_rates:
+            link = (data_rate.mac_address_from, data_rate.mac_address_to)
+            baseline: list[float] = []
+            # Compare to the last reported rate, so slow drifts are reported once they add up beyond the threshold
+            for attribute, old, new in zip(RATES, old_rates.get(link, (None, None)), (data_rate.tx_rate, data_rate.rx_rate)):
+                if self._exceeds(old, new):
+                    events.append(DataRateChanged(*link, attribute=attribute, old=old, new=new))
+                    baseline.append(new)
+                elif old is not None:
+                    baseline.append(old)
+            rates[link] = tuple(baseline)
+        for link in old_rates.keys() - rates.keys():
+            events.extend(
+                DataRateChanged(*link, attribute=attribute, old=old, new=None)
+                for attribute, old in zip(RATES, old_rates[link])
+            )
+
+        self._devices[network_id] = devices
+        self._rates[network_id] = rates
+        return events
+
+    def _exceeds(self, old: float | None, new: float) -> bool:
+        """Check, if a data rate moved beyond the threshold."""
+        if old is None:
+            return True
+        if old == 0:
+            return new != 0
+        return abs(new - old) > self.threshold * old
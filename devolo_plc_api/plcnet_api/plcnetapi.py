@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING
 
 from devolo_plc_api.clients import Protobuf
+from devolo_plc_api.diagnostics import DebugBuffer
 
 from .getnetworkoverview_pb2 import GetNetworkOverview
 from .identifydevice_pb2 import IdentifyDeviceResponse, IdentifyDeviceStart, IdentifyDeviceStop
@@ -12,8 +14,11 @@ from .pairdevice_pb2 import PairDeviceResponse, PairDeviceStart
 from .setuserdevicename_pb2 import SetUserDeviceName, SetUserDeviceNameResponse
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
     from httpx import AsyncClient
 
+    from devolo_plc_api.clients import RequestLimiter
     from devolo_plc_api.zeroconf import ZeroconfServiceInfo
 
 
@@ -24,13 +29,24 @@ class PlcNetApi(Protobuf):
     :param ip: IP address of the device to communicate with
     :param session: HTTP client session
     :param info: Information collected from the mDNS query
+    :param limiter: Limiter of concurrent requests to the device
+    :param debug_buffer: Buffer to record debug events of the device in
     """
 
-    def __init__(self, ip: str, session: AsyncClient, info: ZeroconfServiceInfo) -> None:
+    def __init__(
+        self,
+        ip: str,
+        session: AsyncClient,
+        info: ZeroconfServiceInfo,
+        limiter: RequestLimiter | None = None,
+        debug_buffer: DebugBuffer | None = None,
+    ) -> None:
         """Initialize the plcnet API."""
         super().__init__()
 
+        self._debug_buffer = DebugBuffer() if debug_buffer is None else debug_buffer
         self._ip = ip
+        self._limiter = limiter
         self._mac = info.properties["PlcMacAddress"]
         self._path = info.properties["Path"]
         self._port = info.port
@@ -52,60 +68,98 @@ class PlcNetApi(Protobuf):
         network_overview.ParseFromString(await response.aread())
         return network_overview.network
 
-    async def async_identify_device_start(self) -> bool:
+    async def async_identify_device_start(self, mac_address: str | None = None) -> bool:
         """
         Make PLC LED of a device blink to identify it.
 
+        :param mac_address: PLC MAC address of a device in the same PLC network, defaults to this device
         :return: True, if identifying was successfully started, otherwise False
         """
         self._logger.debug("Starting LED blinking.")
         identify_device = IdentifyDeviceStart()
-        identify_device.mac_address = self._mac
+        identify_device.mac_address = mac_address or self._mac
         query = await self._async_post("IdentifyDeviceStart", content=identify_device.SerializeToString())
         response = IdentifyDeviceResponse()
         response.ParseFromString(await query.aread())
         return response.result == response.SUCCESS
 
-    async def async_identify_device_stop(self) -> bool:
+    async def async_identify_device_stop(self, mac_address: str | None = None) -> bool:
         """
         Stop the PLC LED blinking.
 
+        :param mac_address: PLC MAC address of a device in the same PLC network, defaults to this device
         :return: True, if identifying was successfully stopped, otherwise False
         """
         self._logger.debug("Stopping LED blinking.")
         identify_device = IdentifyDeviceStop()
-        identify_device.mac_address = self._mac
+        identify_device.mac_address = mac_address or self._mac
         query = await self._async_post("IdentifyDeviceStop", content=identify_device.SerializeToString())
         response = IdentifyDeviceResponse()
         response.ParseFromString(await query.aread())
         return response.result == response.SUCCESS
 
-    async def async_pair_device(self) -> bool:
+    async def async_pair_device(self, mac_address: str | None = None) -> bool:
         """
         Start pairing mode.
 
+        :param mac_address: PLC MAC address of a device in the same PLC network, defaults to this device
         :return: True, if pairing was started successfully, otherwise False
         """
         self._logger.debug("Pairing.")
         pair_device = PairDeviceStart()
-        pair_device.mac_address = self._mac
+        pair_device.mac_address = mac_address or self._mac
         query = await self._async_post("PairDeviceStart", content=pair_device.SerializeToString())
         response = PairDeviceResponse()
         response.ParseFromString(await query.aread())
         return response.result == response.SUCCESS
 
-    async def async_set_user_device_name(self, name: str) -> bool:
+    async def async_set_user_device_name(self, name: str, mac_address: str | None = None) -> bool:
         """
         Set device name.
 
         :param name: Name, the device shall have
+        :param mac_address: PLC MAC address of a device in the same PLC network, defaults to this device
         :return: True, if the device was successfully renamed, otherwise False
         """
         self._logger.debug("Setting device name.")
         set_user_name = SetUserDeviceName()
-        set_user_name.mac_address = self._mac
+        set_user_name.mac_address = mac_address or self._mac
         set_user_name.user_device_name = name
         query = await self._async_post("SetUserDeviceName", content=set_user_name.SerializeToString())
         response = SetUserDeviceNameResponse()
         response.ParseFromString(await query.aread())
         return response.result == response.SUCCESS
+
+    async def async_identify_devices_start(self, mac_addresses: Iterable[str]) -> dict[str, bool]:
+        """
+        Make PLC LEDs of multiple devices of the PLC network blink using this device only.
+
+        :param mac_addresses: PLC MAC addresses of devices in the same PLC network
+        :return: Per MAC address True, if identifying was successfully started, otherwise False
+        """
+        mac_addresses = list(mac_addresses)
+        results = await asyncio.gather(*(self.async_identify_device_start(mac_address) for mac_address in mac_addresses))
+        return dict(zip(mac_addresses, results))
+
+    async def async_identify_devices_stop(self, mac_addresses: Iterable[str]) -> dict[str, bool]:
+        """
+        Stop the PLC LEDs of multiple devices of the PLC network blinking using this device only.
+
+        :param mac_addresses: PLC MAC addresses of devices in the same PLC network
+        :return: Per MAC address True, if identifying was successfully stopped, otherwise False
+        """
+        mac_addresses = list(mac_addresses)
+        results = await asyncio.gather(*(self.async_identify_device_stop(mac_address) for mac_address in mac_addresses))
+        return dict(zip(mac_addresses, results))
+
+    async def async_set_user_device_names(self, names: Mapping[str, str]) -> dict[str, bool]:
+        """
+        Set names of multiple devices of the PLC network using this device only.
+
+        :param names: Names, the devices shall have, per PLC MAC address
+        :return: Per MAC address True, if the device was successfully renamed, otherwise False
+        """
+        results = await asyncio.gather(
+            *(self.async_set_user_device_name(name, mac_address) for mac_address, name in names.items())
+        )
+        return dict(zip(names, results))
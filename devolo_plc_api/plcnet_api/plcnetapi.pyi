@@ -3,20 +3,28 @@
 isort:skip_file
 """
 from .getnetworkoverview_pb2 import GetNetworkOverview
-from devolo_plc_api.clients import Protobuf
+from collections.abc import Iterable, Mapping
+from devolo_plc_api.clients import Protobuf, RequestLimiter as RequestLimiter
+from devolo_plc_api.diagnostics import DebugBuffer
 from devolo_plc_api.zeroconf import ZeroconfServiceInfo as ZeroconfServiceInfo
 from httpx import AsyncClient as AsyncClient
 
 class PlcNetApi(Protobuf):
     password: str
-    def __init__(self, ip: str, session: AsyncClient, info: ZeroconfServiceInfo) -> None: ...
+    def __init__(self, ip: str, session: AsyncClient, info: ZeroconfServiceInfo, limiter: RequestLimiter | None = None, debug_buffer: DebugBuffer | None = None) -> None: ...
     async def async_get_network_overview(self) -> GetNetworkOverview.LogicalNetwork: ...
-    async def async_identify_device_start(self) -> bool: ...
-    async def async_identify_device_stop(self) -> bool: ...
-    async def async_pair_device(self) -> bool: ...
-    async def async_set_user_device_name(self, name: str) -> bool: ...
+    async def async_identify_device_start(self, mac_address: str | None = None) -> bool: ...
+    async def async_identify_device_stop(self, mac_address: str | None = None) -> bool: ...
+    async def async_pair_device(self, mac_address: str | None = None) -> bool: ...
+    async def async_set_user_device_name(self, name: str, mac_address: str | None = None) -> bool: ...
+    async def async_identify_devices_start(self, mac_addresses: Iterable[str]) -> dict[str, bool]: ...
+    async def async_identify_devices_stop(self, mac_addresses: Iterable[str]) -> dict[str, bool]: ...
+    async def async_set_user_device_names(self, names: Mapping[str, str]) -> dict[str, bool]: ...
     def get_network_overview(self) -> GetNetworkOverview.LogicalNetwork: ...
-    def identify_device_start(self) -> bool: ...
-    def identify_device_stop(self) -> bool: ...
-    def pair_device(self) -> bool: ...
-    def set_user_device_name(self, name: str) -> bool: ...
+    def identify_device_start(self, mac_address: str | None = None) -> bool: ...
+    def identify_device_stop(self, mac_address: str | None = None) -> bool: ...
+    def pair_device(self, mac_address: str | None = None) -> bool: ...
+    def set_user_device_name(self, name: str, mac_address: str | None = None) -> bool: ...
+    def identify_devices_start(self, mac_addresses: Iterable[str]) -> dict[str, bool]: ...
+    def identify_devices_stop(self, mac_addresses: Iterable[str]) -> dict[str, bool]: ...
+    def set_user_device_names(self, names: Mapping[str, str]) -> dict[str, bool]: ...
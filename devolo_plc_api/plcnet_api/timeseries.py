@@ -0,0 +1,189 @@
+"""Memory bounded history of PLC data rates."""
+
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from .getnetworkoverview_pb2 import GetNetworkOverview
+
+
+@dataclass(frozen=True)
+class RateAggregate:
+    """Aggregated data rates of a link within a time window."""
+
+    minimum: float
+    """Lowest data rate in mbps."""
+
+    mean: float
+    """Average data rate in mbps."""
+
+    p95: float
+    """95th percentile of the data rate in mbps."""
+
+    samples: int
+    """Number of samples the aggregation is based on."""
+
+
+class DataRateSeries:
+    """
+    Fixed-capacity ring buffer of data rates of a single link. Timestamps are stored as double, rates as single precision
+    floats like in the protobuf messages, so a series always occupies 16 bytes per sample.
+
+    :param capacity: Number of samples to keep, at least one
+    """
+
+    __slots__ = ("_count", "_next", "capacity", "rx_rate", "timestamp", "tx_rate")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize the series."""
+        if capacity < 1:
+            raise ValueError(f"Capacity must be at least 1, not {capacity}")  # noqa: EM102, TRY003
+        self.capacity = capacity
+        self.timestamp = array("d", bytes(8 * capacity))
+        self.tx_rate = array("f", bytes(4 * capacity))
+        self.rx_rate = array("f", bytes(4 * capacity))
+        self._count = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples stored."""
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes occupied by the samples."""
+        return sum(len(values) * values.itemsize for values in (self.timestamp, self.tx_rate, self.rx_rate))
+
+    def append(self, timestamp: float, tx_rate: float, rx_rate: float) -> None:
+        """
+        Add a sample overwriting the oldest one, if the buffer is full. Timestamps must not decrease.
+
+        :param timestamp: Time of the measurement in seconds since the epoch
+        :param tx_rate: Transmit data rate in mbps
+        :param rx_rate: Receive data rate in mbps
+        """
+        self.timestamp[self._next] = timestamp
+        self.tx_rate[self._next] = tx_rate
+        self.rx_rate[self._next] = rx_rate
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def window(self, attribute: str, since: float = 0.0) -> array:
+        """
+        Get samples in chronological order.
+
+        :param attribute: Either tx_rate or rx_rate
+        :param since: Only return samples taken at or after this timestamp
+        :return: Data rates in mbps
+        """
+        start = self._next - self._count
+        timestamps = self._ordered(self.timestamp, start)
+        return self._ordered(getattr(self, attribute), start)[bisect_left(timestamps, since) :]
+
+    def aggregate(self, attribute: str, since: float = 0.0) -> RateAggregate | None:
+        """
+        Aggregate samples of a time window.
+
+        :param attribute: Either tx_rate or rx_rate
+        :param since: Only consider samples taken at or after this timestamp
+        :return: Aggregated data rates, None if there are no samples in the window
+        """
+        values = self.window(attribute, since)
+        if not values:
+            return None
+        ordered = sorted(values)
+        return RateAggregate(
+            minimum=ordered[0],
+            mean=math.fsum(values) / len(values),
+            p95=ordered[math.ceil(0.95 * len(ordered)) - 1],
+            samples=len(values),
+        )
+
+    def _ordered(self, values: array, start: int) -> array:
+        """Unroll the ring buffer."""
+        if start >= 0:
+            return values[start : self._next]
+        return values[start:] + values[: self._next]
+
+
+class DataRateStore:
+    """
+    History of PLC data rates per link, fed from network overviews.
+
+    :param capacity: Number of samples to keep per link, at least one
+    """
+
+    def __init__(self, capacity: int = 1440) -> None:
+        """Initialize the store."""
+        if capacity < 1:
+            raise ValueError(f"Capacity must be at least 1, not {capacity}")  # noqa: EM102, TRY003
+        self.capacity = capacity
+        self._series: dict[tuple[str, str], DataRateSeries] = {}
+
+    def __contains__(self, link: tuple[str, str]) -> bool:
+        """Check, if data rates of a link are known."""
+        return link in self._series
+
+    def __getitem__(self, link: tuple[str, str]) -> DataRateSeries:
+        """Get the series of a link identified by the MAC addresses of both ends."""
+        return self._series[link]
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        """Iterate over all known links."""
+        return iter(self._series)
+
+    def __len__(self) -> int:
+        """Return the number of known links."""
+        return len(self._series)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes occupied by the samples of all links."""
+        return sum(series.nbytes for series in self._series.values())
+
+    def add_network(self, network: GetNetworkOverview.LogicalNetwork, timestamp: float | None = None) -> None:
+        """
+        Add the data rates of a network overview.
+
+        :param network: Network overview
+        :param timestamp: Time of the measurement in seconds since the epoch, defaults to now
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        for data_rate in network.data_rates:
+            link = (data_rate.mac_address_from, data_rate.mac_address_to)
+            if (series := self._series.get(link)) is None:
+                series = self._series[link] = DataRateSeries(self.capacity)
+            series.append(timestamp, data_rate.tx_rate, data_rate.rx_rate)
+
+    def aggregate(
+        self, mac_address_from: str, mac_address_to: str, attribute: str, since: float = 0.0
+    ) -> RateAggregate | None:
+        """
+        Aggregate data rates of a link within a time window.
+
+        :param mac_address_from: PLC MAC address of the device the data rate was measured on
+        :param mac_address_to: PLC MAC address of the remote device
+        :param attribute: Either tx_rate or rx_rate
+        :param since: Only consider samples taken at or after this timestamp
+        :return: Aggregated data rates, None if there are no samples in the window
+        """
+        if (series := self._series.get((mac_address_from, mac_address_to))) is None:
+            return None
+        return series.aggregate(attribute, since)
+
+    def forget(self, mac_address_from: str, mac_address_to: str) -> None:
+        """
+        Drop the history of a link.
+
+        :param mac_address_from: PLC MAC address of the device the data rate was measured on
+        :param mac_address_to: PLC MAC address of the remote device
+        """
+        self._series.pop((mac_address_from, mac_address_to), None)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Compare parsing CONFIGLAYER content with the regular expression and the dedicated parser."""
+
+from __future__ import annotations
+
+import sys
+import time
+from typing import Callable
+
+from devolo_plc_api.device_api import CONFIGLAYER_FORMAT
+from devolo_plc_api.device_api.configlayer import ConfigLayerParser, iter_configlayer
+
+CHUNK_SIZE = 65536
+
+
+def generate(entries: int) -> bytes:
+    """Generate CONFIGLAYER content similar to a support info dump."""
+    return b"".join(
+        b"NETWORK.ENTRY_%d.VALUE=some value with spaces, lower case and numbers %d\n" % (i, i) for i in range(entries)
+    )
+
+
+def generate_hexdump(entries: int) -> bytes:
+    """Generate CONFIGLAYER content with upper case hex dumps as values, which make the regular expression backtrack."""
+    return b"".join(b"NETWORK.BLOB_%d=%s\n" % (i, b"0123456789ABCDEF" * 64) for i in range(entries))
+
+
+def regex(content: bytes) -> list[tuple[bytes, bytes]]:
+    """Parse content with the regular expression."""
+    return [(match.group(2), match.group(3)) for match in CONFIGLAYER_FORMAT.finditer(content)]
+
+
+def parser(content: bytes) -> list[tuple[bytes, bytes]]:
+    """Parse content in one go."""
+    return list(iter_configlayer(content))
+
+
+def chunked(content: bytes) -> list[tuple[bytes, bytes]]:
+    """Parse content in chunks."""
+    configlayer = ConfigLayerParser()
+    pairs: list[tuple[bytes, bytes]] = []
+    for offset in range(0, len(content), CHUNK_SIZE):
+        pairs += configlayer.feed(content[offset : offset + CHUNK_SIZE])
+    return pairs + configlayer.close()
+
+
+def measure(method: Callable[[bytes], list[tuple[bytes, bytes]]], content: bytes) -> tuple[float, list[tuple[bytes, bytes]]]:
+    """Return the throughput in MB/s and the result of a parsing method."""
+    start = time.perf_counter()
+    result = method(content)
+    return len(content) / (time.perf_counter() - start) / 1e6, result
+
+
+if __name__ == "__main__":
+    for entries in map(int, sys.argv[1:] or ["1000", "4000", "16000"]):
+        for generator in (generate, generate_hexdump):
+            content = generator(entries // 10 if generator is generate_hexdump else entries)
+            reference = None
+            for method in (regex, parser, chunked):
+                throughput, result = measure(method, content)
+                reference = reference or result
+                if result != reference:
+                    sys.exit(f"{method.__name__} differs from regex")
+                sys.stdout.write(
+                    f"{generator.__name__:<16} {len(content) / 1024:8.0f} kB {method.__name__:<8} {throughput:8.2f} MB/s\n"
+                )
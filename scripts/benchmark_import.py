@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""Measure the time needed to import parts of the package in a fresh interpreter."""
+
+from __future__ import annotations
+
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "devolo_plc_api",
+    "devolo_plc_api.device_api",
+    "devolo_plc_api.plcnet_api",
+    "devolo_plc_api.device",
+]
+CODE = "import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+
+
+def benchmark(module: str, rounds: int = 10) -> float:
+    """Return the median import time of a module in milliseconds."""
+    durations = [
+        float(
+            subprocess.run(  # noqa: S603
+                [sys.executable, "-c", CODE.format(module=module)], capture_output=True, check=True, text=True
+            ).stdout
+        )
+        for _ in range(rounds)
+    ]
+    return statistics.median(durations) * 1000
+
+
+if __name__ == "__main__":
+    for module in sys.argv[1:] or MODULES:
+        sys.stdout.write(f"{module:<30} {benchmark(module):8.1f} ms\n")
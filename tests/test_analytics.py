@@ -0,0 +1,68 @@
+"""Test link quality analytics."""
+
+import pytest
+
+from devolo_plc_api.plcnet_api import DataRate, DataRateStore, Device, LogicalNetwork, RateMatrix, anomaly_scores, weak_links
+
+
+@pytest.fixture
+def network() -> LogicalNetwork:
+    """Mock a PLC network with a weak direct link between A and C."""
+    return LogicalNetwork(
+        devices=[Device(mac_address="A"), Device(mac_address="B"), Device(mac_address="C")],
+        data_rates=[
+            DataRate(mac_address_from="A", mac_address_to="B", tx_rate=400, rx_rate=300),
+            DataRate(mac_address_from="B", mac_address_to="C", tx_rate=500, rx_rate=500),
+            DataRate(mac_address_from="A", mac_address_to="C", tx_rate=50, rx_rate=0),
+        ],
+    )
+
+
+class TestRateMatrix:
+    """Test devolo_plc_api.plcnet_api.analytics.RateMatrix class."""
+
+    def test_from_network(self, network: LogicalNetwork):
+        """Test building the matrix."""
+        matrix = RateMatrix.from_network(network)
+        assert matrix.mac_addresses == ["A", "B", "C"]
+        assert matrix.rate("A", "B") == 400
+        assert matrix.rate("B", "A") == 300
+        assert matrix.rate("C", "A") == 0
+
+    def test_asymmetry(self, network: LogicalNetwork):
+        """Test calculating asymmetry of links."""
+        asymmetry = RateMatrix.from_network(network).asymmetry()
+        assert asymmetry["A", "B"] == pytest.approx(0.25)
+        assert asymmetry["B", "C"] == 0
+        assert asymmetry["A", "C"] == 1
+
+    def test_widest_path(self, network: LogicalNetwork):
+        """Test finding the path with the best bottleneck."""
+        matrix = RateMatrix.from_network(network)
+        assert matrix.widest_path("A", "C") == (["A", "B", "C"], 400)
+        assert matrix.widest_path("C", "A") == (["C", "B", "A"], 300)
+        assert matrix.widest_path("A", "A") == ([], 0)
+
+    def test_best_relay(self, network: LogicalNetwork):
+        """Test finding the best relay."""
+        matrix = RateMatrix.from_network(network)
+        assert matrix.best_relay("A", "C") == ("B", 400)
+        assert matrix.best_relay("B", "C") == (None, 500)
+
+
+def test_weak_links(network: LogicalNetwork):
+    """Test finding weak links across networks."""
+    assert weak_links([network, network], threshold=100) == [("A", "C", 0), ("A", "C", 0)]
+
+
+def test_anomaly_scores():
+    """Test scoring sudden drops."""
+    store = DataRateStore()
+    for timestamp, rate in enumerate((100, 100, 100, 100, 10)):
+        store.add_network(
+            LogicalNetwork(data_rates=[DataRate(mac_address_from="A", mac_address_to="B", tx_rate=rate)]), timestamp
+        )
+    store.add_network(LogicalNetwork(data_rates=[DataRate(mac_address_from="B", mac_address_to="A", tx_rate=1)]), 5)
+    scores = anomaly_scores(store, "tx_rate")
+    assert scores["A", "B"] == pytest.approx(-2.0)
+    assert ("B", "A") not in scores
@@ -0,0 +1,29 @@
+"""Test accessing the APIs of connected devices."""
+
+import pytest
+
+from devolo_plc_api import Device
+from devolo_plc_api.device_api import DeviceApi
+from devolo_plc_api.exceptions import DeviceUnavailable
+from devolo_plc_api.fleet.apis import get_device_api, get_plcnet_api
+from devolo_plc_api.plcnet_api import PlcNetApi
+
+
+class TestApis:
+    """Test devolo_plc_api.fleet.apis."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", [""])
+    async def test_get_api(self, mock_device: Device, device_api: DeviceApi, plcnet_api: PlcNetApi):
+        """Test getting the APIs of a connected device."""
+        mock_device.device = device_api
+        mock_device.plcnet = plcnet_api
+        assert get_device_api(mock_device) is device_api
+        assert get_plcnet_api(mock_device) is plcnet_api
+
+    def test_get_api_disconnected(self, mock_device: Device):
+        """Test treating a device without APIs as unavailable."""
+        with pytest.raises(DeviceUnavailable):
+            get_device_api(mock_device)
+        with pytest.raises(DeviceUnavailable):
+            get_plcnet_api(mock_device)
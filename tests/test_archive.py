@@ -0,0 +1,108 @@
+"""Test archiving support info dumps."""
+
+from __future__ import annotations
+
+from datetime import date
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import pytest
+from httpx import ConnectTimeout
+
+from devolo_plc_api.device_api import SupportInfoItem
+from devolo_plc_api.device_api.support_pb2 import SupportInfoDump, SupportInfoDumpResponse
+from devolo_plc_api.fleet import SupportArchive
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_httpx import HTTPXMock
+
+    from devolo_plc_api import Device
+    from devolo_plc_api.device_api import DeviceApi
+
+DAY = date(2024, 1, 1)
+
+
+class TestSupportArchive:
+    """Test devolo_plc_api.fleet.archive.SupportArchive class."""
+
+    @pytest.mark.parametrize("codec", ["bz2", "gzip", "lzma", "zlib"])
+    def test_add(self, tmp_path: Path, codec: str):
+        """Test deduplicating contents across devices and days."""
+        archive = SupportArchive(tmp_path, codec=codec)
+        items = [SupportInfoItem(label="configlayer", content=b"KEY=value\n" * 100)]
+        assert archive.add("1234567890123456", items, DAY)
+        assert archive.add("6543210987654321", items, DAY) == 0
+        assert archive.add("1234567890123456", [*items, SupportInfoItem(label="dmesg", content=b"")], date(2024, 1, 2))
+        assert len(list(tmp_path.glob("objects/*/*"))) == 2
+
+        reopened = SupportArchive(tmp_path)
+        assert reopened.devices == ["1234567890123456", "6543210987654321"]
+        assert reopened.days("1234567890123456") == [DAY, date(2024, 1, 2)]
+        assert reopened.labels("1234567890123456", date(2024, 1, 2)) == ["configlayer", "dmesg"]
+        assert reopened.get("6543210987654321", "configlayer", DAY) == items[0].content
+        with pytest.raises(KeyError):
+            reopened.get("6543210987654321", "dmesg", DAY)
+
+    def test_unknown_codec(self, tmp_path: Path):
+        """Test rejecting unknown codecs."""
+        with pytest.raises(ValueError, match="codec"):
+            SupportArchive(tmp_path, codec="zstd")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["support"])
+    async def test_async_collect(
+        self,
+        tmp_path: Path,
+        mock_device: Device,
+        device_api: DeviceApi,
+        httpx_mock: HTTPXMock,
+        support_item: SupportInfoItem,
+    ):
+        """Test collecting support info from devices."""
+        mock_device.serial_number = "1234567890123456"
+        mock_device.device = device_api
+        support_info = SupportInfoDumpResponse(info=SupportInfoDump(items=[support_item]))
+        httpx_mock.add_response(content=support_info.SerializeToString())
+        archive = SupportArchive(tmp_path)
+        written = await archive.async_collect([mock_device], DAY, limit=1)
+        assert written["1234567890123456"]
+        assert archive.get("1234567890123456", support_item.label, DAY) == support_item.content
+        assert not list(tmp_path.glob("*.dump"))  # noqa: ASYNC240
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["support"])
+    @pytest.mark.usefixtures("sleep")
+    async def test_async_collect_unavailable(
+        self, tmp_path: Path, mock_device: Device, device_api: DeviceApi, httpx_mock: HTTPXMock
+    ):
+        """Test skipping devices, that are unavailable."""
+        mock_device.device = device_api
+        httpx_mock.add_exception(ConnectTimeout(""), is_reusable=True)
+        archive = SupportArchive(tmp_path)
+        assert await archive.async_collect([mock_device], DAY) == {}
+        assert not list(tmp_path.glob("*.dump"))  # noqa: ASYNC240
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["support"])
+    @pytest.mark.parametrize(
+        ("status_code", "content"),
+        [(HTTPStatus.INTERNAL_SERVER_ERROR, b""), (HTTPStatus.OK, b"\x1a\x10\x0a")],
+        ids=["http_error", "truncated"],
+    )
+    async def test_async_collect_broken(  # noqa: PLR0913, PLR0917
+        self,
+        tmp_path: Path,
+        mock_device: Device,
+        device_api: DeviceApi,
+        httpx_mock: HTTPXMock,
+        status_code: HTTPStatus,
+        content: bytes,
+    ):
+        """Test skipping devices, that answer with an error or a truncated dump."""
+        mock_device.device = device_api
+        httpx_mock.add_response(status_code=status_code, content=content)
+        archive = SupportArchive(tmp_path)
+        assert await archive.async_collect([mock_device], DAY) == {}
+        assert not list(tmp_path.glob("*.dump"))  # noqa: ASYNC240
@@ -0,0 +1,47 @@
+"""Test parsing CONFIGLAYER content."""
+
+import pytest
+
+from devolo_plc_api.device_api import CONFIGLAYER_FORMAT, ConfigLayer, ConfigLayerParser, iter_configlayer
+
+CONTENT = [
+    b"",
+    b"no keys in here",
+    b"A=",
+    b"AB=1",
+    b"HEADER\nKEY.ONE=1\nKEY_TWO=multi\nline\nvalueKEY3=x=y\n",
+    b"KEY=0123456789ABCDEF0123456789ABCDEF\nNEXT=\n\n",
+    b"K=1AB=CD=EF=\n",
+]
+
+
+class TestConfigLayer:
+    """Test devolo_plc_api.device_api.configlayer."""
+
+    @pytest.mark.parametrize("content", CONTENT)
+    def test_iter_configlayer(self, content: bytes):
+        """Test getting the same result as the regular expression."""
+        expected = [(match.group(2), match.group(3)) for match in CONFIGLAYER_FORMAT.finditer(content)]
+        assert list(iter_configlayer(content)) == expected
+
+    @pytest.mark.parametrize("content", CONTENT)
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7])
+    def test_parser(self, content: bytes, chunk_size: int):
+        """Test getting the same result when parsing in chunks."""
+        parser = ConfigLayerParser()
+        pairs = []
+        for offset in range(0, len(content), chunk_size):
+            pairs += parser.feed(content[offset : offset + chunk_size])
+        pairs += parser.close()
+        assert pairs == list(iter_configlayer(content))
+
+    def test_config_layer(self):
+        """Test looking up keys."""
+        configlayer = ConfigLayer(CONTENT[4])
+        assert configlayer[b"KEY_TWO"] == b"multi\nline\nvalue"
+        assert b"KEY.ONE" in configlayer
+        assert configlayer.get(b"UNKNOWN") is None
+        assert list(configlayer) == list(iter_configlayer(CONTENT[4]))
+
+        chunked = ConfigLayer(iter([CONTENT[4][:10], CONTENT[4][10:]]))
+        assert chunked.index == configlayer.index
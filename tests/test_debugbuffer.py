@@ -0,0 +1,133 @@
+"""Test keeping recent debug events of devices."""
+
+from __future__ import annotations
+
+import logging
+import sys
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from httpx import ConnectTimeout
+
+from devolo_plc_api.device_api.ledsettings_pb2 import LedSettingsGet
+from devolo_plc_api.diagnostics import DebugBuffer
+from devolo_plc_api.exceptions import DeviceNotFound, DeviceUnavailable
+
+from . import DeviceType
+
+if TYPE_CHECKING:
+    from pytest_httpx import HTTPXMock
+
+    from devolo_plc_api import Device
+    from devolo_plc_api.device_api import DeviceApi
+
+
+class TestDebugBuffer:
+    """Test devolo_plc_api.diagnostics.debugbuffer.DebugBuffer class."""
+
+    def test_record(self):
+        """Test recording events in a bounded buffer."""
+        buffer = DebugBuffer(capacity=2)
+        buffer.record("first")
+        buffer.record("Getting from %s", "LedSettingsGet")
+        buffer.record("Retrying %s after attempt %s", "LedSettingsGet", 1)
+        assert len(buffer) == 2
+        events = buffer.events()
+        assert events[0].endswith("+00:00 Getting from LedSettingsGet")
+        assert events[1].endswith("+00:00 Retrying LedSettingsGet after attempt 1")
+
+    def test_dump_on_error(self, caplog: pytest.LogCaptureFixture):
+        """Test dumping events only on errors."""
+        logger = logging.getLogger("test")
+        buffer = DebugBuffer()
+        buffer.record("Getting from %s", "LedSettingsGet")
+        with buffer.dump_on_error(logger):
+            pass
+        assert not caplog.records
+
+        with pytest.raises(DeviceUnavailable), buffer.dump_on_error(logger):
+            raise DeviceUnavailable
+        (record,) = caplog.records
+        assert record.levelno == logging.WARNING
+        assert "Recent events before DeviceUnavailable(" in record.getMessage()
+        assert "Getting from LedSettingsGet" in record.getMessage()
+        assert not buffer
+
+        buffer.dump(logger, "nothing")
+        assert len(caplog.records) == 1
+
+    def test_dump_on_error_limited(self, caplog: pytest.LogCaptureFixture):
+        """Test dumping only the outermost operation and not more often than the dump interval."""
+        logger = logging.getLogger("test")
+        buffer = DebugBuffer()
+        buffer.record("Connecting")
+        with pytest.raises(DeviceUnavailable), buffer.dump_on_error(logger), buffer.dump_on_error(logger):
+            raise DeviceUnavailable
+        assert len(caplog.records) == 1
+
+        buffer.record("Getting from %s", "UptimeGet")
+        with pytest.raises(DeviceUnavailable), buffer.dump_on_error(logger):
+            raise DeviceUnavailable
+        assert len(caplog.records) == 1
+        assert buffer
+
+        buffer = DebugBuffer(dump_interval=0)
+        for _ in range(2):
+            buffer.record("Getting from %s", "UptimeGet")
+            with pytest.raises(DeviceUnavailable), buffer.dump_on_error(logger):
+                raise DeviceUnavailable
+        assert len(caplog.records) == 3
+
+
+@pytest.mark.skipif(sys.version_info < (3, 9), reason="Tests with httpx_mock need at least Python 3.9")
+class TestDeviceDebugEvents:
+    """Test recording debug events of devices."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["led"])
+    async def test_request(self, device_api: DeviceApi, httpx_mock: HTTPXMock, caplog: pytest.LogCaptureFixture):
+        """Test recording requests without dumping them."""
+        httpx_mock.add_response(content=LedSettingsGet(state=LedSettingsGet.LED_ON).SerializeToString())
+        with caplog.at_level(logging.WARNING):
+            await device_api.async_get_led_setting()
+        assert not caplog.records
+        assert device_api._debug_buffer.events()[0].endswith("Getting from LedSettingsGet")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["led"])
+    async def test_retries(self, device_api: DeviceApi, httpx_mock: HTTPXMock, caplog: pytest.LogCaptureFixture):
+        """Test dumping retries of a failed request."""
+        httpx_mock.add_exception(ConnectTimeout("timed out"), is_reusable=True)
+        with caplog.at_level(logging.WARNING), pytest.raises(DeviceUnavailable), patch("asyncio.sleep"):
+            await device_api.async_get_led_setting()
+        (record,) = caplog.records
+        message = record.getMessage()
+        assert "GET LedSettingsGet failed: ConnectTimeout('timed out')" in message
+        assert "Retrying LedSettingsGet after attempt 2" in message
+        assert not device_api._debug_buffer
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("device_type", [DeviceType.PLC])
+    @pytest.mark.usefixtures("block_communication", "service_browser")
+    async def test_connect(self, mock_device: Device):
+        """Test sharing the buffer between a device and its APIs."""
+        await mock_device.async_connect()
+        assert mock_device.device
+        assert mock_device.device._debug_buffer is mock_device._debug_buffer
+        events = mock_device.debug_events()
+        assert "Browsing for" in events[0]
+        assert "via unicast" in events[0]
+        assert any("Updating service info" in event for event in events)
+        await mock_device.async_disconnect()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("device_type", [DeviceType.PLC])
+    @pytest.mark.usefixtures("service_browser", "sleep")
+    async def test_connect_not_found(self, mock_device: Device, caplog: pytest.LogCaptureFixture):
+        """Test dumping mDNS decisions, if a device is not found."""
+        with caplog.at_level(logging.WARNING), pytest.raises(DeviceNotFound):
+            await mock_device.async_connect()
+        message = "\n".join(record.getMessage() for record in caplog.records)
+        assert "No answer via unicast, switching to multicast" in message
+        assert "via multicast" in message
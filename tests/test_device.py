@@ -1,5 +1,7 @@
 """Test communicating with a devolo device."""
 
+import asyncio
+from socket import inet_aton
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
@@ -7,13 +9,23 @@ from syrupy.assertion import SnapshotAssertion
 from zeroconf import ServiceStateChange
 
 from devolo_plc_api.device import Device
-from devolo_plc_api.exceptions import DeviceNotFound
-from devolo_plc_api.plcnet_api import SERVICE_TYPE as PLCNETAPI
+from devolo_plc_api.device_api import SERVICE_TYPE as DEVICEAPI, WifiGuestAccessGet
+from devolo_plc_api.exceptions import DeviceNotFound, DeviceUnavailable, FeatureNotSupported
+from devolo_plc_api.plcnet_api import SERVICE_TYPE as PLCNETAPI, Device as PlcDevice, LogicalNetwork
 
 from . import DeviceType, TestData
 from .mocks.zeroconf import MockAsyncServiceInfo
 
 
+class MemberServiceInfo(MockAsyncServiceInfo):
+    """Service info of a PLC network member answering via unicast mDNS."""
+
+    def __init__(self, service_type: str, name: str) -> None:
+        """Initialize the service info with the address of the member."""
+        super().__init__(service_type, name)
+        self.addresses = [inet_aton("192.0.2.2")]
+
+
 @pytest.mark.usefixtures("block_communication")
 class TestDevice:
     """Test devolo_plc_api.device.Device class."""
@@ -49,6 +61,36 @@ class TestDevice:
         assert mock_device == snapshot
         await mock_device.async_disconnect()
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("device_type", [DeviceType.PLC])
+    @pytest.mark.usefixtures("service_browser")
+    async def test_async_batch(self, mock_device: Device):
+        """Test calling multiple endpoints with partial results."""
+        await mock_device.async_connect()
+        assert mock_device.device
+        assert mock_device.plcnet
+        guest_wifi = WifiGuestAccessGet(enabled=True)
+        with (
+            patch.object(mock_device.device, "async_get_wifi_guest_access", AsyncMock(return_value=guest_wifi)),
+            patch.object(mock_device.plcnet, "async_get_network_overview", AsyncMock(side_effect=DeviceUnavailable)),
+        ):
+            result = await mock_device.async_batch(
+                ["get_wifi_guest_access", "get_led_setting", "get_network_overview", "set_wifi_guest_access", "unknown"]
+            )
+        assert "get_wifi_guest_access" in result
+        assert result["get_wifi_guest_access"] == guest_wifi
+        assert isinstance(result.errors["get_led_setting"], FeatureNotSupported)
+        assert isinstance(result.errors["get_network_overview"], DeviceUnavailable)
+        assert isinstance(result.errors["set_wifi_guest_access"], TypeError)
+        assert isinstance(result.errors["unknown"], AttributeError)
+        with pytest.raises(DeviceUnavailable):
+            result["get_network_overview"]
+
+        with patch.object(mock_device.device, "async_get_wifi_guest_access", AsyncMock(side_effect=asyncio.Event().wait)):
+            result = await mock_device.async_batch(["get_wifi_guest_access"], timeout=0.01)
+        assert isinstance(result.errors["get_wifi_guest_access"], asyncio.TimeoutError)
+        await mock_device.async_disconnect()
+
     @pytest.mark.asyncio
     async def test_sync_connect_multicast(self, test_data: TestData):
         """Test that devices having trouble with unicast zeroconf are queried twice."""
@@ -146,3 +188,58 @@ class TestDevice:
             await mock_device.async_connect()
             assert MockAsyncServiceInfo.async_request.call_count == 1
             assert mock_info_from_service.call_count == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("device_type", [DeviceType.PLC])
+    @pytest.mark.usefixtures("service_browser")
+    async def test_async_get_plcnet_members(self, mock_device: Device, test_data: TestData):
+        """Test creating devices from the network overview and skipping members with unknown serial number."""
+        await mock_device.async_connect()
+        assert mock_device.plcnet
+        network = LogicalNetwork(
+            devices=[
+                PlcDevice(mac_address="AABBCCDDEEFF", ipv4_address="192.0.2.1", product_id="MT3046", full_version="1.0"),
+                PlcDevice(mac_address="112233445566", ipv4_address="192.0.2.2", product_id="MT3046", full_version="1.0"),
+                PlcDevice(mac_address="665544332211", ipv4_address="192.0.2.3", product_id="MT3046", full_version="2.0"),
+                PlcDevice(mac_address="223344556677", ipv4_address="192.0.2.4", product_id="MT3046", full_version="2.0"),
+                PlcDevice(mac_address="000000000000", product_id="MT3046", full_version="1.0"),
+                PlcDevice(mac_address="334455667788", ipv4_address="192.0.2.5", product_id="MT3046", full_version="1.0"),
+            ]
+        )
+        with (
+            patch.object(mock_device.plcnet, "async_get_network_overview", new=AsyncMock(return_value=network)),
+            patch("devolo_plc_api.device.Device._port_open", new=AsyncMock(return_value=True)),
+            patch("devolo_plc_api.device.AsyncServiceInfo", MemberServiceInfo),
+            patch.object(Device, "MDNS_TIMEOUT", 10),
+            patch(
+                "devolo_plc_api.device.Device.async_connect",
+                side_effect=[DeviceNotFound("192.0.2.3"), OSError("No route to host")],
+            ) as connect,
+        ):
+            members = await mock_device.async_get_plcnet_members()
+            assert connect.call_count == 2
+        assert list(members) == ["112233445566"]
+        member = members["112233445566"]
+        assert member._connected
+        assert member.ip == "192.0.2.2"
+        assert member.serial_number == test_data.device_info[DEVICEAPI].properties["SN"]
+        assert member.mt_number == "3046"
+        assert member.device
+        assert member.device.url == mock_device.device.url.replace("192.0.2.1", "192.0.2.2")  # type: ignore[union-attr]
+        assert member.plcnet
+        assert member.plcnet._mac == "112233445566"
+        assert member._session is mock_device._session
+        await member.async_disconnect()
+        await mock_device.async_disconnect()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("device_type", [DeviceType.PLC])
+    @pytest.mark.usefixtures("service_browser")
+    async def test_member_info(self, mock_device: Device):
+        """Test deriving mDNS information of members without inventing a serial number."""
+        await mock_device.async_connect()
+        member = PlcDevice(mac_address="112233445566", ipv4_address="192.0.2.2", product_id="MT3046", full_version="5.6.0")
+        properties = mock_device._member_info(DEVICEAPI, member).properties
+        assert properties["FirmwareVersion"] == "5.6.0"
+        assert "SN" not in properties
+        await mock_device.async_disconnect()
@@ -4,12 +4,14 @@ from __future__ import annotations
 
 import sys
 from http import HTTPStatus
+from io import SEEK_END, BytesIO
 from typing import TYPE_CHECKING
 from unittest.mock import patch
 
 import pytest
 from httpx import ConnectTimeout
 
+from devolo_plc_api.device_api import SupportInfoFile
 from devolo_plc_api.device_api.factoryreset_pb2 import FactoryResetStart
 from devolo_plc_api.device_api.ledsettings_pb2 import LedSettingsGet, LedSettingsSetResponse
 from devolo_plc_api.device_api.multiap_pb2 import WifiMultiApGetResponse
@@ -31,6 +33,8 @@ from devolo_plc_api.exceptions import DevicePasswordProtected, DeviceUnavailable
 from . import DeviceType
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from pytest_httpx import HTTPXMock
 
     from devolo_plc_api import Device
@@ -214,6 +218,46 @@ class TestDeviceApi:
         httpx_mock.add_response(content=support_info.SerializeToString())
         assert device_api.get_support_info() == support_info.info
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["support"])
+    async def test_async_download_support_info(
+        self, device_api: DeviceApi, httpx_mock: HTTPXMock, support_item: SupportInfoItem, tmp_path: Path
+    ):
+        """Test streaming a device's support information into a file asynchronously."""
+        support_info = SupportInfoDumpResponse(info=SupportInfoDump(items=[support_item]))
+        httpx_mock.add_response(content=support_info.SerializeToString(), is_reusable=True)
+        assert await device_api.async_download_support_info(tmp_path / "dump") == support_info.ByteSize()
+        with SupportInfoFile(tmp_path / "dump") as dump:
+            assert list(dump.items()) == [support_item]
+
+        buffer = BytesIO(b"old content")
+        buffer.seek(0, SEEK_END)
+        await device_api.async_download_support_info(buffer)
+        assert buffer.getvalue() == b"old content" + support_info.SerializeToString()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["support"])
+    async def test_async_download_support_info_unseekable(self, device_api: DeviceApi, httpx_mock: HTTPXMock):
+        """Test not retrying a download into a writer, that cannot take back a partial body."""
+
+        class Unseekable(BytesIO):
+            def seekable(self) -> bool:
+                return False
+
+        httpx_mock.add_exception(ConnectTimeout(""), is_reusable=True)
+        with pytest.raises(DeviceUnavailable), patch("asyncio.sleep"):
+            await device_api.async_download_support_info(Unseekable())
+        assert len(httpx_mock.get_requests()) == 1
+
+    @pytest.mark.parametrize("feature", ["support"])
+    def test_download_support_info(
+        self, device_api: DeviceApi, httpx_mock: HTTPXMock, support_item: SupportInfoItem, tmp_path: Path
+    ):
+        """Test streaming a device's support information into a file synchronously."""
+        support_info = SupportInfoDumpResponse(info=SupportInfoDump(items=[support_item]))
+        httpx_mock.add_response(content=support_info.SerializeToString())
+        assert device_api.download_support_info(str(tmp_path / "dump")) == support_info.ByteSize()
+
     @pytest.mark.asyncio
     @pytest.mark.parametrize("feature", ["update"])
     async def test_async_check_firmware_available(
@@ -0,0 +1,77 @@
+"""Test detecting changes in PLC network overviews."""
+
+from devolo_plc_api.plcnet_api import (
+    DataRate,
+    DataRateChanged,
+    Device,
+    DeviceAdded,
+    DeviceChanged,
+    DeviceRemoved,
+    LogicalNetwork,
+    NetworkDiff,
+)
+
+
+def _network(version: str = "1.0", tx_rate: float = 100.0, *, remote: bool = True) -> LogicalNetwork:
+    """Build a small PLC network."""
+    devices = [Device(mac_address="AABBCCDDEEFF", full_version="1.0")]
+    data_rates = []
+    if remote:
+        devices.append(Device(mac_address="112233445566", full_version=version, bridged_devices=["001122334455"]))
+        data_rates.append(
+            DataRate(mac_address_from="AABBCCDDEEFF", mac_address_to="112233445566", tx_rate=tx_rate, rx_rate=50)
+        )
+    return LogicalNetwork(devices=devices, data_rates=data_rates)
+
+
+class TestNetworkDiff:
+    """Test devolo_plc_api.plcnet_api.diff.NetworkDiff class."""
+
+    def test_first_snapshot(self):
+        """Test reporting everything as new on the first snapshot."""
+        diff = NetworkDiff()
+        events = diff.update("net", _network())
+        assert "net" in diff
+        assert [event.mac_address for event in events if isinstance(event, DeviceAdded)] == ["AABBCCDDEEFF", "112233445566"]
+        assert len([event for event in events if isinstance(event, DataRateChanged)]) == 2
+
+    def test_no_changes(self):
+        """Test reporting nothing if nothing changed."""
+        diff = NetworkDiff()
+        diff.update("net", _network())
+        assert diff.update("net", _network(tx_rate=105.0)) == []
+
+    def test_changes(self):
+        """Test reporting attribute and data rate changes."""
+        diff = NetworkDiff(threshold=0.1)
+        diff.update("net", _network())
+        events = diff.update("net", _network(version="2.0", tx_rate=120.0))
+        assert DeviceChanged(mac_address="112233445566", attribute="full_version", old="1.0", new="2.0") in events
+        assert DataRateChanged("AABBCCDDEEFF", "112233445566", attribute="tx_rate", old=100.0, new=120.0) in events
+        assert len(events) == 2
+
+    def test_drift(self):
+        """Test reporting a data rate, that drifts slowly, once it moved beyond the threshold since the last report."""
+        diff = NetworkDiff(threshold=0.1)
+        diff.update("net", _network())
+        assert diff.update("net", _network(tx_rate=105.0)) == []
+        assert diff.update("net", _network(tx_rate=110.0)) == []
+        events = diff.update("net", _network(tx_rate=115.5))
+        assert events == [DataRateChanged("AABBCCDDEEFF", "112233445566", attribute="tx_rate", old=100.0, new=115.5)]
+        assert diff.update("net", _network(tx_rate=120.0)) == []
+
+    def test_removed(self):
+        """Test reporting devices and data rates leaving the network."""
+        diff = NetworkDiff()
+        diff.update("net", _network())
+        events = diff.update("net", _network(remote=False))
+        assert DeviceRemoved(mac_address="112233445566") in events
+        assert DataRateChanged("AABBCCDDEEFF", "112233445566", attribute="rx_rate", old=50.0, new=None) in events
+
+    def test_forget(self):
+        """Test forgetting a network."""
+        diff = NetworkDiff()
+        diff.update("net", _network())
+        diff.forget("net")
+        assert "net" not in diff
+        assert len(diff.update("net", _network())) == 4
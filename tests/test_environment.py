@@ -0,0 +1,46 @@
+"""Test indexing the wifi environment."""
+
+from devolo_plc_api.device_api import WIFI_BAND_2G, WIFI_BAND_5G, NeighborAPInfo
+from devolo_plc_api.fleet import NeighborScan, WifiEnvironment
+
+
+def _ap(mac_address: str, channel: int, signal: int, band: int = WIFI_BAND_2G) -> NeighborAPInfo:
+    """Create a neighbor access point."""
+    return NeighborAPInfo(mac_address=mac_address, ssid="devolo", band=band, channel=channel, signal=signal)
+
+
+class TestWifiEnvironment:
+    """Test devolo_plc_api.fleet.environment.WifiEnvironment class."""
+
+    def test_add(self):
+        """Test querying observations of multiple devices."""
+        environment = WifiEnvironment()
+        environment.add(NeighborScan("1", 10, [_ap("aa:bb:cc:00:00:01", 1, -40), _ap("aa:bb:cc:00:00:02", 6, -70)]), "1st")
+        environment.add(NeighborScan("2", 10, [_ap("aa:bb:cc:00:00:01", 1, -60), _ap("aa:bb:cc:00:00:03", 1, -50)]), "2nd")
+        environment.add(NeighborScan("3", 10, [_ap("aa:bb:cc:00:00:04", 36, -50, WIFI_BAND_5G)]), "2nd")
+        assert len(environment) == 5
+        assert environment.nbytes > 0
+        assert environment.observers("AABBCC000001") == [("1", -40), ("2", -60)]
+        assert environment.observers("AABBCC000009") == []
+        assert environment.neighbors("2") == [("AABBCC000003", -50), ("AABBCC000001", -60)]
+        assert environment.ssid("aa:bb:cc:00:00:02") == "devolo"
+        assert environment.busiest_channels(WIFI_BAND_2G) == [(1, 2), (6, 1)]
+        assert environment.busiest_channels(WIFI_BAND_2G, "1st") == [(1, 1), (6, 1)]
+        assert environment.busiest_channels(WIFI_BAND_5G, "2nd") == [(36, 1)]
+
+        environment.add(NeighborScan("1", 20, [_ap("aa:bb:cc:00:00:02", 11, -65)]), "1st")
+        assert len(environment) == 4
+        assert environment.observers("AABBCC000001") == [("2", -60)]
+        assert environment.busiest_channels(WIFI_BAND_2G, "1st") == [(11, 1)]
+
+    def test_expire(self):
+        """Test forgetting old observations."""
+        environment = WifiEnvironment()
+        environment.add(NeighborScan("1", 10, [_ap("aa:bb:cc:00:00:01", 1, -40)]))
+        environment.add(NeighborScan("2", 20, [_ap("aa:bb:cc:00:00:01", 1, -50), _ap("aa:bb:cc:00:00:02", 6, -60)]))
+        assert environment.expire(15) == 1
+        assert environment.observers("AABBCC000001") == [("2", -50)]
+        assert environment.neighbors("1") == []
+        assert environment.neighbors("2") == [("AABBCC000001", -50), ("AABBCC000002", -60)]
+        assert environment.expire(25) == 2
+        assert environment.busiest_channels(WIFI_BAND_2G) == []
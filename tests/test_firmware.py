@@ -0,0 +1,118 @@
+"""Test sharing firmware checks."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from devolo_plc_api import Device
+from devolo_plc_api.device_api import SERVICE_TYPE, UPDATE_AVAILABLE, DeviceApi, UpdateFirmwareCheck
+from devolo_plc_api.exceptions import DeviceUnavailable
+from devolo_plc_api.fleet import FirmwareCache
+
+if TYPE_CHECKING:
+    from tests import TestData
+
+
+def _device(test_data: TestData, device_api: DeviceApi, firmware_version: str) -> Device:
+    """Create a device, that delays firmware checks."""
+    device = Device(test_data.ip)
+    device.mt_number = "2730"
+    device._info[SERVICE_TYPE].properties["FirmwareVersion"] = firmware_version
+    device.device = device_api
+    return device
+
+
+@pytest.mark.parametrize("feature", ["update"])
+class TestFirmwareCache:
+    """Test devolo_plc_api.fleet.firmware.FirmwareCache class."""
+
+    @pytest.mark.asyncio
+    async def test_async_check_firmware_available(self, test_data: TestData, device_api: DeviceApi):
+        """Test asking a single device for all devices of the same kind."""
+        firmware = UpdateFirmwareCheck(result=UPDATE_AVAILABLE, new_firmware_version="5.1.0")
+
+        async def check() -> UpdateFirmwareCheck:
+            await asyncio.sleep(0)
+            return firmware
+
+        with patch.object(device_api, "async_check_firmware_available", AsyncMock(side_effect=check)) as mock:
+            cache = FirmwareCache()
+            devices = [_device(test_data, device_api, "5.0.0") for _ in range(3)]
+            results = await asyncio.gather(*(cache.async_check_firmware_available(device) for device in devices))
+            assert results == [firmware] * 3
+            assert await cache.async_check_firmware_available(devices[0]) == firmware
+            assert mock.call_count == 1
+
+            await cache.async_check_firmware_available(_device(test_data, device_api, "5.1.0"))
+            assert mock.call_count == 2
+            assert len(cache) == 2
+
+            cache.clear()
+            await cache.async_check_firmware_available(devices[0])
+            assert mock.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_spot_check(self, test_data: TestData, device_api: DeviceApi):
+        """Test asking devices despite cached results."""
+        with patch.object(device_api, "async_check_firmware_available", AsyncMock()) as mock:
+            cache = FirmwareCache(spot_check=1)
+            device = _device(test_data, device_api, "5.0.0")
+            await cache.async_check_firmware_available(device)
+            await cache.async_check_firmware_available(device)
+            assert mock.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_check(self, test_data: TestData, device_api: DeviceApi):
+        """Test asking the next device, if the asked one is unavailable."""
+        firmware = UpdateFirmwareCheck(result=UPDATE_AVAILABLE)
+        results = iter([DeviceUnavailable(), firmware])
+
+        async def check() -> UpdateFirmwareCheck:
+            await asyncio.sleep(0)
+            if isinstance(result := next(results), Exception):
+                raise result
+            return result
+
+        with patch.object(device_api, "async_check_firmware_available", AsyncMock(side_effect=check)):
+            cache = FirmwareCache()
+            devices = [_device(test_data, device_api, "5.0.0") for _ in range(2)]
+            results_ = await asyncio.gather(
+                *(cache.async_check_firmware_available(device) for device in devices), return_exceptions=True
+            )
+            assert isinstance(results_[0], DeviceUnavailable)
+            assert results_[1] == firmware
+
+    @pytest.mark.asyncio
+    async def test_failed_check_single_leader(self, test_data: TestData, device_api: DeviceApi):
+        """Test asking only one new device, if the asked one is unavailable."""
+        firmware = UpdateFirmwareCheck(result=UPDATE_AVAILABLE)
+        results = iter([DeviceUnavailable(), firmware])
+
+        async def check() -> UpdateFirmwareCheck:
+            await asyncio.sleep(0)
+            if isinstance(result := next(results), Exception):
+                raise result
+            return result
+
+        with patch.object(device_api, "async_check_firmware_available", AsyncMock(side_effect=check)) as mock:
+            cache = FirmwareCache()
+            devices = [_device(test_data, device_api, "5.0.0") for _ in range(4)]
+            results_ = await asyncio.gather(
+                *(cache.async_check_firmware_available(device) for device in devices), return_exceptions=True
+            )
+            assert isinstance(results_[0], DeviceUnavailable)
+            assert results_[1:] == [firmware] * 3
+            assert mock.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_expiry(self, test_data: TestData, device_api: DeviceApi):
+        """Test dropping expired results, when a new one is stored."""
+        with patch.object(device_api, "async_check_firmware_available", AsyncMock()):
+            cache = FirmwareCache(ttl=0)
+            await cache.async_check_firmware_available(_device(test_data, device_api, "5.0.0"))
+            await cache.async_check_firmware_available(_device(test_data, device_api, "5.1.0"))
+            assert len(cache) == 1
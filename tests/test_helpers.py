@@ -1,9 +1,11 @@
 """Test helper methods."""
 
+import pytest
 from syrupy.assertion import SnapshotAssertion
 
-from devolo_plc_api import wifi_qr_code
+from devolo_plc_api import async_wifi_qr_code, async_wifi_qr_codes, wifi_qr_code
 from devolo_plc_api.device_api.wifinetwork_pb2 import WPA_2, WifiGuestAccessGet
+from devolo_plc_api.helpers import _render
 
 
 class TestHelpers:
@@ -13,3 +15,24 @@ class TestHelpers:
         """Test creating a QR code."""
         wifi_guest_access = WifiGuestAccessGet(enabled=True, ssid='"Test"', key='"Test"', wpa=WPA_2)
         assert wifi_qr_code(wifi_guest_access) == snapshot
+
+    def test_wifi_qr_code_cache(self):
+        """Test reusing rendered QR codes."""
+        _render.cache_clear()
+        wifi_guest_access = WifiGuestAccessGet(enabled=True, ssid="Cache", key="Test", wpa=WPA_2)
+        first = wifi_qr_code(wifi_guest_access, scale=2, dark="red")
+        assert wifi_qr_code(wifi_guest_access, dark="red", scale=2) is first
+        assert _render.cache_info().hits == 1
+        assert wifi_qr_code(wifi_guest_access, kind="png", dark=(0, 0, 0))
+        assert _render.cache_info().currsize == 2
+
+    @pytest.mark.asyncio
+    async def test_async_wifi_qr_code(self):
+        """Test creating QR codes asynchronously."""
+        wifi_guest_access = WifiGuestAccessGet(enabled=True, ssid='"Test"', key='"Test"', wpa=WPA_2)
+        other_wifi_guest_access = WifiGuestAccessGet(enabled=True, ssid="Other", key="Test", wpa=WPA_2)
+        assert await async_wifi_qr_code(wifi_guest_access) == wifi_qr_code(wifi_guest_access)
+        assert await async_wifi_qr_codes([wifi_guest_access, other_wifi_guest_access], kind="png") == [
+            wifi_qr_code(wifi_guest_access, kind="png"),
+            wifi_qr_code(other_wifi_guest_access, kind="png"),
+        ]
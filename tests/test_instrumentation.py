@@ -0,0 +1,138 @@
+"""Test measuring requests to devices."""
+
+from __future__ import annotations
+
+import json
+import math
+import sys
+from http import HTTPStatus
+from io import BytesIO
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from httpx import ConnectTimeout
+
+from devolo_plc_api.device_api.ledsettings_pb2 import LedSettingsGet, LedSettingsSet
+from devolo_plc_api.diagnostics import Histogram, MemoryCollector, get_instrumentation, set_instrumentation
+from devolo_plc_api.exceptions import DevicePasswordProtected, DeviceUnavailable
+
+from . import DeviceType
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from pytest_httpx import HTTPXMock
+
+    from devolo_plc_api import Device
+    from devolo_plc_api.device_api import DeviceApi
+
+    from . import TestData
+
+
+@pytest.fixture
+def collector() -> Generator[MemoryCollector, None, None]:
+    """Collect measurements in memory."""
+    collector = MemoryCollector()
+    set_instrumentation(collector)
+    yield collector
+    set_instrumentation(None)
+
+
+class TestHistogram:
+    """Test devolo_plc_api.diagnostics.instrumentation.Histogram class."""
+
+    def test_observe(self):
+        """Test counting observations in buckets."""
+        histogram = Histogram((0.1, 1.0))
+        assert math.isnan(histogram.quantile(0.5))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        assert histogram.as_dict() == {"buckets": [0.1, 1.0], "counts": [2, 1, 1], "sum": 2.65, "count": 4}
+        assert histogram.quantile(0.5) == 0.1
+        assert histogram.quantile(0.75) == 1.0
+        assert histogram.quantile(1.0) == math.inf
+
+
+@pytest.mark.skipif(sys.version_info < (3, 9), reason="Tests with httpx_mock need at least Python 3.9")
+class TestMemoryCollector:
+    """Test devolo_plc_api.diagnostics.instrumentation.MemoryCollector class."""
+
+    def test_disabled(self):
+        """Test measuring being disabled by default."""
+        assert get_instrumentation() is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["led"])
+    async def test_request(
+        self, device_api: DeviceApi, httpx_mock: HTTPXMock, collector: MemoryCollector, test_data: TestData
+    ):
+        """Test measuring a successful request."""
+        content = LedSettingsGet(state=LedSettingsGet.LED_ON).SerializeToString()
+        httpx_mock.add_response(content=content)
+        await device_api.async_get_led_setting()
+        httpx_mock.add_response(status_code=HTTPStatus.INTERNAL_SERVER_ERROR)
+        with pytest.raises(Exception, match="500"):
+            await device_api.async_set_led_setting(enable=True)
+
+        snapshot = collector.snapshot()
+        assert snapshot["requests"] == {test_data.ip: {"LedSettingsGet": {"200": 1}, "LedSettingsSet": {"500": 1}}}
+        assert snapshot["endpoint_latency"]["LedSettingsGet"]["count"] == 1
+        assert snapshot["device_latency"][test_data.ip]["count"] == 2
+        assert snapshot["bytes_received"] == {test_data.ip: len(content)}
+        assert snapshot["bytes_sent"] == {test_data.ip: len(LedSettingsSet(state=LedSettingsSet.LED_ON).SerializeToString())}
+        assert snapshot["in_flight"] == {}
+        assert json.loads(collector.export()) == snapshot
+
+        collector.reset()
+        assert collector.snapshot()["requests"] == {}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["support"])
+    async def test_stream(self, device_api: DeviceApi, httpx_mock: HTTPXMock, collector: MemoryCollector, test_data: TestData):
+        """Test measuring a streamed request."""
+        httpx_mock.add_response(content=b"dump")
+        await device_api.async_download_support_info(BytesIO())
+        snapshot = collector.snapshot()
+        assert snapshot["requests"] == {test_data.ip: {"SupportInfoDump": {"200": 1}}}
+        assert snapshot["bytes_received"] == {test_data.ip: 4}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["led"])
+    @pytest.mark.httpx_mock(can_send_already_matched_responses=True)
+    async def test_password_hashed(
+        self, device_api: DeviceApi, httpx_mock: HTTPXMock, collector: MemoryCollector, test_data: TestData
+    ):
+        """Test counting fallbacks to the hashed password."""
+        httpx_mock.add_response(status_code=HTTPStatus.UNAUTHORIZED)
+        device_api.password = "password"
+        with pytest.raises(DevicePasswordProtected):
+            await device_api.async_get_led_setting()
+        snapshot = collector.snapshot()
+        assert snapshot["password_hashed"] == {test_data.ip: 1}
+        assert snapshot["requests"] == {test_data.ip: {"LedSettingsGet": {"401": 1}}}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["led"])
+    async def test_retries(
+        self, device_api: DeviceApi, httpx_mock: HTTPXMock, collector: MemoryCollector, test_data: TestData
+    ):
+        """Test counting retries of unavailable devices."""
+        httpx_mock.add_exception(ConnectTimeout(""), is_reusable=True)
+        with pytest.raises(DeviceUnavailable), patch("asyncio.sleep"):
+            await device_api.async_get_led_setting()
+        snapshot = collector.snapshot()
+        assert snapshot["retries"] == {test_data.ip: {"LedSettingsGet": 2}}
+        assert snapshot["requests"] == {test_data.ip: {"LedSettingsGet": {"ConnectTimeout": 3}}}
+        assert snapshot["in_flight"] == {}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("device_type", [DeviceType.PLC])
+    @pytest.mark.usefixtures("block_communication", "service_browser")
+    async def test_mdns(self, mock_device: Device, collector: MemoryCollector, test_data: TestData):
+        """Test measuring mDNS resolution."""
+        await mock_device.async_connect()
+        await mock_device.async_disconnect()
+        snapshot = collector.snapshot()
+        assert snapshot["mdns_latency"][test_data.ip]["count"] == 1
+        assert snapshot["mdns_failures"] == {}
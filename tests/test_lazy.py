@@ -0,0 +1,32 @@
+"""Test loading submodules lazily."""
+
+import subprocess
+import sys
+
+import pytest
+
+import devolo_plc_api
+from devolo_plc_api import device_api, plcnet_api
+
+
+class TestLazy:
+    """Test devolo_plc_api.lazy.lazy_getattr function."""
+
+    @pytest.mark.parametrize("module", ["devolo_plc_api", "devolo_plc_api.device_api", "devolo_plc_api.plcnet_api"])
+    def test_no_heavy_imports(self, module: str):
+        """Test that importing the package does not import third party dependencies."""
+        code = f"import sys, {module}; print(sorted({{'httpx', 'zeroconf', 'segno', 'google.protobuf'}} & set(sys.modules)))"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True, text=True)
+        assert result.stdout.strip() == "[]"
+
+    def test_public_names(self):
+        """Test that all public names can be resolved."""
+        for module in (devolo_plc_api, device_api, plcnet_api):
+            for name in module.__all__:
+                assert getattr(module, name) is not None
+                assert name in dir(module)
+
+    def test_unknown_attribute(self):
+        """Test raising on unknown attributes."""
+        with pytest.raises(AttributeError):
+            device_api.Unknown  # noqa: B018
@@ -0,0 +1,41 @@
+"""Test limiting concurrent requests."""
+
+import asyncio
+
+import pytest
+
+from devolo_plc_api.clients import RequestLimiter
+
+
+class TestRequestLimiter:
+    """Test devolo_plc_api.clients.limiter.RequestLimiter class."""
+
+    @pytest.mark.asyncio
+    async def test_limit(self):
+        """Test limiting concurrent requests."""
+        limiter = RequestLimiter(2)
+        running = []
+
+        async def request() -> int:
+            async with limiter:
+                running.append(1)
+                await asyncio.sleep(0)
+                concurrent = len(running)
+                running.pop()
+                return concurrent
+
+        assert max(await asyncio.gather(*(request() for _ in range(5)))) == 2
+
+    def test_event_loops(self):
+        """Test using a limiter in multiple event loops."""
+        limiter = RequestLimiter(1)
+
+        async def requests() -> None:
+            async def request() -> None:
+                async with limiter:
+                    await asyncio.sleep(0)
+
+            await asyncio.gather(request(), request())
+
+        asyncio.run(requests())
+        asyncio.run(requests())
@@ -0,0 +1,119 @@
+"""Test detecting reboots and standby."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from devolo_plc_api.exceptions import DeviceUnavailable
+from devolo_plc_api.fleet import LivenessEvent, LivenessMonitor
+from devolo_plc_api.fleet.liveness import ONLINE, REBOOTED, STANDBY
+
+if TYPE_CHECKING:
+    from devolo_plc_api import Device
+    from devolo_plc_api.device_api import DeviceApi
+
+SERIAL_NUMBER = "1234567890123456"
+
+
+class TestLivenessMonitor:
+    """Test devolo_plc_api.fleet.liveness.LivenessMonitor class."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["restart"])
+    async def test_async_check(self, mock_device: Device, device_api: DeviceApi):
+        """Test detecting a reboot via standby."""
+        mock_device.serial_number = SERIAL_NUMBER
+        mock_device.device = device_api
+        monitor = LivenessMonitor(grace_period=60, standby_interval=300)
+        uptimes = [100, 200, DeviceUnavailable(), 10, 20, 30]
+        with patch.object(device_api, "async_uptime", AsyncMock(side_effect=uptimes)) as uptime:
+            assert await monitor.async_check([mock_device], now=0) == []
+            assert monitor.state(SERIAL_NUMBER) == ONLINE
+            assert await monitor.async_check([mock_device], now=30) == []
+
+            assert await monitor.async_check([mock_device], now=60) == [LivenessEvent(SERIAL_NUMBER, STANDBY, 60)]
+            assert not monitor.is_available(SERIAL_NUMBER, now=60)
+            assert await monitor.async_check([mock_device], now=90) == []
+            assert uptime.call_count == 3
+
+            assert await monitor.async_check([mock_device], now=360) == [LivenessEvent(SERIAL_NUMBER, REBOOTED, 360)]
+            assert not monitor.is_available(SERIAL_NUMBER, now=390)
+            assert await monitor.async_check([mock_device], now=390) == []
+            assert monitor.is_available(SERIAL_NUMBER, now=420)
+            assert await monitor.async_check([mock_device], now=420) == [LivenessEvent(SERIAL_NUMBER, ONLINE, 420)]
+        assert len(monitor) == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["restart"])
+    async def test_async_check_long_interval(self, mock_device: Device, device_api: DeviceApi):
+        """Test detecting a reboot, if the counter advanced less than its measured rate predicts."""
+        mock_device.serial_number = SERIAL_NUMBER
+        mock_device.device = device_api
+        monitor = LivenessMonitor()
+        with patch.object(device_api, "async_uptime", AsyncMock(side_effect=[100, 130, 250])):
+            assert await monitor.async_check([mock_device], now=0) == []
+            assert await monitor.async_check([mock_device], now=30) == []
+            assert await monitor.async_check([mock_device], now=430) == [LivenessEvent(SERIAL_NUMBER, REBOOTED, 430)]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["restart"])
+    async def test_async_check_slow_counter(self, mock_device: Device, device_api: DeviceApi):
+        """Test measuring the rate of a counter, that does not count seconds."""
+        mock_device.serial_number = SERIAL_NUMBER
+        mock_device.device = device_api
+        monitor = LivenessMonitor()
+        uptimes = [0, 1, DeviceUnavailable(), 6, 11, 20]
+        with patch.object(device_api, "async_uptime", AsyncMock(side_effect=uptimes)):
+            assert await monitor.async_check([mock_device], now=0) == []
+            assert await monitor.async_check([mock_device], now=60) == []
+            assert await monitor.async_check([mock_device], now=90) == [LivenessEvent(SERIAL_NUMBER, STANDBY, 90)]
+            assert await monitor.async_check([mock_device], now=390) == [LivenessEvent(SERIAL_NUMBER, ONLINE, 390)]
+            assert await monitor.async_check([mock_device], now=690) == []
+            assert await monitor.async_check([mock_device], now=4000) == [LivenessEvent(SERIAL_NUMBER, REBOOTED, 4000)]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["restart"])
+    async def test_async_check_probe(self, mock_device: Device, device_api: DeviceApi):
+        """Test probing devices in standby with a single short request."""
+        mock_device.serial_number = SERIAL_NUMBER
+        mock_device.device = device_api
+        monitor = LivenessMonitor(probe_timeout=0.01)
+        calls = 0
+
+        async def uptime() -> int:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise DeviceUnavailable
+            await asyncio.Event().wait()
+            return 0
+
+        with patch.object(device_api, "async_uptime", uptime):
+            assert await monitor.async_check([mock_device], now=0) == [LivenessEvent(SERIAL_NUMBER, STANDBY, 0)]
+            assert await monitor.async_check([mock_device], now=300) == []
+        assert monitor.state(SERIAL_NUMBER) == STANDBY
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["restart"])
+    async def test_async_run(self, mock_device: Device, device_api: DeviceApi, sleep: AsyncMock):
+        """Test reporting changes periodically."""
+        mock_device.serial_number = SERIAL_NUMBER
+        mock_device.device = device_api
+        sleep.side_effect = [None, RuntimeError]
+        events: list[LivenessEvent] = []
+        with patch.object(device_api, "async_uptime", AsyncMock(side_effect=[100, 10])), pytest.raises(RuntimeError):
+            await LivenessMonitor().async_run([mock_device], events.append)
+        assert [event.state for event in events] == [REBOOTED]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", [""])
+    async def test_unsupported(self, mock_device: Device, device_api: DeviceApi):
+        """Test ignoring devices without uptime."""
+        mock_device.device = device_api
+        monitor = LivenessMonitor()
+        assert await monitor.async_check([mock_device]) == []
+        assert monitor.is_available(mock_device.serial_number)
@@ -0,0 +1,66 @@
+"""Test locating clients behind adapters."""
+
+from devolo_plc_api import Device
+from devolo_plc_api.device_api import WIFI_BAND_5G, WIFI_VAP_MAIN_AP, ConnectedStationInfo
+from devolo_plc_api.fleet import MacLocator
+from devolo_plc_api.plcnet_api import Device as PlcDevice, LogicalNetwork
+
+
+class TestMacLocator:
+    """Test devolo_plc_api.fleet.locator.MacLocator class."""
+
+    def test_locate(self, mock_device: Device):
+        """Test locating LAN and wifi clients."""
+        mock_device.serial_number = "1234567890123456"
+        mock_device.mac = "AABBCCDDEEFF"
+        locator = MacLocator()
+        network = LogicalNetwork(
+            devices=[PlcDevice(mac_address="AABBCCDDEEFF", ipv4_address="192.0.2.1", bridged_devices=["001122334455"])]
+        )
+        locator.add_network(network, timestamp=10)
+        station = ConnectedStationInfo(mac_address="aa:bb:cc:00:11:22", band=WIFI_BAND_5G, vap_type=WIFI_VAP_MAIN_AP)
+        locator.add_stations(mock_device, [station], timestamp=20)
+        assert len(locator) == 2
+
+        lan = locator.locate("00:11:22:33:44:55", now=30)
+        assert lan
+        assert lan.adapter.serial_number == "1234567890123456"
+        assert lan.adapter.ip == "192.0.2.1"
+        assert lan.band is None
+
+        wifi = locator.locate("AABBCC001122", now=30)
+        assert wifi
+        assert wifi.adapter is lan.adapter
+        assert wifi.band == WIFI_BAND_5G
+        assert wifi.vap_type == WIFI_VAP_MAIN_AP
+        assert wifi.last_seen == 20
+
+    def test_unknown_identity(self):
+        """Test keeping adapters apart, that have neither PLC MAC address nor serial number."""
+        locator = MacLocator()
+        for ip, mac_address in (("192.0.2.1", "000000000001"), ("192.0.2.2", "000000000002")):
+            device = Device(ip=ip)
+            locator.add_stations(device, [ConnectedStationInfo(mac_address=mac_address)], timestamp=10)
+        first = locator.locate("000000000001", now=20)
+        second = locator.locate("000000000002", now=20)
+        assert first
+        assert second
+        assert first.adapter is not second.adapter
+        assert first.adapter.ip == "192.0.2.1"
+        assert second.adapter.ip == "192.0.2.2"
+
+    def test_evict(self):
+        """Test evicting stale clients."""
+        locator = MacLocator(max_age=100)
+        for timestamp, mac_address in enumerate(("000000000001", "000000000002", "000000000003")):
+            locator.add_network(
+                LogicalNetwork(devices=[PlcDevice(mac_address="AABBCCDDEEFF", bridged_devices=[mac_address])]), timestamp
+            )
+        locator.add_network(
+            LogicalNetwork(devices=[PlcDevice(mac_address="AABBCCDDEEFF", bridged_devices=["000000000001"])]), 50
+        )
+        assert locator.evict(now=101.5) == 1
+        assert locator.locate("000000000002", now=101.5) is None
+        assert locator.locate("000000000001", now=101.5)
+        assert locator.locate("000000000003", now=200) is None
+        assert len(locator) == 1
@@ -12,9 +12,9 @@ from devolo_plc_api import Device
 from devolo_plc_api.exceptions import DevicePasswordProtected, DeviceUnavailable
 from devolo_plc_api.plcnet_api import LogicalNetwork, PlcNetApi
 from devolo_plc_api.plcnet_api.getnetworkoverview_pb2 import GetNetworkOverview
-from devolo_plc_api.plcnet_api.identifydevice_pb2 import IdentifyDeviceResponse
-from devolo_plc_api.plcnet_api.pairdevice_pb2 import PairDeviceStart
-from devolo_plc_api.plcnet_api.setuserdevicename_pb2 import SetUserDeviceNameResponse
+from devolo_plc_api.plcnet_api.identifydevice_pb2 import IdentifyDeviceResponse, IdentifyDeviceStart, IdentifyDeviceStop
+from devolo_plc_api.plcnet_api.pairdevice_pb2 import PairDeviceResponse, PairDeviceStart
+from devolo_plc_api.plcnet_api.setuserdevicename_pb2 import SetUserDeviceName, SetUserDeviceNameResponse
 
 from . import DeviceType
 
@@ -112,6 +112,40 @@ class TestPlcApi:
         httpx_mock.add_response(content=user_device_name_set.SerializeToString())
         assert plcnet_api.set_user_device_name("Test")
 
+    @pytest.mark.asyncio
+    async def test_async_identify_devices(self, plcnet_api: PlcNetApi, httpx_mock: HTTPXMock):
+        """Test identifying remote devices through a single device asynchronously."""
+        for mac_address in ("AABBCCDDEE01", "AABBCCDDEE02"):
+            for message in (IdentifyDeviceStart, IdentifyDeviceStop):
+                httpx_mock.add_response(
+                    content=IdentifyDeviceResponse().SerializeToString(),
+                    match_content=message(mac_address=mac_address).SerializeToString(),
+                )
+        mac_addresses = ["AABBCCDDEE01", "AABBCCDDEE02"]
+        assert await plcnet_api.async_identify_devices_start(mac_addresses) == dict.fromkeys(mac_addresses, True)
+        assert await plcnet_api.async_identify_devices_stop(mac_addresses) == dict.fromkeys(mac_addresses, True)
+
+    @pytest.mark.asyncio
+    async def test_async_pair_remote_device(self, plcnet_api: PlcNetApi, httpx_mock: HTTPXMock):
+        """Test pairing a remote device through another device asynchronously."""
+        httpx_mock.add_response(
+            content=PairDeviceResponse().SerializeToString(),
+            match_content=PairDeviceStart(mac_address="AABBCCDDEE01").SerializeToString(),
+        )
+        assert await plcnet_api.async_pair_device("AABBCCDDEE01")
+
+    def test_set_user_device_names(self, plcnet_api: PlcNetApi, httpx_mock: HTTPXMock):
+        """Test renaming remote devices through a single device synchronously."""
+        names = {"AABBCCDDEE01": "Office", "AABBCCDDEE02": "Hall"}
+        for mac_address, name in names.items():
+            httpx_mock.add_response(
+                content=SetUserDeviceNameResponse(
+                    result=SetUserDeviceNameResponse.SUCCESS if name == "Office" else SetUserDeviceNameResponse.MACADDR_UNKNOWN
+                ).SerializeToString(),
+                match_content=SetUserDeviceName(mac_address=mac_address, user_device_name=name).SerializeToString(),
+            )
+        assert plcnet_api.set_user_device_names(names) == {"AABBCCDDEE01": True, "AABBCCDDEE02": False}
+
     @pytest.mark.asyncio
     @pytest.mark.parametrize("device_type", [DeviceType.PLC])
     @pytest.mark.usefixtures("block_communication", "service_browser")
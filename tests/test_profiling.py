@@ -0,0 +1,97 @@
+"""Test sampling profiles of library operations."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import subprocess
+import sys
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from devolo_plc_api.device_api.ledsettings_pb2 import LedSettingsGet
+from devolo_plc_api.diagnostics import Profiler, get_profiler, profile, set_profiler
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_httpx import HTTPXMock
+
+    from devolo_plc_api.device_api import DeviceApi
+
+
+class TestProfiler:
+    """Test devolo_plc_api.diagnostics.profiling.Profiler class."""
+
+    def test_disabled(self):
+        """Test profiling being disabled by default."""
+        assert get_profiler() is None
+        assert isinstance(profile("connect"), nullcontext)
+
+    def test_profile(self, tmp_path: Path):
+        """Test aggregating samples per operation type."""
+        profiler = Profiler(tmp_path, sample_rate=1.0, interval=3600.0)
+        for _ in range(2):
+            with profiler.profile("connect"):
+                assert isinstance(profiler.profile("LedSettingsGet"), nullcontext)
+                data = [bytes(1000) for _ in range(100)]
+        assert data
+        path = profiler.report()
+        assert path
+        assert path.parent == tmp_path
+        report = path.read_text(encoding="utf-8")
+        assert "=== connect: 2 samples, peak memory" in report
+        assert "test_profiling.py" in report
+        assert "LedSettingsGet" not in report
+        assert profiler.report() is None
+
+    def test_sample_rate(self, tmp_path: Path):
+        """Test skipping operations, that are not sampled."""
+        profiler = Profiler(tmp_path, sample_rate=0.0)
+        assert isinstance(profiler.profile("connect"), nullcontext)
+
+    def test_interval(self, tmp_path: Path):
+        """Test writing reports periodically."""
+        profiler = Profiler(tmp_path / "reports", sample_rate=1.0, interval=0.0, memory=False)
+        with profiler.profile("connect"):
+            pass
+        (path,) = (tmp_path / "reports").iterdir()
+        assert "=== connect: 1 samples, peak memory 0 bytes ===" in path.read_text(encoding="utf-8")
+
+    @pytest.mark.asyncio
+    async def test_interval_event_loop(self, tmp_path: Path):
+        """Test writing periodic reports off the event loop."""
+        profiler = Profiler(tmp_path, sample_rate=1.0, interval=0.0, memory=False)
+        with patch.object(profiler, "report", wraps=profiler.report) as report:
+            with profiler.profile("connect"):
+                pass
+            assert profiler._reports
+            await asyncio.gather(*profiler._reports)
+            assert report.call_count == 1
+        assert len(list(tmp_path.iterdir())) == 1  # noqa: ASYNC240
+
+    @pytest.mark.parametrize(("rate", "expected"), [("0.5", "0.5"), ("many", "0.01")])
+    def test_environment(self, tmp_path: Path, rate: str, expected: str):
+        """Test enabling profiling via environment variables."""
+        code = "from devolo_plc_api.diagnostics import get_profiler; p = get_profiler(); print(p.directory, p.sample_rate)"
+        env = {**os.environ, "DEVOLO_PLC_API_PROFILE": str(tmp_path), "DEVOLO_PLC_API_PROFILE_RATE": rate}
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True, text=True, env=env)
+        assert result.stdout.strip() == f"{tmp_path} {expected}"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["led"])
+    async def test_request(self, device_api: DeviceApi, httpx_mock: HTTPXMock, tmp_path: Path):
+        """Test profiling API calls per endpoint."""
+        profiler = Profiler(tmp_path, sample_rate=1.0)
+        set_profiler(profiler)
+        httpx_mock.add_response(content=LedSettingsGet(state=LedSettingsGet.LED_ON).SerializeToString())
+        try:
+            await device_api.async_get_led_setting()
+        finally:
+            set_profiler(None)
+        path = profiler.report()
+        assert path
+        assert "=== LedSettingsGet: 1 samples" in path.read_text(encoding="utf-8")
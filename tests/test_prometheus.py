@@ -0,0 +1,105 @@
+"""Test exposing fleet metrics to Prometheus."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+from devolo_plc_api import BatchResult
+from devolo_plc_api.device_api import WifiGuestAccessGet
+from devolo_plc_api.diagnostics import PrometheusExporter
+from devolo_plc_api.exceptions import DeviceUnavailable
+from devolo_plc_api.plcnet_api import DataRate, LogicalNetwork
+
+if TYPE_CHECKING:
+    from devolo_plc_api.device_api import ConnectedStationInfo
+
+
+class TestPrometheusExporter:
+    """Test devolo_plc_api.diagnostics.prometheus.PrometheusExporter class."""
+
+    def test_update(self, connected_station: ConnectedStationInfo):
+        """Test rendering polling results."""
+        exporter = PrometheusExporter()
+        network = LogicalNetwork(
+            data_rates=[DataRate(mac_address_from="AABBCCDDEEFF", mac_address_to="112233445566", tx_rate=100.5, rx_rate=90)]
+        )
+        result = BatchResult(
+            values={
+                "get_network_overview": network,
+                "get_wifi_connected_station": [connected_station],
+                "get_wifi_guest_access": WifiGuestAccessGet(enabled=True),
+                "get_led_setting": False,
+                "uptime": 1234,
+            }
+        )
+        exporter.update("1234567890", result)
+        metrics = exporter.render().decode()
+        assert "# TYPE devolo_up gauge\n" in metrics
+        assert 'devolo_up{serial_number="1234567890"} 1\n' in metrics
+        assert 'devolo_uptime{serial_number="1234567890"} 1234\n' in metrics
+        assert 'devolo_led_enabled{serial_number="1234567890"} 0\n' in metrics
+        assert 'devolo_guest_wifi_enabled{serial_number="1234567890"} 1\n' in metrics
+        assert 'devolo_wifi_connected_stations{serial_number="1234567890"} 1\n' in metrics
+        assert (
+            'devolo_plc_tx_rate_mbps{serial_number="1234567890",mac_address_from="AABBCCDDEEFF",'
+            'mac_address_to="112233445566"} 100.5\n'
+        ) in metrics
+        assert 'mac_address_to="112233445566"} 90.0\n' in metrics
+
+    def test_cached(self):
+        """Test rendering only after values changed."""
+        exporter = PrometheusExporter()
+        exporter.set_value("uptime", "1234567890", 1)
+        body = exporter.render()
+        exporter.set_value("uptime", "1234567890", 1)
+        assert exporter.render() is body
+        exporter.update("1234567890", BatchResult(errors={"uptime": DeviceUnavailable()}))
+        assert exporter.render() is not body
+        assert b'devolo_up{serial_number="1234567890"} 0\n' in exporter.render()
+        assert b'devolo_uptime{serial_number="1234567890"} 1\n' in exporter.render()
+
+        exporter.remove("1234567890")
+        assert b"1234567890" not in exporter.render()
+
+    def test_escape(self):
+        """Test escaping label values."""
+        exporter = PrometheusExporter(namespace="test")
+        exporter.set_value("uptime", 'a"b\\c\nd', 1)
+        assert b'test_uptime{serial_number="a\\"b\\\\c\\nd"} 1\n' in exporter.render()
+
+    def test_request_health(self):
+        """Test exposing the request health."""
+        exporter = PrometheusExporter()
+        exporter.request_finished("192.0.2.1", "LedSettingsGet", 0.5, 0, 2, "200")
+        exporter.request_finished("192.0.2.1", "LedSettingsGet", 0.25, 0, 0, "ConnectTimeout")
+        exporter.request_retried("192.0.2.1", "LedSettingsGet")
+        metrics = exporter.render().decode()
+        assert 'devolo_requests_total{ip="192.0.2.1",outcome="200"} 1\n' in metrics
+        assert 'devolo_requests_total{ip="192.0.2.1",outcome="ConnectTimeout"} 1\n' in metrics
+        assert 'devolo_request_seconds_total{ip="192.0.2.1"} 0.75\n' in metrics
+        assert 'devolo_request_retries_total{ip="192.0.2.1"} 1\n' in metrics
+
+    @pytest.mark.asyncio
+    async def test_async_serve(self):
+        """Test serving metrics via HTTP."""
+        exporter = PrometheusExporter()
+        exporter.set_value("uptime", "1234567890", 1)
+        server = await exporter.async_serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+
+        async def get(path: str) -> bytes:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            response = await reader.read()
+            writer.close()
+            return response
+
+        response = await get("/metrics")
+        assert response.startswith(b"HTTP/1.1 200 OK\r\n")
+        assert response.endswith(exporter.render())
+        assert (await get("/")).startswith(b"HTTP/1.1 404 Not Found\r\n")
+        server.close()
+        await server.wait_closed()
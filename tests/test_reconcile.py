@@ -0,0 +1,110 @@
+"""Test reconciling device configurations."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import HTTPStatusError, Request, Response
+
+from devolo_plc_api.device_api import WifiGuestAccessGet
+from devolo_plc_api.exceptions import DeviceUnavailable
+from devolo_plc_api.fleet import DesiredState, Reconciler
+from devolo_plc_api.plcnet_api import Device as PlcDevice, LogicalNetwork
+
+if TYPE_CHECKING:
+    from devolo_plc_api import Device
+    from devolo_plc_api.device_api import DeviceApi
+    from devolo_plc_api.plcnet_api import PlcNetApi
+
+SERIAL_NUMBER = "1234567890123456"
+
+
+class TestDesiredState:
+    """Test devolo_plc_api.fleet.reconcile.DesiredState class."""
+
+    def test_merge(self):
+        """Test overriding a group state by a device state."""
+        group = DesiredState(led=False, guest_wifi=True)
+        assert group.merge(DesiredState(led=True, device_name="Office")) == DesiredState(
+            led=True, guest_wifi=True, device_name="Office"
+        )
+
+    def test_merge_group_duration(self):
+        """Test keeping the guest wifi duration of a group, if a device does not set one."""
+        group = DesiredState(guest_wifi=True, guest_wifi_duration=60)
+        assert group.merge(DesiredState()).guest_wifi_duration == 60
+        assert group.merge(DesiredState(guest_wifi_duration=0)).guest_wifi_duration == 0
+
+
+@pytest.mark.parametrize("feature", ["led,wifi1"])
+class TestReconciler:
+    """Test devolo_plc_api.fleet.reconcile.Reconciler class."""
+
+    @pytest.mark.asyncio
+    async def test_async_reconcile(self, mock_device: Device, device_api: DeviceApi, plcnet_api: PlcNetApi):
+        """Test writing only drifted settings."""
+        mock_device.serial_number = SERIAL_NUMBER
+        mock_device.mac = "AABBCCDDEEFF"
+        mock_device.device = device_api
+        mock_device.plcnet = plcnet_api
+        network = LogicalNetwork(devices=[PlcDevice(mac_address="AABBCCDDEEFF", user_device_name="Office")])
+        with (
+            patch.multiple(
+                device_api,
+                async_get_led_setting=AsyncMock(return_value=True),
+                async_set_led_setting=AsyncMock(return_value=True),
+                async_get_wifi_guest_access=AsyncMock(return_value=WifiGuestAccessGet(enabled=False)),
+                async_set_wifi_guest_access=AsyncMock(return_value=True),
+            ),
+            patch.multiple(
+                plcnet_api,
+                async_get_network_overview=AsyncMock(return_value=network),
+                async_set_user_device_name=AsyncMock(return_value=False),
+            ),
+        ):
+            reconciler = Reconciler()
+            desired = {SERIAL_NUMBER: DesiredState(led=True, guest_wifi=True, guest_wifi_duration=60, device_name="Hall")}
+            dry_run = await reconciler.async_reconcile([mock_device], desired, dry_run=True)
+            assert dry_run[SERIAL_NUMBER].changed == {"guest_wifi": True, "device_name": "Hall"}
+            device_api.async_set_wifi_guest_access.assert_not_called()  # type: ignore[attr-defined]
+
+            report = (await reconciler.async_reconcile([mock_device], desired))[SERIAL_NUMBER]
+            assert report.changed == {"guest_wifi": True}
+            assert report.unchanged == ["led"]
+            assert report.failed == {"device_name": "Rejected by device"}
+            device_api.async_set_led_setting.assert_not_called()  # type: ignore[attr-defined]
+            device_api.async_set_wifi_guest_access.assert_called_once_with(enable=True, duration=60)  # type: ignore[attr-defined]
+
+    @pytest.mark.asyncio
+    async def test_unavailable(self, mock_device: Device, device_api: DeviceApi):
+        """Test reporting settings, that cannot be read."""
+        mock_device.device = device_api
+        error = HTTPStatusError("", request=Request("GET", "http://192.0.2.1"), response=Response(500))
+        with patch.multiple(
+            device_api,
+            async_get_led_setting=AsyncMock(side_effect=DeviceUnavailable),
+            async_get_wifi_guest_access=AsyncMock(side_effect=error),
+        ):
+            desired = DesiredState(led=False, guest_wifi=True, device_name="Hall")
+            reports = await Reconciler().async_reconcile([mock_device], default=desired)
+        assert reports[mock_device.serial_number].failed == {
+            "led": "DeviceUnavailable",
+            "guest_wifi": "HTTPStatusError",
+            "device_name": "FeatureNotSupported",
+        }
+
+    @pytest.mark.asyncio
+    async def test_group_duration(self, mock_device: Device, device_api: DeviceApi):
+        """Test writing the guest wifi duration of a group to devices without an own state."""
+        mock_device.serial_number = SERIAL_NUMBER
+        mock_device.device = device_api
+        with patch.multiple(
+            device_api,
+            async_get_wifi_guest_access=AsyncMock(return_value=WifiGuestAccessGet(enabled=False)),
+            async_set_wifi_guest_access=AsyncMock(return_value=True),
+        ):
+            group = DesiredState(guest_wifi=True, guest_wifi_duration=60)
+            await Reconciler().async_reconcile([mock_device], {SERIAL_NUMBER: DesiredState()}, default=group)
+            device_api.async_set_wifi_guest_access.assert_called_once_with(enable=True, duration=60)  # type: ignore[attr-defined]
@@ -0,0 +1,122 @@
+"""Test keeping one device object per serial number."""
+
+from __future__ import annotations
+
+from socket import inet_aton
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from zeroconf import Zeroconf
+
+from devolo_plc_api.device_api import SERVICE_TYPE
+from devolo_plc_api.exceptions import DeviceNotFound
+from devolo_plc_api.fleet import DeviceRegistry
+from devolo_plc_api.zeroconf import ZeroconfServiceInfo
+
+from . import DeviceType
+from .mocks.zeroconf import MockServiceBrowser
+
+if TYPE_CHECKING:
+    from devolo_plc_api import Device
+
+    from . import TestData
+
+
+def service_info(test_data: TestData, ip: str, firmware_version: str = "5.5.1") -> ZeroconfServiceInfo:
+    """Create mDNS information of the device API."""
+    properties = {**test_data.device_info[SERVICE_TYPE].properties, "FirmwareVersion": firmware_version}
+    return ZeroconfServiceInfo(address=inet_aton(ip), port=80, properties=properties)
+
+
+class TestDeviceRegistry:
+    """Test devolo_plc_api.fleet.registry.DeviceRegistry class."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("sleep")
+    async def test_async_discover(self, test_data: TestData, mock_info_from_service: Mock):
+        """Test keeping the device object, if a device is discovered again with a new IP address."""
+        serial_number = test_data.device_info[SERVICE_TYPE].properties["SN"]
+        registry = DeviceRegistry(zeroconf_instance=Mock(spec=Zeroconf))
+        with patch("devolo_plc_api.fleet.registry.ServiceBrowser", MockServiceBrowser):
+            mock_info_from_service.return_value = service_info(test_data, test_data.ip)
+            first = await registry.async_discover()
+            mock_info_from_service.return_value = service_info(test_data, "192.0.2.2", "5.6.0")
+            second = await registry.async_discover()
+        device = first[serial_number]
+        assert second[serial_number] is device
+        assert len(registry) == 1
+        assert serial_number in registry
+        assert list(registry) == [device]
+        assert device.serial_number == serial_number
+        assert device.ip == "192.0.2.2"
+        assert device.firmware_version == "5.6.0"
+        assert registry.by_ip("192.0.2.2") is device
+        assert registry.by_ip(test_data.ip) is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("device_type", [DeviceType.PLC])
+    @pytest.mark.usefixtures("block_communication", "service_browser")
+    async def test_async_merge(self, mock_device: Device, test_data: TestData):
+        """Test updating a connected device without reconnecting."""
+        await mock_device.async_connect()
+        registry = DeviceRegistry()
+        assert registry.add(mock_device) is mock_device
+        assert registry.by_mac("aa:bb:cc:dd:ee:ff") is mock_device
+        session = mock_device._session
+
+        with patch("devolo_plc_api.device.AsyncServiceBrowser") as browser:
+            browser.return_value.async_cancel = AsyncMock()
+            assert await registry.async_merge(service_info(test_data, "192.0.2.2", "5.6.0")) is mock_device
+            assert browser.call_args.kwargs["addr"] == "192.0.2.2"
+        assert mock_device._session is session
+        assert mock_device.firmware_version == "5.6.0"
+        assert mock_device.device
+        assert mock_device.device.url.startswith("http://192.0.2.2:80/")
+        assert mock_device.plcnet
+        assert mock_device.plcnet.url.startswith("http://192.0.2.2:80/")
+        assert registry.by_ip("192.0.2.2") is mock_device
+        assert registry.get(mock_device.serial_number) is mock_device
+        await registry.async_close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("sleep")
+    async def test_connect(self, test_data: TestData, mock_info_from_service: Mock):
+        """Test keeping devices unconnected, if they do not answer."""
+        serial_number = test_data.device_info[SERVICE_TYPE].properties["SN"]
+        registry = DeviceRegistry(zeroconf_instance=Mock(spec=Zeroconf))
+        mock_info_from_service.return_value = service_info(test_data, test_data.ip)
+        with (
+            patch("devolo_plc_api.fleet.registry.ServiceBrowser", MockServiceBrowser),
+            patch("devolo_plc_api.device.Device.async_connect", side_effect=DeviceNotFound(test_data.ip)) as connect,
+        ):
+            await registry.async_discover(connect=True)
+            assert connect.call_count == 1
+        assert registry.get(serial_number)
+
+    def test_remove(self, mock_device: Device, test_data: TestData):
+        """Test forgetting a device."""
+        mock_device.serial_number = test_data.device_info[SERVICE_TYPE].properties["SN"]
+        mock_device.mac = "AABBCCDDEEFF"
+        registry = DeviceRegistry()
+        registry.add(mock_device)
+        assert registry.remove(mock_device.serial_number) is mock_device
+        assert registry.remove(mock_device.serial_number) is None
+        assert registry.by_ip(test_data.ip) is None
+        assert registry.by_mac(mock_device.mac) is None
+        assert not registry
+
+    @pytest.mark.asyncio
+    async def test_async_close(self):
+        """Test closing a Zeroconf instance created by the registry."""
+        registry = DeviceRegistry()
+        with (
+            patch("devolo_plc_api.fleet.registry.Zeroconf"),
+            patch("devolo_plc_api.fleet.registry.ServiceBrowser"),
+            patch("devolo_plc_api.fleet.registry.asyncio.sleep"),
+            patch("devolo_plc_api.fleet.registry.AsyncZeroconf") as zeroconf,
+        ):
+            zeroconf.return_value.async_close = AsyncMock()
+            assert await registry.async_discover() == {}
+            await registry.async_close()
+        zeroconf.return_value.async_close.assert_awaited_once()
@@ -0,0 +1,49 @@
+"""Test tracking roaming wifi stations."""
+
+from devolo_plc_api.device_api import WIFI_BAND_2G, WIFI_BAND_5G, ConnectedStationInfo
+from devolo_plc_api.fleet import RoamingTracker, Session, StationConnected, StationDisconnected, StationRoamed
+
+STATION = "AABBCC001122"
+
+
+def _station(band: int = WIFI_BAND_5G) -> ConnectedStationInfo:
+    """Create a connected station."""
+    return ConnectedStationInfo(mac_address="aa:bb:cc:00:11:22", band=band)
+
+
+class TestRoamingTracker:
+    """Test devolo_plc_api.fleet.roaming.RoamingTracker class."""
+
+    def test_update(self):
+        """Test following a station across devices and bands."""
+        tracker = RoamingTracker(roaming_window=60)
+        assert tracker.update("1", [_station()], timestamp=0) == [StationConnected(STATION, "1", WIFI_BAND_5G, 0)]
+        assert tracker.update("1", [_station()], timestamp=10) == []
+        assert tracker.update("1", [_station(WIFI_BAND_2G)], timestamp=20) == [
+            StationRoamed(STATION, "1", WIFI_BAND_5G, "1", WIFI_BAND_2G, 20)
+        ]
+        assert tracker.update("1", [], timestamp=30) == []
+        assert tracker.locate(STATION) is None
+        assert tracker.update("2", [_station()], timestamp=40) == [
+            StationRoamed(STATION, "1", WIFI_BAND_2G, "2", WIFI_BAND_5G, 40)
+        ]
+        assert tracker.locate(STATION) == ("2", WIFI_BAND_5G)
+        assert len(tracker) == 1
+
+        assert tracker.update("2", [], timestamp=50) == []
+        assert tracker.expire(now=100) == []
+        assert tracker.expire(now=110) == [StationDisconnected(STATION, "2", WIFI_BAND_5G, 50)]
+        assert tracker.sessions(STATION) == [
+            Session("1", WIFI_BAND_5G, 0, 20),
+            Session("1", WIFI_BAND_2G, 20, 30),
+            Session("2", WIFI_BAND_5G, 40, 50),
+        ]
+
+    def test_dwell_times(self):
+        """Test summing up the time spent on devices."""
+        tracker = RoamingTracker(history=2)
+        tracker.update("1", [_station()], timestamp=0)
+        tracker.update("2", [_station()], timestamp=10)
+        tracker.update("1", [_station()], timestamp=30)
+        tracker.update("2", [_station()], timestamp=60)
+        assert tracker.dwell_times("aa:bb:cc:00:11:22", now=100) == {("2", WIFI_BAND_5G): 60, ("1", WIFI_BAND_5G): 30}
@@ -0,0 +1,110 @@
+"""Test rolling out firmware updates."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import HTTPStatusError, Request, Response
+
+from devolo_plc_api.device_api import SERVICE_TYPE, UPDATE_AVAILABLE, UPDATE_NOT_AVAILABLE, UpdateFirmwareCheck
+from devolo_plc_api.exceptions import DeviceUnavailable
+from devolo_plc_api.fleet import FirmwareCache, FirmwareRollout, RolloutEntry
+from devolo_plc_api.fleet.rollout import CURRENT, FAILED, UPDATED, UPDATING
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+    from devolo_plc_api import Device
+    from devolo_plc_api.device_api import DeviceApi
+
+SERIAL_NUMBER = "1234567890123456"
+
+
+@pytest.fixture
+def device(mock_device: Device, device_api: DeviceApi) -> Generator[Device, None, None]:
+    """Prepare a device, that reboots into a new firmware after starting an update."""
+    mock_device.serial_number = SERIAL_NUMBER
+    mock_device.device = device_api
+    properties = mock_device._info[SERVICE_TYPE].properties
+    properties["FirmwareVersion"] = "5.0.0"
+
+    def start_firmware_update() -> bool:
+        properties["FirmwareVersion"] = "5.1.0"
+        return True
+
+    firmware = UpdateFirmwareCheck(result=UPDATE_AVAILABLE, new_firmware_version="5.1.0")
+    with patch.multiple(
+        device_api,
+        async_check_firmware_available=AsyncMock(return_value=firmware),
+        async_start_firmware_update=AsyncMock(side_effect=start_firmware_update),
+        async_uptime=AsyncMock(side_effect=[1000, 1030, DeviceUnavailable(), 10]),
+    ):
+        yield mock_device
+
+
+@pytest.mark.parametrize("feature", ["restart,update"])
+@pytest.mark.usefixtures("sleep")
+class TestFirmwareRollout:
+    """Test devolo_plc_api.fleet.rollout.FirmwareRollout class."""
+
+    @pytest.mark.asyncio
+    async def test_async_run(self, tmp_path: Path, device: Device):
+        """Test updating a device, that reboots, and resuming the rollout."""
+        rollout = FirmwareRollout(tmp_path / "rollout.json", poll_interval=0, firmware_cache=FirmwareCache())
+        state = await rollout.async_run([device])
+        assert state[SERIAL_NUMBER].status == UPDATED
+        assert state[SERIAL_NUMBER].firmware_version == "5.0.0"
+        assert state[SERIAL_NUMBER].target_version == "5.1.0"
+        assert state[SERIAL_NUMBER].uptime == 1000
+        assert device.device
+        assert isinstance(device.device.async_uptime, AsyncMock)
+        assert device.device.async_uptime.call_count == 4
+
+        resumed = FirmwareRollout(tmp_path / "rollout.json")
+        assert resumed.state == state
+        await resumed.async_run([device])
+        assert isinstance(device.device.async_start_firmware_update, AsyncMock)
+        device.device.async_start_firmware_update.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_async_run_resume_rebooted(self, tmp_path: Path, device: Device):
+        """Test completing an interrupted update of a device, that rebooted and ran longer than before meanwhile."""
+        state_file = tmp_path / "rollout.json"
+        state_file.write_text(
+            json.dumps({SERIAL_NUMBER: asdict(RolloutEntry(status=UPDATING, firmware_version="5.0.0", uptime=10))}),
+            encoding="utf-8",
+        )
+        device._info[SERVICE_TYPE].properties["FirmwareVersion"] = "5.1.0"
+        state = await FirmwareRollout(state_file, poll_interval=0).async_run([device])
+        assert state[SERIAL_NUMBER].status == UPDATED
+
+    @pytest.mark.asyncio
+    async def test_async_run_http_error(self, tmp_path: Path, device: Device):
+        """Test failing a single device on HTTP errors without aborting the rollout."""
+        assert device.device
+        error = HTTPStatusError("", request=Request("GET", "http://192.0.2.1"), response=Response(500))
+        with patch.object(device.device, "async_check_firmware_available", side_effect=error):
+            state = await FirmwareRollout(tmp_path / "rollout.json").async_run([device])
+        assert state[SERIAL_NUMBER].status == FAILED
+
+    @pytest.mark.asyncio
+    async def test_async_run_current(self, tmp_path: Path, device: Device):
+        """Test skipping devices without update."""
+        assert device.device
+        with patch.object(
+            device.device, "async_check_firmware_available", return_value=UpdateFirmwareCheck(result=UPDATE_NOT_AVAILABLE)
+        ):
+            state = await FirmwareRollout(tmp_path / "rollout.json").async_run([device])
+        assert state[SERIAL_NUMBER].status == CURRENT
+
+    @pytest.mark.asyncio
+    async def test_async_run_timeout(self, tmp_path: Path, device: Device):
+        """Test failing on devices, that do not come back in time."""
+        state = await FirmwareRollout(tmp_path / "rollout.json", timeout=0).async_run([device])
+        assert state[SERIAL_NUMBER].status == FAILED
+        assert state[SERIAL_NUMBER].error
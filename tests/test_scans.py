@@ -0,0 +1,61 @@
+"""Test scheduling wifi neighbor scans."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from devolo_plc_api import Device
+from devolo_plc_api.exceptions import DeviceUnavailable
+from devolo_plc_api.fleet import ScanScheduler
+
+if TYPE_CHECKING:
+    from devolo_plc_api.device_api import DeviceApi, NeighborAPInfo
+
+    from tests import TestData
+
+
+@pytest.mark.parametrize("feature", ["wifi1"])
+class TestScanScheduler:
+    """Test devolo_plc_api.fleet.scans.ScanScheduler class."""
+
+    @pytest.mark.asyncio
+    async def test_async_get(self, test_data: TestData, device_api: DeviceApi, neighbor_ap: NeighborAPInfo, sleep: AsyncMock):
+        """Test scanning staggered and reading cached scans."""
+        devices = []
+        for serial_number in ("1234567890123456", "6543210987654321"):
+            device = Device(test_data.ip)
+            device.serial_number = serial_number
+            device.device = device_api
+            devices.append(device)
+        scheduler = ScanScheduler(stagger=5)
+        with patch.object(device_api, "async_get_wifi_neighbor_access_points", AsyncMock(return_value=[neighbor_ap])) as scan:
+            sleep.side_effect = [None, None, RuntimeError]
+            with pytest.raises(RuntimeError):
+                await scheduler.async_run(devices)
+            sleep.side_effect = None
+            assert scan.call_count == 2
+            assert sleep.await_args_list[1].args[0] == pytest.approx(5, abs=0.1)
+            assert len(scheduler) == 2
+
+            cached = scheduler.get("1234567890123456")
+            assert cached
+            assert cached.access_points == [neighbor_ap]
+            assert await scheduler.async_get(devices[0]) is cached
+            assert await scheduler.async_get(devices[0], max_age=0) is not cached
+            assert scan.call_count == 3
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("sleep")
+    async def test_failed_scan(self, mock_device: Device, device_api: DeviceApi):
+        """Test failing scans."""
+        mock_device.device = device_api
+        scheduler = ScanScheduler()
+        with (
+            patch.object(device_api, "async_get_wifi_neighbor_access_points", AsyncMock(side_effect=DeviceUnavailable)),
+            pytest.raises(DeviceUnavailable),
+        ):
+            await scheduler.async_get(mock_device)
+        assert scheduler.get(mock_device.serial_number) is None
@@ -0,0 +1,52 @@
+"""Test reading support info dumps from files."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from devolo_plc_api.device_api import SupportInfoFile
+from devolo_plc_api.device_api.support_pb2 import SupportInfoDump, SupportInfoDumpResponse
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestSupportInfoFile:
+    """Test devolo_plc_api.device_api.support.SupportInfoFile class."""
+
+    def test_read(self, tmp_path: Path):
+        """Test reading items lazily."""
+        items = [
+            SupportInfoDump.SupportInfoItem(label="configlayer", content=b"KEY=value" * 100),
+            SupportInfoDump.SupportInfoItem(label="dmesg", content=b""),
+        ]
+        response = SupportInfoDumpResponse(result=1, info=SupportInfoDump(items=items))
+        (tmp_path / "dump").write_bytes(response.SerializeToString())
+        with SupportInfoFile(tmp_path / "dump") as dump:
+            assert dump.result == 1
+            assert dump.labels == ["configlayer", "dmesg"]
+            assert len(dump) == len(items)
+            assert "dmesg" in dump
+            assert "messages" not in dump
+            assert dump["configlayer"] == items[0].content
+            assert b"".join(dump.chunks("configlayer", size=64)) == items[0].content
+            assert list(dump.items()) == items
+            with pytest.raises(KeyError):
+                dump["messages"]
+
+    def test_empty(self, tmp_path: Path):
+        """Test reading an empty dump."""
+        (tmp_path / "dump").write_bytes(b"")
+        with SupportInfoFile(tmp_path / "dump") as dump:
+            assert dump.labels == []
+            assert dump.result == 0
+
+    def test_truncated(self, tmp_path: Path):
+        """Test reading a truncated dump."""
+        items = [SupportInfoDump.SupportInfoItem(label="configlayer", content=b"KEY=value")]
+        content = SupportInfoDumpResponse(info=SupportInfoDump(items=items)).SerializeToString()
+        (tmp_path / "dump").write_bytes(content[:-3])
+        with SupportInfoFile(tmp_path / "dump") as dump, pytest.raises(ValueError, match="Truncated"):
+            dump.labels  # noqa: B018
@@ -0,0 +1,67 @@
+"""Test storing the history of PLC data rates."""
+
+import pytest
+
+from devolo_plc_api.plcnet_api import DataRate, DataRateSeries, DataRateStore, LogicalNetwork
+
+
+class TestDataRateSeries:
+    """Test devolo_plc_api.plcnet_api.timeseries.DataRateSeries class."""
+
+    def test_ring_buffer(self):
+        """Test overwriting the oldest samples."""
+        series = DataRateSeries(capacity=4)
+        for i in range(6):
+            series.append(float(i), tx_rate=i * 10, rx_rate=i)
+        assert len(series) == 4
+        assert list(series.window("tx_rate")) == [20.0, 30.0, 40.0, 50.0]
+        assert list(series.window("rx_rate", since=4.0)) == [4.0, 5.0]
+        assert series.nbytes == 4 * 16
+
+    @pytest.mark.parametrize("capacity", [0, -1])
+    def test_capacity(self, capacity: int):
+        """Test rejecting series without room for a sample."""
+        with pytest.raises(ValueError, match="at least 1"):
+            DataRateSeries(capacity)
+
+    def test_aggregate(self):
+        """Test aggregating a time window."""
+        series = DataRateSeries(capacity=100)
+        for i in range(1, 101):
+            series.append(float(i), tx_rate=i, rx_rate=0)
+        aggregate = series.aggregate("tx_rate", since=51.0)
+        assert aggregate
+        assert aggregate.minimum == 51.0
+        assert aggregate.mean == pytest.approx(75.5)
+        assert aggregate.p95 == 98.0
+        assert aggregate.samples == 50
+        assert series.aggregate("tx_rate", since=1000.0) is None
+
+
+class TestDataRateStore:
+    """Test devolo_plc_api.plcnet_api.timeseries.DataRateStore class."""
+
+    def test_capacity(self):
+        """Test rejecting stores without room for a sample."""
+        with pytest.raises(ValueError, match="at least 1"):
+            DataRateStore(capacity=0)
+
+    def test_add_network(self):
+        """Test feeding the store from network overviews."""
+        store = DataRateStore(capacity=10)
+        for timestamp in range(3):
+            network = LogicalNetwork(
+                data_rates=[DataRate(mac_address_from="A", mac_address_to="B", tx_rate=100 + timestamp, rx_rate=50)]
+            )
+            store.add_network(network, timestamp=timestamp)
+        assert list(store) == [("A", "B")]
+        assert ("A", "B") in store
+        assert len(store["A", "B"]) == 3
+        assert store.nbytes == 10 * 16
+        aggregate = store.aggregate("A", "B", "tx_rate", since=1.0)
+        assert aggregate
+        assert aggregate.minimum == 101.0
+        assert store.aggregate("B", "A", "tx_rate") is None
+
+        store.forget("A", "B")
+        assert not len(store)
@@ -0,0 +1,166 @@
+"""Test tracing the phases of connecting and requesting."""
+
+from __future__ import annotations
+
+import json
+import sys
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from httpx import ConnectTimeout
+
+from devolo_plc_api.device_api.ledsettings_pb2 import LedSettingsGet
+from devolo_plc_api.diagnostics import JsonLinesExporter, Span, SpanExporter, current_span, set_span_exporter, trace
+from devolo_plc_api.exceptions import DevicePasswordProtected, DeviceUnavailable
+
+from . import DeviceType
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+    from pytest_httpx import HTTPXMock
+
+    from devolo_plc_api import Device
+    from devolo_plc_api.device_api import DeviceApi
+
+    from . import TestData
+
+
+class ListExporter(SpanExporter):
+    """Collect finished spans in a list."""
+
+    def __init__(self) -> None:
+        """Initialize an empty list."""
+        self.spans: list[Span] = []
+
+    def export(self, span: Span) -> None:
+        """Append a span."""
+        self.spans.append(span)
+
+    def named(self, name: str) -> list[Span]:
+        """Get all spans with a name."""
+        return [span for span in self.spans if span.name == name]
+
+
+@pytest.fixture
+def exporter() -> Generator[ListExporter, None, None]:
+    """Trace into a list."""
+    exporter = ListExporter()
+    set_span_exporter(exporter)
+    yield exporter
+    set_span_exporter(None)
+
+
+class TestSpan:
+    """Test devolo_plc_api.diagnostics.tracing.Span class."""
+
+    def test_disabled(self):
+        """Test tracing being disabled by default."""
+        with trace("outer", ip="192.0.2.1") as span:
+            span.set_attribute("service_type", "_dvl-deviceapi._tcp.local.")
+            assert current_span() is None
+        assert trace("other") is span
+
+    def test_nesting(self, exporter: ListExporter):
+        """Test nesting spans."""
+        with trace("outer", ip="192.0.2.1") as outer:
+            assert current_span() is outer
+            with trace("inner") as inner:
+                inner.set_attribute("attempt", 1)
+            with pytest.raises(DeviceUnavailable), trace("inner"):
+                raise DeviceUnavailable
+        assert current_span() is None
+        assert [span.name for span in exporter.spans] == ["inner", "inner", "outer"]
+        assert outer.children == 2
+        assert outer.parent_id is None
+        assert inner.parent_id == outer.span_id
+        assert inner.trace_id == outer.trace_id
+        assert inner.attributes == {"attempt": 1}
+        assert exporter.spans[1].status == "DeviceUnavailable"
+        assert outer.duration >= inner.duration
+
+    def test_exporter_error(self, caplog: pytest.LogCaptureFixture):
+        """Test logging errors of exporters without failing the traced operation."""
+        exporter = SpanExporter()
+        set_span_exporter(exporter)
+        try:
+            with patch.object(exporter, "export", side_effect=OSError("disk full")), trace("outer") as span:
+                pass
+        finally:
+            set_span_exporter(None)
+        assert span.status == "ok"
+        assert "Exporting span outer failed" in caplog.text
+
+    def test_json_lines(self, tmp_path: Path):
+        """Test writing spans as JSON lines."""
+        path = tmp_path / "spans.jsonl"
+        exporter = JsonLinesExporter(path)
+        set_span_exporter(exporter)
+        try:
+            with trace("outer", ip="192.0.2.1"), trace("inner"):
+                pass
+        finally:
+            set_span_exporter(None)
+            exporter.close()
+        inner, outer = (json.loads(line) for line in path.read_text(encoding="utf-8").splitlines())
+        assert inner["parent_id"] == outer["span_id"]
+        assert outer["attributes"] == {"ip": "192.0.2.1"}
+        assert outer["status"] == "ok"
+
+
+@pytest.mark.skipif(sys.version_info < (3, 9), reason="Tests with httpx_mock need at least Python 3.9")
+class TestTracing:
+    """Test tracing connections and requests."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["led"])
+    async def test_request(self, device_api: DeviceApi, httpx_mock: HTTPXMock, exporter: ListExporter, test_data: TestData):
+        """Test tracing a request."""
+        httpx_mock.add_response(content=LedSettingsGet(state=LedSettingsGet.LED_ON).SerializeToString())
+        await device_api.async_get_led_setting()
+        (request,) = exporter.named("request")
+        (attempt,) = exporter.named("attempt")
+        assert request.attributes == {"ip": test_data.ip, "endpoint": "LedSettingsGet", "method": "GET"}
+        assert attempt.attributes == {"attempt": 1, "status": HTTPStatus.OK}
+        assert attempt.parent_id == request.span_id
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["led"])
+    async def test_retries(self, device_api: DeviceApi, httpx_mock: HTTPXMock, exporter: ListExporter):
+        """Test tracing every attempt of a request."""
+        httpx_mock.add_exception(ConnectTimeout(""), is_reusable=True)
+        with pytest.raises(DeviceUnavailable), patch("asyncio.sleep"):
+            await device_api.async_get_led_setting()
+        assert [span.attributes["attempt"] for span in exporter.named("attempt")] == [1, 2, 3]
+        assert {span.status for span in exporter.named("attempt")} == {"ConnectTimeout"}
+        assert exporter.named("request")[0].status == "DeviceUnavailable"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("feature", ["led"])
+    @pytest.mark.httpx_mock(can_send_already_matched_responses=True)
+    async def test_password_hashed(self, device_api: DeviceApi, httpx_mock: HTTPXMock, exporter: ListExporter):
+        """Test tracing the fallback to the hashed password."""
+        httpx_mock.add_response(status_code=HTTPStatus.UNAUTHORIZED)
+        with pytest.raises(DevicePasswordProtected):
+            await device_api.async_get_led_setting()
+        (attempt,) = exporter.named("attempt")
+        assert attempt.attributes["password_hashed"]
+        assert attempt.attributes["status"] == HTTPStatus.UNAUTHORIZED
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("device_type", [DeviceType.PLC])
+    @pytest.mark.usefixtures("block_communication", "service_browser")
+    async def test_connect(self, mock_device: Device, exporter: ListExporter, test_data: TestData):
+        """Test tracing the phases of connecting."""
+        await mock_device.async_connect()
+        await mock_device.async_disconnect()
+        (connect,) = exporter.named("connect")
+        (browse,) = exporter.named("mdns_browse")
+        assert connect.attributes == {"ip": test_data.ip}
+        assert browse.parent_id == connect.span_id
+        assert browse.attributes == {"ip": test_data.ip, "multicast": False, "found": True}
+        assert {span.attributes["service_type"] for span in exporter.named("service_info")} == set(test_data.device_info)
+        assert all(span.trace_id == connect.trace_id for span in exporter.spans)